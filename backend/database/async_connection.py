@@ -0,0 +1,110 @@
+"""
+Async Database Connection Manager
+psycopg3 AsyncConnectionPool with async context manager support
+(async 서비스에서 이벤트 루프를 막지 않고 DB에 접근)
+
+- 체크아웃 시 연결 상태 확인 (끊긴 연결은 폐기 후 새로 연결)
+- max_lifetime이 지난 연결, max_idle 동안 쓰이지 않은 연결은 교체 / 정리
+"""
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional, Dict, Any
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+class AsyncDatabaseConnection:
+    """Async database connection pool manager"""
+
+    _pool: Optional[AsyncConnectionPool] = None
+    _lock: Optional[asyncio.Lock] = None
+
+    @classmethod
+    def conninfo(cls) -> str:
+        """Connection string (also used for dedicated LISTEN connections)"""
+        return make_conninfo(
+            host=os.getenv('PG_DB_HOST', 'localhost'),
+            port=int(os.getenv('PG_DB_PORT', 5435)),
+            dbname=os.getenv('PG_DB_NAME', 'postgres'),
+            user=os.getenv('PG_DB_ID', 'postgres'),
+            password=os.getenv('PG_DB_PW', ''),
+            options='-c search_path=saeum_ai_api,public'  # 스키마 설정
+        )
+
+    @classmethod
+    def _build_pool(cls) -> AsyncConnectionPool:
+        return AsyncConnectionPool(
+            cls.conninfo(),
+            min_size=int(os.getenv('PG_ASYNC_POOL_MIN', 1)),
+            max_size=int(os.getenv('PG_ASYNC_POOL_MAX', 20)),
+            timeout=float(os.getenv('PG_ASYNC_POOL_TIMEOUT', 30)),
+            max_lifetime=float(os.getenv('PG_ASYNC_POOL_MAX_LIFETIME', 1800)),
+            max_idle=float(os.getenv('PG_ASYNC_POOL_MAX_IDLE', 600)),
+            check=AsyncConnectionPool.check_connection,
+            open=False
+        )
+
+    @classmethod
+    async def initialize_pool(cls) -> AsyncConnectionPool:
+        """Initialize and open connection pool (idempotent)"""
+        if cls._pool is not None:
+            return cls._pool
+
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+
+        async with cls._lock:
+            if cls._pool is None:
+                try:
+                    pool = cls._build_pool()
+                    await pool.open()
+                    cls._pool = pool
+                    print("✅ Async database connection pool initialized")
+                except Exception as e:
+                    print(f"❌ Failed to initialize async connection pool: {e}")
+                    raise
+        return cls._pool
+
+    @classmethod
+    async def get_pool(cls) -> AsyncConnectionPool:
+        """Get connection pool (opens it on first use)"""
+        if cls._pool is None:
+            await cls.initialize_pool()
+        return cls._pool
+
+    @classmethod
+    async def close_pool(cls):
+        """Close all connections in pool"""
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+            print("✅ Async database connection pool closed")
+
+    @classmethod
+    def get_stats(cls) -> Optional[Dict[str, Any]]:
+        """Pool statistics (None if the pool is not initialized)"""
+        return cls._pool.get_stats() if cls._pool else None
+
+
+@asynccontextmanager
+async def get_async_db_cursor() -> AsyncGenerator:
+    """
+    Async context manager for database cursor with dict results
+    Commits on success, rolls back on exception.
+
+    Usage:
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute("SELECT * FROM prompts WHERE prompt_key = %s", (1,))
+            result = await cursor.fetchone()
+            print(result['prompt_text'])
+    """
+    pool = await AsyncDatabaseConnection.get_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cursor:
+            yield cursor
@@ -1,10 +1,17 @@
 """
 Database Connection Manager
 PostgreSQL connection pool with context manager support
+
+- Sync psycopg2 pool for scripts and maintenance jobs (request handling uses
+  database.async_connection, which does checkout health checks and recycling)
+- Thread-safe pool sized from environment variables (PG_POOL_MIN / PG_POOL_MAX)
+- No checkout health check, recycling or wait queue: a broken connection is only
+  discarded when rollback fails, and getconn() raises PoolError when exhausted
 """
 import os
+import threading
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Dict, Any, Optional
 import psycopg2
 import psycopg2.extras
 from psycopg2 import pool
@@ -17,40 +24,56 @@ load_dotenv()
 class DatabaseConnection:
     """Database connection pool manager"""
 
-    _pool = None
+    _pool: Optional[pool.ThreadedConnectionPool] = None
+    _init_lock = threading.Lock()
+
+    # 체크아웃 중인 연결 수 (psycopg2 풀 내부 상태 대신 직접 집계)
+    _checked_out = 0
+    _stats_lock = threading.Lock()
 
     @classmethod
     def initialize_pool(cls):
-        """Initialize connection pool"""
-        if cls._pool is None:
-            try:
-                cls._pool = pool.SimpleConnectionPool(
-                    minconn=1,
-                    maxconn=20,
-                    host=os.getenv('PG_DB_HOST', 'localhost'),
-                    port=int(os.getenv('PG_DB_PORT', 5435)),
-                    database=os.getenv('PG_DB_NAME', 'postgres'),
-                    user=os.getenv('PG_DB_ID', 'postgres'),
-                    password=os.getenv('PG_DB_PW', ''),
-                    options='-c search_path=saeum_ai_api,public'  # 스키마 설정
-                )
-                print("✅ Database connection pool initialized")
-            except Exception as e:
-                print(f"❌ Failed to initialize connection pool: {e}")
-                raise
+        """Initialize connection pool (sized from PG_POOL_MIN / PG_POOL_MAX)"""
+        if cls._pool is not None:
+            return
+
+        with cls._init_lock:
+            if cls._pool is None:
+                try:
+                    cls._pool = pool.ThreadedConnectionPool(
+                        minconn=int(os.getenv('PG_POOL_MIN', 1)),
+                        maxconn=int(os.getenv('PG_POOL_MAX', 20)),
+                        host=os.getenv('PG_DB_HOST', 'localhost'),
+                        port=int(os.getenv('PG_DB_PORT', 5435)),
+                        database=os.getenv('PG_DB_NAME', 'postgres'),
+                        user=os.getenv('PG_DB_ID', 'postgres'),
+                        password=os.getenv('PG_DB_PW', ''),
+                        options='-c search_path=saeum_ai_api,public'  # 스키마 설정
+                    )
+                    print("✅ Database connection pool initialized")
+                except Exception as e:
+                    print(f"❌ Failed to initialize connection pool: {e}")
+                    raise
 
     @classmethod
     def get_connection(cls):
         """Get connection from pool"""
         if cls._pool is None:
             cls.initialize_pool()
-        return cls._pool.getconn()
+        conn = cls._pool.getconn()
+        with cls._stats_lock:
+            cls._checked_out += 1
+        return conn
 
     @classmethod
-    def return_connection(cls, conn):
-        """Return connection to pool"""
+    def return_connection(cls, conn, close: bool = False):
+        """Return connection to pool (close=True discards a broken connection)"""
+        with cls._stats_lock:
+            cls._checked_out = max(0, cls._checked_out - 1)
         if cls._pool:
-            cls._pool.putconn(conn)
+            cls._pool.putconn(conn, close=close)
+        else:
+            conn.close()
 
     @classmethod
     def close_all_connections(cls):
@@ -60,6 +83,24 @@ class DatabaseConnection:
             cls._pool = None
             print("✅ All database connections closed")
 
+    @classmethod
+    def get_stats(cls) -> Optional[Dict[str, Any]]:
+        """
+        Pool statistics (None if the pool is not initialized)
+
+        Only checkout counts are available for the sync pool; it has no idle,
+        wait time or timeout statistics.
+        """
+        if cls._pool is None:
+            return None
+        with cls._stats_lock:
+            checked_out = cls._checked_out
+        return {
+            "min_size": cls._pool.minconn,
+            "max_size": cls._pool.maxconn,
+            "checked_out": checked_out
+        }
+
 
 @contextmanager
 def get_db_connection() -> Generator:
@@ -73,17 +114,21 @@ def get_db_connection() -> Generator:
             results = cursor.fetchall()
     """
     conn = None
+    broken = False
     try:
         conn = DatabaseConnection.get_connection()
         yield conn
         conn.commit()
     except Exception as e:
         if conn:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
         raise e
     finally:
         if conn:
-            DatabaseConnection.return_connection(conn)
+            DatabaseConnection.return_connection(conn, close=broken)
 
 
 @contextmanager
@@ -99,6 +144,7 @@ def get_db_cursor() -> Generator:
     """
     conn = None
     cursor = None
+    broken = False
     try:
         conn = DatabaseConnection.get_connection()
         cursor = conn.cursor(cursor_factory=psycopg2.extras.DictCursor)
@@ -106,14 +152,16 @@ def get_db_cursor() -> Generator:
         conn.commit()
     except Exception as e:
         if conn:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                broken = True
         raise e
     finally:
         if cursor:
-            cursor.close()
+            try:
+                cursor.close()
+            except psycopg2.Error:
+                pass
         if conn:
-            DatabaseConnection.return_connection(conn)
-
-
-# Initialize pool on module import
-DatabaseConnection.initialize_pool()
+            DatabaseConnection.return_connection(conn, close=broken)
@@ -3,23 +3,114 @@ FastAPI Main Application
 새움 AI 테스트공간 백엔드
 """
 import os
+import sys
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict
 from dotenv import load_dotenv
 
 # .env 파일 로드 (다른 import보다 먼저!)
 load_dotenv()
 
-from fastapi import FastAPI
+# Windows: psycopg async는 ProactorEventLoop를 지원하지 않음
+if sys.platform == 'win32':
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+from fastapi import FastAPI, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from routers import bangkku
 from routers import prompt_router, test_result_router
 from database.connection import DatabaseConnection
+from database.async_connection import AsyncDatabaseConnection
+from services.bangkku import gemini_service, veo3_service
+from services.bangkku.background_removal import background_removal_executor
+from services.bangkku.video_job_service import video_job_manager
+from services.prompt_cache import default_prompt_cache
+from services.prompt_counters import prompt_counter_aggregator
+from services.test_result_writer import test_result_writer
+from services.service_metrics import register_service_metrics
+from utils.tracing import TracingMiddleware
+from utils.metrics import MetricsMiddleware, metrics_payload
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== Lifespan ====================
+
+# 워밍업 단계별 상태 (/health에 노출)
+warmup_status: Dict[str, Any] = {}
+
+
+async def _warmup_step(name: str, warmup: Callable[[], Awaitable[Any]]) -> None:
+    """워밍업 단계 하나 실행 (실패해도 서비스는 첫 사용 시 다시 초기화)"""
+    started = time.perf_counter()
+    try:
+        await warmup()
+        warmup_status[name] = {"status": "ready", "ms": round((time.perf_counter() - started) * 1000, 1)}
+    except Exception as e:
+        logger.warning(f"Warmup of {name} failed: {str(e)}")
+        warmup_status[name] = {"status": "failed", "error": str(e)}
+
+
+async def warmup_services() -> None:
+    """
+    백그라운드 워밍업: Gemini/Veo 클라이언트 생성(SDK import), rembg 워커/모델 로드
+    서비스는 지연 생성되므로 워밍업 전에 들어온 요청도 정상 처리됩니다 (첫 요청만 느림).
+    """
+    await asyncio.gather(
+        _warmup_step("gemini", lambda: asyncio.to_thread(gemini_service.get)),
+        _warmup_step("veo3", lambda: asyncio.to_thread(veo3_service.get)),
+        _warmup_step("rembg", background_removal_executor.warmup)
+    )
+    print("✅ Service warmup finished")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    시작: 비동기 DB 풀, 기본 프롬프트 캐시, 카운터/테스트 결과 쓰기 큐, 진행 중 비디오 작업 복구
+    종료: 역순으로 정리 후 배경 제거 워커 및 DB 연결 풀 해제
+
+    AI 서비스(Gemini/Veo)와 rembg 워커는 첫 사용 시 생성되며, SERVICE_WARMUP=true면(기본값 false) 백그라운드에서 미리 준비합니다.
+    동기 DB 풀(psycopg2)은 스크립트용이므로 첫 사용 시 생성됩니다.
+    """
+    await AsyncDatabaseConnection.initialize_pool()
+    await default_prompt_cache.start()
+    await prompt_counter_aggregator.start()
+    await test_result_writer.start()
+    # 진행 중 작업 복구는 폴러가 백그라운드에서 수행 (DB 장애 시 시작을 막지 않음)
+    await video_job_manager.start()
+
+    warmup_task = None
+    if os.getenv("SERVICE_WARMUP", "false").lower() in ("1", "true", "yes"):
+        warmup_task = asyncio.create_task(warmup_services())
+
+    try:
+        yield
+    finally:
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+            await asyncio.gather(warmup_task, return_exceptions=True)
+
+        await video_job_manager.stop()
+        await default_prompt_cache.stop()
+        await prompt_counter_aggregator.stop()
+        await test_result_writer.stop()
+        background_removal_executor.shutdown()
+        await AsyncDatabaseConnection.close_pool()
+        DatabaseConnection.close_all_connections()
+        print("✅ Database connection pool closed")
+
 
 app = FastAPI(
     title="새움 AI 테스트공간",
     description="Bangkku, AniTalk, BAIK 서비스 통합 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정 - 환경변수에서 읽기
@@ -40,14 +131,22 @@ cors_origins_str = os.getenv(
 )
 cors_origins = [origin.strip() for origin in cors_origins_str.split(",")]
 
+# 요청별 스테이지 span → Server-Timing 헤더 + OTLP/JSON 파일 (CORS보다 안쪽)
+app.add_middleware(TracingMiddleware, path_prefixes=("/api/",))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Encode-Time-Ms", "X-Encode-Policy", "X-Encode-Source", "X-Queue-Wait-Ms", "Retry-After", "Server-Timing", "X-Trace-Id", "X-Next-Cursor"],
 )
 
+# Prometheus 요청 지연 / 진행 중 요청 (가장 바깥, CORS preflight 포함)
+app.add_middleware(MetricsMiddleware, exclude_paths=("/metrics",))
+register_service_metrics()
+
 # Static Files 설정
 STATIC_DIR = Path(__file__).parent / "static"
 STATIC_DIR.mkdir(exist_ok=True)  # 디렉토리가 없으면 생성
@@ -55,21 +154,6 @@ app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
 
-# Startup/Shutdown Events
-@app.on_event("startup")
-async def startup_event():
-    """애플리케이션 시작시 DB 연결 풀 초기화"""
-    DatabaseConnection.initialize_pool()
-    print("✅ Database connection pool initialized")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """애플리케이션 종료시 DB 연결 풀 해제"""
-    DatabaseConnection.close_pool()
-    print("✅ Database connection pool closed")
-
-
 # 라우터 등록
 app.include_router(bangkku.router, prefix="/api/bangkku", tags=["bangkku"])
 app.include_router(prompt_router.router)  # prefix already set in router
@@ -85,7 +169,21 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "warmup": warmup_status}
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus 스크레이프 (요청 지연, 외부 API 호출, DB 풀, 워커 대기열 등)"""
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/health/db")
+async def database_diagnostics():
+    """DB 연결 풀 진단 (비동기 풀: 사용 중/유휴 연결, 대기 시간, 요청 실패 / 동기 풀: 체크아웃 수)"""
+    return {
+        "sync_pool": DatabaseConnection.get_stats(),
+        "async_pool": AsyncDatabaseConnection.get_stats()
+    }
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,307 @@
+"""
+Async Base Repository
+Common CRUD operations for all repositories (psycopg3 async pool)
+Same surface as BaseRepository, but every method is a coroutine
+"""
+from datetime import datetime
+from typing import Optional, TypeVar, Generic, List, Dict, Any, Tuple
+from psycopg.types.json import Jsonb
+from database.async_connection import get_async_db_cursor
+from repos.pagination import keyset_condition, keyset_order, next_page
+
+T = TypeVar('T')
+
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    Async base repository with common CRUD operations
+
+    Usage:
+        class PromptRepository(AsyncBaseRepository):
+            def __init__(self):
+                super().__init__(
+                    table_name='prompts',
+                    pk_column='prompt_key'
+                )
+    """
+
+    def __init__(self, table_name: str, pk_column: str):
+        self.table_name = table_name
+        self.pk_column = pk_column
+
+    async def create(self, data: Dict[str, Any]) -> int:
+        """
+        Insert a new record
+
+        Args:
+            data: Dictionary of column:value pairs
+
+        Returns:
+            int: Primary key of inserted record
+        """
+        # Convert lists/dicts to JSONB parameters
+        processed_data = {}
+        for key, value in data.items():
+            if isinstance(value, (list, dict)):
+                # Wrap Python list/dict for JSONB columns
+                processed_data[key] = Jsonb(value)
+            else:
+                processed_data[key] = value
+
+        # Add creation timestamp
+        processed_data['cre_date'] = datetime.now()
+
+        columns = ', '.join(processed_data.keys())
+        placeholders = ', '.join(['%s'] * len(processed_data))
+        values = tuple(processed_data.values())
+
+        query = f"""
+            INSERT INTO {self.table_name} ({columns})
+            VALUES ({placeholders})
+            RETURNING {self.pk_column}
+        """
+
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, values)
+            result = await cursor.fetchone()
+            return result[self.pk_column]
+
+    async def create_many(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert multiple records with one multi-row INSERT
+
+        Args:
+            rows: List of column:value dictionaries (all rows must have the same columns).
+                  cre_date is kept if present (e.g. the time a queued row was produced).
+
+        Returns:
+            int: Number of inserted records
+        """
+        if not rows:
+            return 0
+
+        processed_rows = []
+        for data in rows:
+            processed_data = {}
+            for key, value in data.items():
+                if isinstance(value, (list, dict)):
+                    # Wrap Python list/dict for JSONB columns
+                    processed_data[key] = Jsonb(value)
+                else:
+                    processed_data[key] = value
+            processed_data.setdefault('cre_date', datetime.now())
+            processed_rows.append(processed_data)
+
+        column_names = list(processed_rows[0].keys())
+        columns = ', '.join(column_names)
+        row_placeholder = '(' + ', '.join(['%s'] * len(column_names)) + ')'
+        placeholders = ', '.join([row_placeholder] * len(processed_rows))
+        values = tuple(row[col] for row in processed_rows for col in column_names)
+
+        query = f"""
+            INSERT INTO {self.table_name} ({columns})
+            VALUES {placeholders}
+        """
+
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, values)
+            return cursor.rowcount
+
+    async def get_by_id(self, pk_value: int) -> Optional[Dict[str, Any]]:
+        """
+        Get record by primary key
+
+        Args:
+            pk_value: Primary key value
+
+        Returns:
+            Optional[Dict]: Record as dictionary or None
+        """
+        query = f"""
+            SELECT * FROM {self.table_name}
+            WHERE {self.pk_column} = %s AND delete_yn = 0
+        """
+
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, (pk_value,))
+            result = await cursor.fetchone()
+            return dict(result) if result else None
+
+    async def update(self, pk_value: int, data: Dict[str, Any]) -> bool:
+        """
+        Update a record
+
+        Args:
+            pk_value: Primary key value
+            data: Dictionary of column:value pairs to update
+
+        Returns:
+            bool: True if updated, False if not found
+        """
+        # Convert lists/dicts to JSONB parameters
+        processed_data = {}
+        for key, value in data.items():
+            if isinstance(value, (list, dict)):
+                # Wrap Python list/dict for JSONB columns
+                processed_data[key] = Jsonb(value)
+            else:
+                processed_data[key] = value
+
+        # Add update timestamp
+        processed_data['upd_date'] = datetime.now()
+
+        set_clause = ', '.join([f"{col} = %s" for col in processed_data.keys()])
+        values = tuple(processed_data.values()) + (pk_value,)
+
+        query = f"""
+            UPDATE {self.table_name}
+            SET {set_clause}
+            WHERE {self.pk_column} = %s AND delete_yn = 0
+        """
+
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, values)
+            return cursor.rowcount > 0
+
+    async def delete(self, pk_value: int) -> bool:
+        """
+        Soft delete a record (set delete_yn = 1)
+
+        Args:
+            pk_value: Primary key value
+
+        Returns:
+            bool: True if deleted, False if not found
+        """
+        query = f"""
+            UPDATE {self.table_name}
+            SET delete_yn = 1, upd_date = %s
+            WHERE {self.pk_column} = %s AND delete_yn = 0
+        """
+
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, (datetime.now(), pk_value))
+            return cursor.rowcount > 0
+
+    def _select_list(self, columns: Optional[List[str]], required: Tuple[str, ...] = ()) -> str:
+        """SELECT list (all columns by default, required columns are always included)"""
+        if not columns:
+            return "*"
+        return ', '.join(list(columns) + [col for col in required if col not in columns])
+
+    async def list(
+        self,
+        where: Optional[str] = None,
+        params: Optional[tuple] = None,
+        order_by: Optional[str] = None,
+        limit: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List records with optional filters
+
+        Args:
+            where: WHERE clause (e.g., "prompt_kind = %s")
+            params: Parameters for WHERE clause
+            order_by: ORDER BY clause (e.g., "cre_date DESC")
+            limit: Maximum number of records
+            columns: Columns to select (default: all)
+
+        Returns:
+            List[Dict]: List of records
+        """
+        query = f"SELECT {self._select_list(columns)} FROM {self.table_name} WHERE delete_yn = 0"
+        values = tuple(params or ())
+
+        if where:
+            query += f" AND {where}"
+
+        if order_by:
+            query += f" ORDER BY {order_by}"
+
+        if limit:
+            query += " LIMIT %s"
+            values += (limit,)
+
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, values)
+            results = await cursor.fetchall()
+            return [dict(row) for row in results]
+
+    async def list_page(
+        self,
+        where: Optional[str] = None,
+        params: Optional[tuple] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List records newest first with keyset pagination on (cre_date, pk)
+
+        Args:
+            where: WHERE clause (e.g., "prompt_kind = %s")
+            params: Parameters for WHERE clause
+            limit: Page size
+            cursor: next_cursor from the previous page (None for the first page)
+            columns: Columns to select (default: all, cre_date and pk are always included)
+
+        Returns:
+            Tuple[List[Dict], Optional[str]]: (records, next_cursor or None on the last page)
+
+        Raises:
+            InvalidCursor: Malformed cursor
+        """
+        conditions = ["delete_yn = 0"]
+        values = tuple(params or ())
+
+        if where:
+            conditions.append(where)
+
+        after, after_params = keyset_condition(cursor, "cre_date", self.pk_column)
+        if after:
+            conditions.append(after)
+            values += after_params
+
+        query = f"""
+            SELECT {self._select_list(columns, ('cre_date', self.pk_column))}
+            FROM {self.table_name}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {keyset_order('cre_date', self.pk_column)}
+            LIMIT %s
+        """
+
+        rows = await self.execute(query, values + (limit + 1,))
+        return next_page(rows, limit, self.pk_column)
+
+    async def execute(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """
+        Execute custom SQL query
+
+        Args:
+            query: SQL query
+            params: Query parameters
+
+        Returns:
+            List[Dict]: Query results
+        """
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, params or ())
+            results = await cursor.fetchall()
+            return [dict(row) for row in results]
+
+    async def execute_one(self, query: str, params: Optional[tuple] = None) -> Optional[Dict[str, Any]]:
+        """
+        Execute custom SQL query and return first result
+
+        Args:
+            query: SQL query
+            params: Query parameters
+
+        Returns:
+            Optional[Dict]: First result or None
+        """
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, params or ())
+            result = await cursor.fetchone()
+            return dict(result) if result else None
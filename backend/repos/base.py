@@ -4,8 +4,9 @@ Common CRUD operations for all repositories
 """
 import json
 from datetime import datetime
-from typing import Optional, TypeVar, Generic, List, Dict, Any
+from typing import Optional, TypeVar, Generic, List, Dict, Any, Tuple
 from database.connection import get_db_cursor
+from repos.pagination import keyset_condition, keyset_order, next_page
 
 T = TypeVar('T')
 
@@ -140,12 +141,19 @@ class BaseRepository(Generic[T]):
             cursor.execute(query, (datetime.now(), pk_value))
             return cursor.rowcount > 0
 
+    def _select_list(self, columns: Optional[List[str]], required: Tuple[str, ...] = ()) -> str:
+        """SELECT list (all columns by default, required columns are always included)"""
+        if not columns:
+            return "*"
+        return ', '.join(list(columns) + [col for col in required if col not in columns])
+
     def list(
         self,
         where: Optional[str] = None,
         params: Optional[tuple] = None,
         order_by: Optional[str] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        columns: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         List records with optional filters
@@ -155,11 +163,13 @@ class BaseRepository(Generic[T]):
             params: Parameters for WHERE clause
             order_by: ORDER BY clause (e.g., "cre_date DESC")
             limit: Maximum number of records
+            columns: Columns to select (default: all)
 
         Returns:
             List[Dict]: List of records
         """
-        query = f"SELECT * FROM {self.table_name} WHERE delete_yn = 0"
+        query = f"SELECT {self._select_list(columns)} FROM {self.table_name} WHERE delete_yn = 0"
+        values = tuple(params or ())
 
         if where:
             query += f" AND {where}"
@@ -168,13 +178,60 @@ class BaseRepository(Generic[T]):
             query += f" ORDER BY {order_by}"
 
         if limit:
-            query += f" LIMIT {limit}"
+            query += " LIMIT %s"
+            values += (limit,)
 
         with get_db_cursor() as cursor:
-            cursor.execute(query, params or ())
+            cursor.execute(query, values)
             results = cursor.fetchall()
             return [dict(row) for row in results]
 
+    def list_page(
+        self,
+        where: Optional[str] = None,
+        params: Optional[tuple] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List records newest first with keyset pagination on (cre_date, pk)
+
+        Args:
+            where: WHERE clause (e.g., "prompt_kind = %s")
+            params: Parameters for WHERE clause
+            limit: Page size
+            cursor: next_cursor from the previous page (None for the first page)
+            columns: Columns to select (default: all, cre_date and pk are always included)
+
+        Returns:
+            Tuple[List[Dict], Optional[str]]: (records, next_cursor or None on the last page)
+
+        Raises:
+            InvalidCursor: Malformed cursor
+        """
+        conditions = ["delete_yn = 0"]
+        values = tuple(params or ())
+
+        if where:
+            conditions.append(where)
+
+        after, after_params = keyset_condition(cursor, "cre_date", self.pk_column)
+        if after:
+            conditions.append(after)
+            values += after_params
+
+        query = f"""
+            SELECT {self._select_list(columns, ('cre_date', self.pk_column))}
+            FROM {self.table_name}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {keyset_order('cre_date', self.pk_column)}
+            LIMIT %s
+        """
+
+        rows = self.execute(query, values + (limit + 1,))
+        return next_page(rows, limit, self.pk_column)
+
     def execute(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """
         Execute custom SQL query
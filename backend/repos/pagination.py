@@ -0,0 +1,100 @@
+"""
+Keyset Pagination
+(cre_date, pk) 기준 최신순 커서 페이지네이션
+
+- 커서: 마지막 행의 (cre_date, pk)를 base64url JSON으로 감싼 불투명 문자열
+- 다음 페이지 조건: (cre_date, pk) < (커서 값) → (cre_date DESC, pk DESC) 복합 인덱스로 바로 이어서 읽음
+  (OFFSET처럼 앞 페이지 행을 건너뛰며 읽지 않으므로 페이지가 깊어져도 비용이 일정)
+- limit + 1행을 읽어 다음 페이지 존재 여부 판단
+"""
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+
+
+class InvalidCursor(ValueError):
+    """잘못된 페이지 커서 (라우터에서 400으로 변환)"""
+
+
+def encode_cursor(cre_date: datetime, pk_value: int) -> str:
+    """
+    페이지 커서 생성
+
+    Args:
+        cre_date: 마지막 행의 생성 일시
+        pk_value: 마지막 행의 primary key
+
+    Returns:
+        str: 불투명 커서 문자열
+    """
+    payload = json.dumps({"d": cre_date.isoformat(), "k": pk_value}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    페이지 커서 해석
+
+    Args:
+        cursor: encode_cursor로 만든 문자열
+
+    Returns:
+        Tuple[datetime, int]: (cre_date, pk)
+
+    Raises:
+        InvalidCursor: 형식이 맞지 않는 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        cre_date = datetime.fromisoformat(payload["d"])
+        pk_value = payload["k"]
+        if not isinstance(pk_value, int) or isinstance(pk_value, bool):
+            raise TypeError("pk must be an integer")
+        return cre_date, pk_value
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor[:64]}") from e
+
+
+def keyset_condition(cursor: Optional[str], date_column: str, pk_column: str) -> Tuple[str, tuple]:
+    """
+    커서 이후 행 조건
+
+    Args:
+        cursor: 이전 페이지의 next_cursor (None이면 첫 페이지)
+        date_column: 생성 일시 컬럼 (조인 쿼리면 별칭 포함, 예: tr.cre_date)
+        pk_column: primary key 컬럼 (예: tr.test_result_key)
+
+    Returns:
+        Tuple[str, tuple]: (WHERE 조건 또는 "", 파라미터)
+    """
+    if not cursor:
+        return "", ()
+    cre_date, pk_value = decode_cursor(cursor)
+    return f"({date_column}, {pk_column}) < (%s, %s)", (cre_date, pk_value)
+
+
+def keyset_order(date_column: str, pk_column: str) -> str:
+    """커서와 같은 순서의 ORDER BY 절 (최신순)"""
+    return f"{date_column} DESC, {pk_column} DESC"
+
+
+def next_page(rows: List[Dict[str, Any]], limit: int, pk_column: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    limit + 1행 조회 결과를 페이지와 다음 커서로 분리
+
+    Args:
+        rows: limit + 1개까지 조회한 행 (cre_date, pk 컬럼 포함)
+        limit: 페이지 크기
+        pk_column: primary key 컬럼 이름 (결과 dict 키)
+
+    Returns:
+        Tuple[List[Dict], Optional[str]]: (페이지 행, 다음 페이지 커서 또는 None)
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last["cre_date"], last[pk_column])
@@ -2,12 +2,19 @@
 Prompt Repository
 Business logic for prompts table
 """
-from typing import Optional, Dict, Any, List
-from repos.base import BaseRepository
-from database.connection import get_db_cursor
+from typing import Optional, Dict, Any, List, Tuple
+from repos.async_base import AsyncBaseRepository
+from database.async_connection import get_async_db_cursor
 
+# 목록 조회 컬럼 (Prompt 모델 필드)
+PROMPT_LIST_COLUMNS = (
+    'prompt_key', 'prompt_kind', 'model_kind', 'prompt_text', 'is_default_yn', 'use_cnt',
+    'success_cnt', 'avg_rating', 'input_images', 'cre_date', 'cre_user_key', 'upd_date',
+    'upd_user_key', 'delete_yn'
+)
 
-class PromptRepository(BaseRepository):
+
+class PromptRepository(AsyncBaseRepository):
     """Repository for prompts table"""
 
     def __init__(self):
@@ -16,7 +23,7 @@ class PromptRepository(BaseRepository):
             pk_column='prompt_key'
         )
 
-    def get_default(self, prompt_kind: str) -> Optional[Dict[str, Any]]:
+    async def get_default(self, prompt_kind: str) -> Optional[Dict[str, Any]]:
         """
         Get default prompt for a specific prompt_kind
 
@@ -31,31 +38,70 @@ class PromptRepository(BaseRepository):
             WHERE prompt_kind = %s AND is_default_yn = 1 AND delete_yn = 0
             LIMIT 1
         """
-        return self.execute_one(query, (prompt_kind,))
+        return await self.execute_one(query, (prompt_kind,))
 
-    def get_by_kind(self, prompt_kind: str, include_non_default: bool = True) -> List[Dict[str, Any]]:
+    async def find_by_text(self, prompt_kind: str, prompt_text: str) -> Optional[Dict[str, Any]]:
         """
-        Get all prompts for a specific prompt_kind
+        Get the oldest live prompt with the same kind and text
 
         Args:
             prompt_kind: Service/feature path
-            include_non_default: Include non-default prompts
+            prompt_text: Exact prompt text
 
         Returns:
-            List[Dict]: List of prompts ordered by creation date desc
+            Optional[Dict]: Matching prompt or None
+        """
+        query = """
+            SELECT * FROM prompts
+            WHERE prompt_kind = %s AND prompt_text = %s AND delete_yn = 0
+            ORDER BY prompt_key ASC
+            LIMIT 1
         """
-        if include_non_default:
-            where = "prompt_kind = %s"
-        else:
-            where = "prompt_kind = %s AND is_default_yn = 1"
+        return await self.execute_one(query, (prompt_kind, prompt_text))
+
+    async def list_by_kind(
+        self,
+        prompt_kind: Optional[str] = None,
+        include_non_default: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        text_limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List prompts newest first, one page at a time
+
+        Args:
+            prompt_kind: Service/feature path (None for all kinds)
+            include_non_default: Include non-default prompts
+            limit: Page size
+            cursor: next_cursor from the previous page
+            text_limit: Truncate prompt_text to this many characters (None for full text)
 
-        return self.list(
-            where=where,
-            params=(prompt_kind,),
-            order_by="cre_date DESC"
+        Returns:
+            Tuple[List[Dict], Optional[str]]: (prompts, next_cursor)
+        """
+        conditions = []
+        params = []
+
+        if prompt_kind:
+            conditions.append("prompt_kind = %s")
+            params.append(prompt_kind)
+        if not include_non_default:
+            conditions.append("is_default_yn = 1")
+
+        columns = list(PROMPT_LIST_COLUMNS)
+        if text_limit:
+            columns[columns.index('prompt_text')] = f"LEFT(prompt_text, {int(text_limit)}) AS prompt_text"
+
+        return await self.list_page(
+            where=' AND '.join(conditions) or None,
+            params=tuple(params),
+            limit=limit,
+            cursor=cursor,
+            columns=columns
         )
 
-    def increment_use_cnt(self, prompt_key: int) -> bool:
+    async def increment_use_cnt(self, prompt_key: int) -> bool:
         """
         Increment use count by 1
 
@@ -70,11 +116,11 @@ class PromptRepository(BaseRepository):
             SET use_cnt = use_cnt + 1
             WHERE prompt_key = %s AND delete_yn = 0
         """
-        with get_db_cursor() as cursor:
-            cursor.execute(query, (prompt_key,))
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, (prompt_key,))
             return cursor.rowcount > 0
 
-    def increment_success_cnt(self, prompt_key: int) -> bool:
+    async def increment_success_cnt(self, prompt_key: int) -> bool:
         """
         Increment success count by 1
 
@@ -89,11 +135,40 @@ class PromptRepository(BaseRepository):
             SET success_cnt = success_cnt + 1
             WHERE prompt_key = %s AND delete_yn = 0
         """
-        with get_db_cursor() as cursor:
-            cursor.execute(query, (prompt_key,))
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, (prompt_key,))
             return cursor.rowcount > 0
 
-    def update_avg_rating(self, prompt_key: int) -> bool:
+    async def apply_counter_deltas(self, deltas: List[Tuple[int, int, int]]) -> int:
+        """
+        Apply aggregated use/success count increments in a single UPDATE
+
+        Args:
+            deltas: List of (prompt_key, use_delta, success_delta)
+
+        Returns:
+            int: Number of updated rows
+        """
+        if not deltas:
+            return 0
+
+        # prompt_key 순서로 정렬하여 워커 간 행 잠금 순서를 일정하게 유지
+        deltas = sorted(deltas)
+        values = ', '.join(['(%s::bigint, %s::integer, %s::integer)'] * len(deltas))
+        params = tuple(value for delta in deltas for value in delta)
+
+        query = f"""
+            UPDATE prompts AS p
+            SET use_cnt = p.use_cnt + v.use_delta,
+                success_cnt = p.success_cnt + v.success_delta
+            FROM (VALUES {values}) AS v(prompt_key, use_delta, success_delta)
+            WHERE p.prompt_key = v.prompt_key AND p.delete_yn = 0
+        """
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, params)
+            return cursor.rowcount
+
+    async def update_avg_rating(self, prompt_key: int) -> bool:
         """
         Recalculate and update average rating from prompt_ratings table
 
@@ -112,11 +187,11 @@ class PromptRepository(BaseRepository):
             )
             WHERE prompt_key = %s AND delete_yn = 0
         """
-        with get_db_cursor() as cursor:
-            cursor.execute(query, (prompt_key, prompt_key))
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, (prompt_key, prompt_key))
             return cursor.rowcount > 0
 
-    def set_as_default(self, prompt_key: int) -> bool:
+    async def set_as_default(self, prompt_key: int) -> bool:
         """
         Set a prompt as default (and unset others of same prompt_kind)
 
@@ -127,7 +202,7 @@ class PromptRepository(BaseRepository):
             bool: True if successful
         """
         # Get prompt_kind first
-        prompt = self.get_by_id(prompt_key)
+        prompt = await self.get_by_id(prompt_key)
         if not prompt:
             return False
 
@@ -145,12 +220,12 @@ class PromptRepository(BaseRepository):
             WHERE prompt_key = %s AND delete_yn = 0
         """
 
-        with get_db_cursor() as cursor:
-            cursor.execute(query_unset, (prompt_kind,))
-            cursor.execute(query_set, (prompt_key,))
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query_unset, (prompt_kind,))
+            await cursor.execute(query_set, (prompt_key,))
             return cursor.rowcount > 0
 
-    def get_statistics(self, prompt_key: int) -> Optional[Dict[str, Any]]:
+    async def get_statistics(self, prompt_key: int) -> Optional[Dict[str, Any]]:
         """
         Get statistics for a prompt
 
@@ -176,4 +251,4 @@ class PromptRepository(BaseRepository):
             WHERE p.prompt_key = %s AND p.delete_yn = 0
             GROUP BY p.prompt_key
         """
-        return self.execute_one(query, (prompt_key,))
+        return await self.execute_one(query, (prompt_key,))
@@ -2,11 +2,12 @@
 Rating Repository
 프롬프트 평가 데이터 접근 레이어
 """
-from typing import Optional, List, Dict, Any
-from repos.base import BaseRepository
+from typing import Optional, List, Dict, Any, Tuple
+from repos.async_base import AsyncBaseRepository
+from repos.pagination import keyset_condition, keyset_order, next_page
 
 
-class RatingRepository(BaseRepository):
+class RatingRepository(AsyncBaseRepository):
     """프롬프트 평가 Repository"""
 
     def __init__(self):
@@ -15,25 +16,31 @@ class RatingRepository(BaseRepository):
             pk_column='rating_key'
         )
 
-    def get_by_prompt_key(self, prompt_key: int, limit: int = 50) -> List[Dict[str, Any]]:
+    async def get_by_prompt_key(
+        self,
+        prompt_key: int,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        특정 프롬프트의 평가 목록 조회
+        특정 프롬프트의 평가 목록 조회 (최신순, 커서 페이지)
 
         Args:
             prompt_key: 프롬프트 primary key
-            limit: 최대 조회 개수
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor
 
         Returns:
-            List[Dict]: 평가 목록
+            Tuple[List[Dict], Optional[str]]: (평가 목록, 다음 페이지 커서)
         """
-        return self.list(
+        return await self.list_page(
             where="prompt_key = %s",
             params=(prompt_key,),
-            order_by="cre_date DESC",
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
 
-    def get_by_test_result_key(self, test_result_key: int) -> List[Dict[str, Any]]:
+    async def get_by_test_result_key(self, test_result_key: int) -> List[Dict[str, Any]]:
         """
         특정 테스트 결과의 평가 목록 조회
 
@@ -43,13 +50,13 @@ class RatingRepository(BaseRepository):
         Returns:
             List[Dict]: 평가 목록
         """
-        return self.list(
+        return await self.list(
             where="test_result_key = %s",
             params=(test_result_key,),
             order_by="cre_date DESC"
         )
 
-    def get_average_rating(self, prompt_key: int) -> Optional[Dict[str, Any]]:
+    async def get_average_rating(self, prompt_key: int) -> Optional[Dict[str, Any]]:
         """
         특정 프롬프트의 평균 평점 및 통계 조회
 
@@ -76,7 +83,7 @@ class RatingRepository(BaseRepository):
             FROM saeum_ai_api.prompt_ratings
             WHERE prompt_key = %s AND delete_yn = 0
         """
-        result = self.execute_one(query, (prompt_key,))
+        result = await self.execute_one(query, (prompt_key,))
 
         if not result or result['total_ratings'] == 0:
             return None
@@ -93,25 +100,33 @@ class RatingRepository(BaseRepository):
             }
         }
 
-    def get_recent_ratings(self, limit: int = 20) -> List[Dict[str, Any]]:
+    async def get_recent_ratings(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        최근 평가 목록 조회 (전체 프롬프트)
+        최근 평가 목록 조회 (전체 프롬프트, 커서 페이지)
 
         Args:
-            limit: 최대 조회 개수
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor
 
         Returns:
-            List[Dict]: 평가 목록
+            Tuple[List[Dict], Optional[str]]: (평가 목록 + 프롬프트 종류, 다음 페이지 커서)
         """
-        query = """
+        after, params = keyset_condition(cursor, "r.cre_date", "r.rating_key")
+
+        # 프롬프트 본문(prompt_text)은 목록에 필요 없으므로 종류만 조인
+        query = f"""
             SELECT
                 r.*,
-                p.prompt_kind,
-                p.prompt_text
+                p.prompt_kind
             FROM saeum_ai_api.prompt_ratings r
             LEFT JOIN saeum_ai_api.prompts p ON r.prompt_key = p.prompt_key
-            WHERE r.delete_yn = 0
-            ORDER BY r.cre_date DESC
+            WHERE r.delete_yn = 0{' AND ' + after if after else ''}
+            ORDER BY {keyset_order('r.cre_date', 'r.rating_key')}
             LIMIT %s
         """
-        return self.execute(query, (limit,))
+        rows = await self.execute(query, params + (limit + 1,))
+        return next_page(rows, limit, self.pk_column)
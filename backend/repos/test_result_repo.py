@@ -2,11 +2,18 @@
 Test Result Repository
 Business logic for prompt_test_results table
 """
-from typing import List, Dict, Any
-from repos.base import BaseRepository
+from typing import List, Dict, Any, Optional, Tuple
+from repos.async_base import AsyncBaseRepository
+from repos.pagination import keyset_condition, keyset_order, next_page
 
+# 목록 조회 컬럼 (PromptTestResult 모델 필드)
+TEST_RESULT_LIST_COLUMNS = (
+    'test_result_key', 'prompt_key', 'input_params', 'output_url', 'execution_time_ms',
+    'token_cnt', 'cost_amount', 'success_yn', 'error_msg', 'cre_date', 'cre_user_key', 'delete_yn'
+)
 
-class TestResultRepository(BaseRepository):
+
+class TestResultRepository(AsyncBaseRepository):
     """Repository for prompt_test_results table"""
 
     def __init__(self):
@@ -15,22 +22,42 @@ class TestResultRepository(BaseRepository):
             pk_column='test_result_key'
         )
 
-    def get_by_prompt(
+    async def reserve_keys(self, count: int) -> List[int]:
+        """
+        Reserve primary keys from the table sequence
+        (lets queued inserts hand out test_result_key before the row is written)
+
+        Args:
+            count: Number of keys to reserve
+
+        Returns:
+            List[int]: Reserved test_result_key values
+        """
+        query = """
+            SELECT nextval('saeum_ai_api.prompt_test_results_seq') AS test_result_key
+            FROM generate_series(1, %s)
+        """
+        rows = await self.execute(query, (count,))
+        return [row['test_result_key'] for row in rows]
+
+    async def get_by_prompt(
         self,
         prompt_key: int,
         success_only: bool = False,
-        limit: int = 50
-    ) -> List[Dict[str, Any]]:
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
         Get test results for a specific prompt
 
         Args:
             prompt_key: Prompt primary key
             success_only: If True, only return successful results
-            limit: Maximum number of results
+            limit: Page size
+            cursor: next_cursor from the previous page
 
         Returns:
-            List[Dict]: Test results ordered by creation date desc
+            Tuple[List[Dict], Optional[str]]: (test results ordered by creation date desc, next_cursor)
         """
         where = "prompt_key = %s"
         params = [prompt_key]
@@ -38,54 +65,70 @@ class TestResultRepository(BaseRepository):
         if success_only:
             where += " AND success_yn = 1"
 
-        return self.list(
+        return await self.list_page(
             where=where,
             params=tuple(params),
-            order_by="cre_date DESC",
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            columns=list(TEST_RESULT_LIST_COLUMNS)
         )
 
-    def get_recent_results(self, limit: int = 20) -> List[Dict[str, Any]]:
+    async def get_recent_results(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
         Get recent test results across all prompts
 
         Args:
-            limit: Maximum number of results
+            limit: Page size
+            cursor: next_cursor from the previous page
 
         Returns:
-            List[Dict]: Recent test results with prompt info
+            Tuple[List[Dict], Optional[str]]: (recent test results with prompt kind/model, next_cursor)
         """
-        query = """
+        after, params = keyset_condition(cursor, "tr.cre_date", "tr.test_result_key")
+        columns = ', '.join(f"tr.{col}" for col in TEST_RESULT_LIST_COLUMNS)
+
+        # prompt_text는 목록에서 쓰지 않으므로 조인하지 않음 (상세는 프롬프트 조회로)
+        query = f"""
             SELECT
-                tr.*,
+                {columns},
                 p.prompt_kind,
-                p.model_kind,
-                p.prompt_text
+                p.model_kind
             FROM prompt_test_results tr
             JOIN prompts p ON tr.prompt_key = p.prompt_key AND p.delete_yn = 0
-            WHERE tr.delete_yn = 0
-            ORDER BY tr.cre_date DESC
+            WHERE tr.delete_yn = 0{' AND ' + after if after else ''}
+            ORDER BY {keyset_order('tr.cre_date', 'tr.test_result_key')}
             LIMIT %s
         """
-        return self.execute(query, (limit,))
+        rows = await self.execute(query, params + (limit + 1,))
+        return next_page(rows, limit, self.pk_column)
 
-    def get_failure_results(self, limit: int = 20) -> List[Dict[str, Any]]:
+    async def get_failure_results(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
         Get recent failure results for debugging
 
         Args:
-            limit: Maximum number of results
+            limit: Page size
+            cursor: next_cursor from the previous page
 
         Returns:
-            List[Dict]: Failed test results with error messages
+            Tuple[List[Dict], Optional[str]]: (failed test results with error messages, next_cursor)
         """
-        return self.list(
+        return await self.list_page(
             where="success_yn = 0 AND error_msg IS NOT NULL",
-            order_by="cre_date DESC",
-            limit=limit
+            limit=limit,
+            cursor=cursor,
+            columns=list(TEST_RESULT_LIST_COLUMNS)
         )
 
-    def get_performance_stats(self, prompt_key: int) -> Dict[str, Any]:
+    async def get_performance_stats(self, prompt_key: int) -> Dict[str, Any]:
         """
         Get performance statistics for a prompt
 
@@ -108,5 +151,5 @@ class TestResultRepository(BaseRepository):
             FROM prompt_test_results
             WHERE prompt_key = %s AND delete_yn = 0
         """
-        result = self.execute_one(query, (prompt_key,))
+        result = await self.execute_one(query, (prompt_key,))
         return result if result else {}
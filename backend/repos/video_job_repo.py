@@ -0,0 +1,81 @@
+"""
+Video Job Repository
+Business logic for video_jobs table
+"""
+from typing import List, Dict, Any
+from repos.async_base import AsyncBaseRepository
+from database.async_connection import get_async_db_cursor
+
+
+class VideoJobRepository(AsyncBaseRepository):
+    """Repository for video_jobs table"""
+
+    def __init__(self):
+        super().__init__(
+            table_name='video_jobs',
+            pk_column='video_job_key'
+        )
+
+    async def claim_in_flight(self, owner_id: str, lease_seconds: float) -> List[Dict[str, Any]]:
+        """
+        Claim (or renew) in-flight jobs for one worker process
+
+        Jobs already owned by owner_id get their lease extended; unowned jobs and
+        jobs whose lease expired (owner process stopped) are taken over.
+        Rows locked by another worker's claim are skipped (FOR UPDATE SKIP LOCKED).
+
+        Args:
+            owner_id: Worker process identifier
+            lease_seconds: Lease length
+
+        Returns:
+            List[Dict]: Jobs now owned by owner_id, ordered by creation date
+        """
+        return await self.execute(
+            f"""
+            UPDATE {self.table_name}
+            SET owner_id = %s,
+                lease_until = now() + make_interval(secs => %s)
+            WHERE {self.pk_column} IN (
+                SELECT {self.pk_column} FROM {self.table_name}
+                WHERE delete_yn = 0
+                  AND status_kind IN ('pending', 'running')
+                  AND (owner_id IS NULL OR owner_id = %s OR lease_until < now())
+                ORDER BY cre_date ASC
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *
+            """,
+            (owner_id, lease_seconds, owner_id)
+        )
+
+    async def release_owned(self, owner_id: str) -> int:
+        """
+        Release leases held by a stopping worker process
+
+        Args:
+            owner_id: Worker process identifier
+
+        Returns:
+            int: Number of released jobs
+        """
+        query = f"""
+            UPDATE {self.table_name}
+            SET owner_id = NULL, lease_until = NULL
+            WHERE owner_id = %s AND status_kind IN ('pending', 'running')
+        """
+        async with get_async_db_cursor() as cursor:
+            await cursor.execute(query, (owner_id,))
+            return cursor.rowcount
+
+    async def get_in_flight(self) -> List[Dict[str, Any]]:
+        """
+        Get jobs that have not reached a terminal state
+
+        Returns:
+            List[Dict]: Pending/running jobs ordered by creation date
+        """
+        return await self.list(
+            where="status_kind IN ('pending', 'running')",
+            order_by="cre_date ASC"
+        )
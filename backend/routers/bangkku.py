@@ -2,28 +2,57 @@
 Bangkku Router
 방꾸 서비스 API 엔드포인트
 """
+import os
+import json
+import math
 import logging
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import UploadFile
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple, Literal, Any
 from services.bangkku import gemini_service
-from services.bangkku.veo3_service import veo3_service
+from services.bangkku.video_job_service import video_job_manager
+from services.bangkku.result_cache import result_cache
+from services.bangkku.video_store import video_store
+from services.bangkku.matting import MATTING_QUALITIES
+from services.bangkku.prompt_compare import prompt_compare_service
+from services.prompt_cache import default_prompt_cache
+from services.prompt_counters import prompt_counter_aggregator
+from services.test_result_writer import test_result_writer
+from services.bangkku.background_removal import (
+    background_removal_executor,
+    BackgroundRemovalQueueFull
+)
+from services.bangkku.api_governor import api_governor, ApiRateLimited
+from services.bangkku.single_flight import single_flight
+from utils.tracing import span, span_exporter
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 바이너리 업로드 요청 body 상한 (multipart는 전체 파일 합계)
+MAX_UPLOAD_BYTES = int(float(os.getenv("MAX_UPLOAD_MB", 20)) * 1024 * 1024)
+
+# 배경 제거 품질 모드 (fast: 저해상도 마스크, balanced: 중간 해상도 마스크, full: 원본 해상도)
+MattingQuality = Literal["fast", "balanced", "full"]
+
 # ==================== Request Models ====================
 
 class ImageProcessRequest(BaseModel):
     """단일 이미지 처리 요청"""
     prompt: str
     image: str  # base64 data URL
+    bypassCache: bool = False  # True면 결과 캐시 미사용 (A/B 테스트용)
+    mattingQuality: Optional[MattingQuality] = None  # None이면 MATTING_QUALITY 기본값
 
 class MultipleImagesRequest(BaseModel):
     """다중 이미지 처리 요청"""
     prompt: str
     images: List[str]  # base64 data URLs
+    bypassCache: bool = False  # True면 결과 캐시 미사용 (A/B 테스트용)
+    mattingQuality: Optional[MattingQuality] = None  # None이면 MATTING_QUALITY 기본값
 
 class VideoGenerationRequest(BaseModel):
     """비디오 생성 요청 (HTTP용)"""
@@ -31,9 +60,20 @@ class VideoGenerationRequest(BaseModel):
     image: str  # base64 data URL
     lastFrame: Optional[str] = None  # base64 data URL
 
+class ComparePromptsRequest(BaseModel):
+    """다중 프롬프트 비교 요청 (이미지 1장 × 프롬프트 N개)"""
+    image: str  # base64 data URL
+    promptKind: Optional[str] = None  # 프롬프트 종류 (promptKeys 검증, prompts 저장에 사용)
+    promptKeys: List[int] = []  # 비교할 저장된 프롬프트
+    prompts: List[str] = []  # 비교할 프롬프트 텍스트 (saveResults면 비기본 프롬프트로 저장)
+    saveResults: bool = True  # 후보별 테스트 결과 기록
+    bypassCache: bool = False
+    mattingQuality: Optional[MattingQuality] = None
+
 class RemoveBackgroundRequest(BaseModel):
     """배경 제거 요청"""
     image: str  # base64 data URL
+    mattingQuality: Optional[MattingQuality] = None  # None이면 MATTING_QUALITY 기본값
 
 # ==================== Response Models ====================
 
@@ -41,6 +81,7 @@ class ProcessImageResponse(BaseModel):
     """이미지 처리 응답"""
     status: str
     result: str  # base64 data URL
+    metadata: Optional[Dict[str, Any]] = None  # 출력 인코딩 정보 (format, bytes, encode_ms 등)
 
 class VideoGenerationResponse(BaseModel):
     """비디오 생성 응답"""
@@ -52,82 +93,476 @@ class VideoGenerationResponse(BaseModel):
 
 # ==================== HTTP Endpoints ====================
 
+def _rate_limited(error: ApiRateLimited) -> HTTPException:
+    """API 호출 한도 초과 → 429 (Retry-After 포함)"""
+    logger.warning(f"Upstream API rate limited: {str(error)}")
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(max(1, math.ceil(error.retry_after)))}
+    )
+
+
 @router.post("/process-image", response_model=ProcessImageResponse)
-async def process_image(request: ImageProcessRequest):
+async def process_image(request: ImageProcessRequest, http_request: Request):
     """
     단일 이미지 처리
     - 가구 제거
     - 가구 정면 샷 변환
+    - 출력 포맷은 Accept 헤더의 image/* 선호도로 협상
     """
     try:
-        result = await gemini_service.process_single_image(
+        result, metadata = await gemini_service.process_single_image(
             prompt=request.prompt,
-            image=request.image
+            image=request.image,
+            use_cache=not request.bypassCache,
+            matting_quality=request.mattingQuality,
+            accept=http_request.headers.get("accept")
         )
 
         return ProcessImageResponse(
             status="success",
-            result=result
+            result=result,
+            metadata=metadata
         )
 
+    except ApiRateLimited as e:
+        raise _rate_limited(e)
+
+    except BackgroundRemovalQueueFull as e:
+        logger.warning(f"Background removal queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+
     except Exception as e:
         logger.error(f"Image processing failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/process-multiple-images", response_model=ProcessImageResponse)
-async def process_multiple_images(request: MultipleImagesRequest):
+async def process_multiple_images(request: MultipleImagesRequest, http_request: Request):
     """
     다중 이미지 처리
     - 3D 룸 생성
+    - 출력 포맷은 Accept 헤더의 image/* 선호도로 협상
     """
     try:
-        result = await gemini_service.process_multiple_images(
+        result, metadata = await gemini_service.process_multiple_images(
             prompt=request.prompt,
-            images=request.images
+            images=request.images,
+            use_cache=not request.bypassCache,
+            matting_quality=request.mattingQuality,
+            accept=http_request.headers.get("accept")
         )
 
         return ProcessImageResponse(
             status="success",
-            result=result
+            result=result,
+            metadata=metadata
         )
 
+    except ApiRateLimited as e:
+        raise _rate_limited(e)
+
+    except BackgroundRemovalQueueFull as e:
+        logger.warning(f"Background removal queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+
     except Exception as e:
         logger.error(f"Multiple images processing failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/remove-background", response_model=ProcessImageResponse)
-async def remove_background(request: RemoveBackgroundRequest):
+async def remove_background(request: RemoveBackgroundRequest, http_request: Request):
     """
     이미지 배경 제거 및 여백 크롭
     - AI 기반 배경 제거 (rembg)
     - 여백 자동 크롭
+    - 출력 포맷은 Accept 헤더의 image/* 선호도로 협상 (기본: 무손실 WebP)
     """
     try:
-        # Base64 → PIL Image
-        pil_image = gemini_service.base64_to_pil(request.image)
+        # 배경 제거 → 여백 크롭 → 투명 배경 유지 포맷으로 인코딩
+        result, metadata = await gemini_service.remove_background_data_url(
+            request.image,
+            matting_quality=request.mattingQuality,
+            accept=http_request.headers.get("accept")
+        )
+
+        return ProcessImageResponse(
+            status="success",
+            result=result,
+            metadata=metadata
+        )
+
+    except BackgroundRemovalQueueFull as e:
+        logger.warning(f"Background removal queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Background removal failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # 1단계: 배경 제거
-        transparent_image = gemini_service.remove_background(pil_image)
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """server-sent event 한 건 직렬화"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        # 2단계: 여백 크롭
-        cropped_image = gemini_service.crop_to_object(
-            transparent_image,
-            difference_threshold=5,
-            padding_ratio=0.0
+
+@router.post("/compare-prompts")
+async def compare_prompts(request: ComparePromptsRequest, http_request: Request):
+    """
+    다중 프롬프트 비교 (server-sent events)
+    - 이미지는 한 번만 디코딩하여 모든 후보 프롬프트에 적용
+    - 후보는 서버 세마포어(COMPARE_MAX_CONCURRENCY) 안에서 동시에 실행
+    - 이벤트: start → result(완료 순서, index로 요청 순서 식별) × N → done
+    - 각 결과는 해당 프롬프트의 테스트 결과로 기록 (testResultKey)
+    """
+    try:
+        image_bytes = gemini_service.decode_data_url(request.image)
+    except Exception:
+        raise HTTPException(status_code=422, detail="image must be a base64 data URL")
+
+    try:
+        candidates = await prompt_compare_service.resolve_candidates(
+            prompt_keys=request.promptKeys,
+            prompt_texts=request.prompts,
+            prompt_kind=request.promptKind,
+            save_results=request.saveResults
         )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Prompt compare setup failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # 3단계: Base64로 변환 (PNG로 투명 배경 유지)
-        result = gemini_service.pil_to_base64(cropped_image, format="PNG")
+    async def event_stream():
+        async for event in prompt_compare_service.run(
+            image_bytes,
+            candidates,
+            prompt_kind=request.promptKind,
+            save_results=request.saveResults,
+            use_cache=not request.bypassCache,
+            matting_quality=request.mattingQuality,
+            accept=http_request.headers.get("accept")
+        ):
+            yield _sse(event['event'], event['data'])
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ==================== Binary Endpoints ====================
+# multipart/form-data 또는 application/octet-stream(image/*)으로 원본 이미지 bytes를 받고
+# 처리된 이미지 bytes를 Content-Type과 함께 그대로 반환 (base64 오버헤드 없음)
+
+async def _read_binary_request(request: Request) -> Tuple[Dict[str, str], List[bytes]]:
+    """
+    바이너리 요청에서 필드와 이미지 bytes 추출
 
-        return ProcessImageResponse(
-            status="success",
-            result=result
+    - multipart/form-data: 텍스트 필드 + 파일 파트(업로드 순서 유지)
+    - 그 외(application/octet-stream, image/*): 요청 body 전체가 이미지 1장
+
+    쿼리 파라미터도 필드로 사용되며 multipart 필드가 우선합니다.
+    body가 MAX_UPLOAD_MB를 넘으면 413 (Content-Length가 없는 chunked 요청도 읽는 중에 중단).
+    """
+    fields: Dict[str, str] = dict(request.query_params)
+    images: List[bytes] = []
+
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+        raise _upload_too_large()
+
+    content_type = request.headers.get("content-type", "")
+    with span("decode", content_type=content_type.split(";")[0]):
+        if content_type.startswith("multipart/form-data"):
+            # 파일 파트는 starlette가 임시 파일로 받아 두므로 크기를 확인한 뒤에 메모리로 읽음
+            form = await request.form()
+            total = 0
+            try:
+                for key, value in form.multi_items():
+                    if isinstance(value, UploadFile):
+                        total += value.size or 0
+                        if total > MAX_UPLOAD_BYTES:
+                            raise _upload_too_large()
+                        images.append(await value.read())
+                    else:
+                        fields[key] = value
+            finally:
+                await form.close()
+        else:
+            body = bytearray()
+            async for chunk in request.stream():
+                body.extend(chunk)
+                if len(body) > MAX_UPLOAD_BYTES:
+                    raise _upload_too_large()
+            if body:
+                images.append(bytes(body))
+
+    if not images or not all(images):
+        raise HTTPException(status_code=422, detail="image bytes are required")
+
+    return fields, images
+
+
+def _upload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Request body exceeds {MAX_UPLOAD_BYTES // (1024 * 1024)}MB"
+    )
+
+
+def _flag_field(fields: Dict[str, str], name: str) -> bool:
+    """불리언 필드 해석 (true/1/yes)"""
+    return fields.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _image_response(result_bytes: bytes, mime_type: str, metadata: Dict[str, Any]) -> Response:
+    """처리된 이미지 bytes 응답 (인코딩 메타데이터, API 대기 시간은 헤더로)"""
+    return Response(
+        content=result_bytes,
+        media_type=mime_type,
+        headers={
+            "Vary": "Accept",
+            "X-Encode-Time-Ms": str(metadata.get("encode_ms", 0.0)),
+            "X-Encode-Policy": metadata.get("policy", ""),
+            "X-Encode-Source": metadata.get("source", "encoded"),
+            "X-Queue-Wait-Ms": str(metadata.get("governor", {}).get("queue_ms", 0.0))
+        }
+    )
+
+
+def _matting_field(fields: Dict[str, str]) -> Optional[str]:
+    """배경 제거 품질 모드 필드 확인 (fast/balanced/full)"""
+    value = fields.get("mattingQuality")
+    if not value:
+        return None
+    if value.lower() not in MATTING_QUALITIES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"mattingQuality must be one of {', '.join(MATTING_QUALITIES)}"
         )
+    return value.lower()
+
+
+def _require_field(fields: Dict[str, str], name: str) -> str:
+    """필수 필드 확인"""
+    value = fields.get(name)
+    if not value:
+        raise HTTPException(status_code=422, detail=f"{name} is required")
+    return value
+
+
+@router.post("/process-image/binary")
+async def process_image_binary(request: Request):
+    """
+    단일 이미지 처리 (바이너리)
+    - multipart: prompt 필드 + image 파일
+    - octet-stream/image/*: body = 이미지, ?prompt= 쿼리
+    - bypassCache=true: 결과 캐시 미사용
+    - mattingQuality=fast|balanced|full: 배경 제거 품질 모드
+    - Accept: image/webp, image/png 등으로 출력 포맷 협상 (X-Encode-* 헤더에 인코딩 정보)
+    """
+    fields, images = await _read_binary_request(request)
+    prompt = _require_field(fields, "prompt")
+    matting_quality = _matting_field(fields)
+
+    try:
+        result_bytes, mime_type, metadata = await gemini_service.process_single_image_bytes(
+            prompt=prompt,
+            image_bytes=images[0],
+            use_cache=not _flag_field(fields, "bypassCache"),
+            matting_quality=matting_quality,
+            accept=request.headers.get("accept")
+        )
+        return _image_response(result_bytes, mime_type, metadata)
+
+    except ApiRateLimited as e:
+        raise _rate_limited(e)
+
+    except BackgroundRemovalQueueFull as e:
+        logger.warning(f"Background removal queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Image processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/process-multiple-images/binary")
+async def process_multiple_images_binary(request: Request):
+    """
+    다중 이미지 처리 (바이너리)
+    - multipart: prompt 필드 + images 파일 여러 개
+    - bypassCache=true: 결과 캐시 미사용
+    - mattingQuality=fast|balanced|full: 배경 제거 품질 모드
+    - Accept: image/webp, image/png 등으로 출력 포맷 협상 (X-Encode-* 헤더에 인코딩 정보)
+    """
+    fields, images = await _read_binary_request(request)
+    prompt = _require_field(fields, "prompt")
+    matting_quality = _matting_field(fields)
+
+    try:
+        result_bytes, mime_type, metadata = await gemini_service.process_multiple_images_bytes(
+            prompt=prompt,
+            images=images,
+            use_cache=not _flag_field(fields, "bypassCache"),
+            matting_quality=matting_quality,
+            accept=request.headers.get("accept")
+        )
+        return _image_response(result_bytes, mime_type, metadata)
+
+    except ApiRateLimited as e:
+        raise _rate_limited(e)
+
+    except BackgroundRemovalQueueFull as e:
+        logger.warning(f"Background removal queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Multiple images processing failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/remove-background/binary")
+async def remove_background_binary(request: Request):
+    """
+    이미지 배경 제거 및 여백 크롭 (바이너리, 기본 무손실 WebP / Accept로 PNG 등 선택)
+    - multipart: image 파일
+    - octet-stream/image/*: body = 이미지
+    - mattingQuality=fast|balanced|full: 배경 제거 품질 모드
+    - Accept: image/webp, image/png 등으로 출력 포맷 협상 (X-Encode-* 헤더에 인코딩 정보)
+    """
+    fields, images = await _read_binary_request(request)
+    matting_quality = _matting_field(fields)
+
+    try:
+        result_bytes, mime_type, metadata = await gemini_service.remove_background_bytes(
+            images[0],
+            matting_quality=matting_quality,
+            accept=request.headers.get("accept")
+        )
+        return _image_response(result_bytes, mime_type, metadata)
+
+    except BackgroundRemovalQueueFull as e:
+        logger.warning(f"Background removal queue full: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
 
     except Exception as e:
         logger.error(f"Background removal failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== Video Jobs ====================
+
+def _absolute_video_url(result: Optional[Dict], base_url) -> Optional[Dict]:
+    """
+    결과의 상대 video_url을 요청 호스트 기준 절대 URL로 변환
+    (프론트엔드와 API 서버의 origin이 다르므로)
+    """
+    if not result or not (result.get("video_url") or "").startswith("/"):
+        return result
+    scheme = {"ws": "http", "wss": "https"}.get(base_url.scheme, base_url.scheme)
+    return {**result, "video_url": f"{scheme}://{base_url.netloc}{result['video_url']}"}
+
+
+async def _stream_video_job(websocket: WebSocket, job_key: int) -> None:
+    """
+    비디오 작업 상태를 WebSocket으로 전달
+    progress → completed | error 순서로 전송하며 모든 메시지에 jobKey 포함
+    """
+    found = False
+    async for job in video_job_manager.watch(job_key):
+        found = True
+        if job["status"] == "completed":
+            await websocket.send_json({
+                "type": "completed",
+                "jobKey": job_key,
+                "result": _absolute_video_url(job["result"], websocket.base_url)
+            })
+        elif job["status"] == "failed":
+            await websocket.send_json({
+                "type": "error",
+                "jobKey": job_key,
+                "error": job["error"]
+            })
+        else:
+            await websocket.send_json({
+                "type": "progress",
+                "jobKey": job_key,
+                "percent": job["percent"],
+                "message": job["message"]
+            })
+
+    if not found:
+        await websocket.send_json({
+            "type": "error",
+            "jobKey": job_key,
+            "error": "Video job not found"
+        })
+
+
+@router.post("/video-jobs", status_code=202)
+async def submit_video_job(request: VideoGenerationRequest, http_request: Request):
+    """
+    비디오 생성 작업 제출 (HTTP)
+    즉시 jobKey를 반환하며 GET /video-jobs/{jobKey} 또는 WS /ws/video-jobs/{jobKey}로 추적
+    """
+    try:
+        job_key = await video_job_manager.submit(
+            prompt=request.prompt,
+            image=request.image,
+            last_frame=request.lastFrame
+        )
+        job = await video_job_manager.get_job(job_key)
+        job["result"] = _absolute_video_url(job["result"], http_request.base_url)
+        return job
+
+    except ApiRateLimited as e:
+        raise _rate_limited(e)
+
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    except Exception as e:
+        logger.error(f"Video job submission failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/video-jobs/{job_key}")
+async def get_video_job(job_key: int, request: Request):
+    """비디오 생성 작업 상태 조회 (HTTP 폴링)"""
+    job = await video_job_manager.get_job(job_key)
+    if not job:
+        raise HTTPException(status_code=404, detail="Video job not found")
+    job["result"] = _absolute_video_url(job["result"], request.base_url)
+    return job
+
+
+@router.websocket("/ws/video-jobs/{job_key}")
+async def video_job_ws(websocket: WebSocket, job_key: int):
+    """
+    기존 비디오 작업에 재연결
+    현재 상태를 즉시 전송한 뒤 완료/실패까지 진행률 전달
+    """
+    await websocket.accept()
+
+    try:
+        await _stream_video_job(websocket, job_key)
+
+    except WebSocketDisconnect:
+        logger.info(f"Video job {job_key} WebSocket disconnected")
+
+    except Exception as e:
+        logger.error(f"Video job {job_key} streaming failed: {str(e)}")
+        await websocket.send_json({
+            "type": "error",
+            "jobKey": job_key,
+            "error": str(e)
+        })
+
+    finally:
+        await websocket.close()
+
 # ==================== WebSocket Endpoint ====================
 
 @router.websocket("/ws/generate-video")
@@ -156,32 +591,20 @@ async def generate_video_ws(websocket: WebSocket):
 
         logger.info(f"Video generation started via WebSocket: {prompt[:50]}...")
 
-        # 진행률 콜백
-        async def progress_callback(percent: int, message: str):
-            await websocket.send_json({
-                "type": "progress",
-                "percent": percent,
-                "message": message
-            })
-
-        # 비디오 생성
-        result = await veo3_service.generate_video(
+        # 작업 제출 (연결이 끊겨도 작업은 계속 진행, jobKey로 재연결 가능)
+        job_key = await video_job_manager.submit(
             prompt=prompt,
             image=image,
-            last_frame=last_frame,
-            progress_callback=progress_callback
+            last_frame=last_frame
         )
 
-        # 완료 메시지
-        await websocket.send_json({
-            "type": "completed",
-            "result": result
-        })
+        # 진행률 → 완료/에러 메시지 전달
+        await _stream_video_job(websocket, job_key)
 
         logger.info("Video generation completed via WebSocket")
 
     except WebSocketDisconnect:
-        logger.info("WebSocket disconnected")
+        logger.info("WebSocket disconnected (video job continues in background)")
 
     except Exception as e:
         logger.error(f"Video generation failed: {str(e)}")
@@ -193,8 +616,105 @@ async def generate_video_ws(websocket: WebSocket):
     finally:
         await websocket.close()
 
+# ==================== Video Files ====================
+
+def _parse_range(range_header: str, file_size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더 파싱 (단일 구간만 지원)
+
+    Returns:
+        (start, end) - end 포함, 만족할 수 없는 구간이면 None
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    # 다중 구간 요청은 첫 구간만 응답
+    first = spec.split(",")[0].strip()
+    start_str, _, end_str = first.partition("-")
+    try:
+        if start_str:
+            start = int(start_str)
+            end = int(end_str) if end_str else file_size - 1
+        else:
+            # bytes=-N: 마지막 N바이트
+            suffix = int(end_str)
+            if suffix <= 0:
+                return None
+            start = max(0, file_size - suffix)
+            end = file_size - 1
+    except ValueError:
+        return None
+
+    end = min(end, file_size - 1)
+    if start > end or start >= file_size:
+        return None
+    return start, end
+
+
+@router.api_route("/videos/{video_name}", methods=["GET", "HEAD"])
+async def get_video(video_name: str, request: Request):
+    """
+    생성된 비디오 파일 제공 (HTTP Range 지원, 점진적 재생용)
+    """
+    if not video_store.is_valid_name(video_name):
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    file_size = video_store.size(video_name)
+    if file_size is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=86400"
+    }
+
+    range_header = request.headers.get("range")
+    if range_header:
+        byte_range = _parse_range(range_header, file_size)
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{file_size}"
+            return Response(status_code=416, headers=headers)
+        start, end = byte_range
+        status_code = 206
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+    else:
+        start, end = 0, file_size - 1
+        status_code = 200
+
+    headers["Content-Length"] = str(end - start + 1)
+    if request.method == "HEAD" or file_size == 0:
+        return Response(status_code=status_code, headers=headers, media_type="video/mp4")
+
+    return StreamingResponse(
+        video_store.iter_range(video_name, start, end),
+        status_code=status_code,
+        headers=headers,
+        media_type="video/mp4"
+    )
+
+
 # ==================== Health Check ====================
 
+@router.get("/metrics")
+async def get_metrics():
+    """서비스 메트릭 (배경 제거 대기열/워커 상태, 결과 캐시, 기본 프롬프트 캐시/카운터, 테스트 결과 큐, 프롬프트 비교, API 호출 제한, 동일 요청 병합, 트레이스 내보내기, 비디오 작업)"""
+    return {
+        "background_removal": background_removal_executor.get_metrics(),
+        "result_cache": result_cache.get_stats(),
+        "prompt_cache": default_prompt_cache.get_stats(),
+        "prompt_counters": prompt_counter_aggregator.get_stats(),
+        "test_result_queue": test_result_writer.get_stats(),
+        "prompt_compare": prompt_compare_service.get_stats(),
+        "api_governor": api_governor.get_stats(),
+        "single_flight": single_flight.get_stats(),
+        "tracing": span_exporter.get_stats(),
+        "video_jobs": {
+            "in_flight": video_job_manager.list_in_flight()
+        }
+    }
+
+
 @router.get("/health")
 async def health_check():
     """헬스 체크"""
@@ -203,9 +723,18 @@ async def health_check():
         "service": "bangkku",
         "endpoints": [
             "/process-image",
+            "/process-image/binary",
             "/process-multiple-images",
+            "/process-multiple-images/binary",
             "/remove-background",
-            "/ws/generate-video"
+            "/remove-background/binary",
+            "/compare-prompts",
+            "/metrics",
+            "/video-jobs",
+            "/video-jobs/{job_key}",
+            "/ws/video-jobs/{job_key}",
+            "/ws/generate-video",
+            "/videos/{video_name}"
         ]
     }
 
@@ -234,33 +763,16 @@ async def generate_showroom_video_ws(websocket: WebSocket):
             await websocket.close()
             return
 
-        logger.info("[Showroom] Video generation started (single image via generate_video)")
+        logger.info("[Showroom] Video generation started (single image video job)")
 
-        # 진행률 콜백 (progress 이벤트 전송)
-        async def progress_callback(percent: int, message: str):
-            await websocket.send_json({
-                "type": "progress",
-                "percent": percent,
-                "message": message
-            })
-
-        # ✅ 핵심 변경: generate_showroom_video → generate_video
-        result = await veo3_service.generate_video(
-            prompt=prompt,
-            image=image,
-            progress_callback=progress_callback
-        )
-
-        # 결과 전송
-        await websocket.send_json({
-            "type": "completed",
-            "result": result
-        })
+        # 작업 제출 후 진행률/결과 전달
+        job_key = await video_job_manager.submit(prompt=prompt, image=image)
+        await _stream_video_job(websocket, job_key)
 
         logger.info("[Showroom] Video generation completed successfully")
 
     except WebSocketDisconnect:
-        logger.info("Showroom WebSocket disconnected")
+        logger.info("Showroom WebSocket disconnected (video job continues in background)")
 
     except Exception as e:
         logger.error(f"[Showroom] Video generation failed: {str(e)}")
@@ -3,8 +3,9 @@ Prompt Management API Router
 프롬프트 CRUD 및 관리 API
 """
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Query, UploadFile, File, Form, Response
 from database.models import Prompt, PromptCreate, PromptUpdate, PromptRating, RatingCreate
+from repos.pagination import InvalidCursor
 from services.prompt_service import PromptService
 from services.rating_service import RatingService
 from utils.file_storage import save_multiple_prompt_images
@@ -126,36 +127,45 @@ async def get_prompt(prompt_key: int):
 
 @router.get("/", response_model=List[Prompt])
 async def list_prompts(
+    response: Response,
     prompt_kind: Optional[str] = Query(None, alias="promptKind", description="Filter by service/feature path"),
-    include_non_default: bool = Query(True, alias="includeNonDefault", description="Include non-default prompts")
+    include_non_default: bool = Query(True, alias="includeNonDefault", description="Include non-default prompts"),
+    limit: int = Query(50, ge=1, le=200, description="Page size"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    text_limit: Optional[int] = Query(None, alias="textLimit", ge=1, le=10000, description="Truncate promptText to this many characters")
 ):
     """
-    프롬프트 목록 조회
+    프롬프트 목록 조회 (최신순, 커서 페이지네이션)
 
     Query Parameters (자동 camelCase → snake_case 변환):
-    - promptKind: Service/feature path (e.g., "bangkku/furniture_removal")
+    - promptKind: Service/feature path (e.g., "bangkku/furniture_removal", 생략 시 전체)
     - includeNonDefault: Include non-default prompts (default: true)
+    - limit: Page size (1-200, default: 50)
+    - cursor: 이전 응답의 X-Next-Cursor 헤더 값 (첫 페이지는 생략)
+    - textLimit: 목록 미리보기용 promptText 최대 글자 수 (생략 시 전체)
 
     Examples:
     - GET /api/prompts?promptKind=bangkku/furniture_removal
     - GET /api/prompts?promptKind=bangkku/furniture_removal&includeNonDefault=false
+    - GET /api/prompts?limit=20&textLimit=200&cursor=eyJkIjoi...
 
     Response: Array of Prompt objects (camelCase)
+    다음 페이지가 있으면 X-Next-Cursor 헤더 포함
     """
     try:
-        if prompt_kind:
-            results = await prompt_service.get_prompts_by_kind(
-                prompt_kind=prompt_kind,
-                include_non_default=include_non_default
-            )
-        else:
-            # Get all prompts
-            results = await prompt_service.get_prompts_by_kind(
-                prompt_kind="",
-                include_non_default=include_non_default
-            )
+        results, next_cursor = await prompt_service.list_prompts(
+            prompt_kind=prompt_kind,
+            include_non_default=include_non_default,
+            limit=limit,
+            cursor=cursor,
+            text_limit=text_limit
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
 
         return results
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -304,22 +314,30 @@ async def create_rating(prompt_key: int, request: RatingCreate):
 @router.get("/{prompt_key}/ratings", response_model=List[PromptRating])
 async def get_ratings(
     prompt_key: int,
-    limit: int = Query(50, ge=1, le=100, description="Maximum number of ratings")
+    response: Response,
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of ratings"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ):
     """
-    특정 프롬프트의 평가 목록 조회
+    특정 프롬프트의 평가 목록 조회 (최신순, 커서 페이지네이션)
 
     Path Parameter:
     - prompt_key: Prompt primary key
 
     Query Parameter:
     - limit: 최대 조회 개수 (default: 50, max: 100)
+    - cursor: 이전 응답의 X-Next-Cursor 헤더 값
 
     Response: Array of PromptRating objects (camelCase)
+    다음 페이지가 있으면 X-Next-Cursor 헤더 포함
     """
     try:
-        results = await rating_service.get_ratings_by_prompt(prompt_key, limit)
+        results, next_cursor = await rating_service.get_ratings_by_prompt(prompt_key, limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return results
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2,9 +2,10 @@
 Test Result API Router
 테스트 결과 조회 및 분석 API
 """
-from typing import List
-from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response
 from database.models import PromptTestResult
+from repos.pagination import InvalidCursor
 from services.test_result_service import TestResultService
 
 router = APIRouter(prefix="/api/test-results", tags=["test-results"])
@@ -13,13 +14,16 @@ test_result_service = TestResultService()
 
 @router.get("/recent", response_model=List[PromptTestResult])
 async def get_recent_results(
-    limit: int = Query(20, ge=1, le=100, description="Maximum number of results")
+    response: Response,
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ):
     """
-    최근 테스트 결과 조회 (전체 프롬프트)
+    최근 테스트 결과 조회 (전체 프롬프트, 커서 페이지네이션)
 
     Query Parameters:
     - limit: Maximum number of results (1-100, default: 20)
+    - cursor: 이전 응답의 X-Next-Cursor 헤더 값 (다음 페이지가 있으면 응답에 포함)
 
     Response (camelCase):
     ```json
@@ -36,37 +40,45 @@ async def get_recent_results(
         "errorMsg": null,
         "creDate": "2025-01-28T10:30:00",
         "creUserKey": 1,
-        "deleteYn": 0,
-        "promptKind": "bangkku/furniture_removal",
-        "modelKind": "gemini",
-        "promptText": "Remove all furniture..."
+        "deleteYn": 0
       }
     ]
     ```
     """
     try:
-        results = await test_result_service.get_recent_results(limit)
+        results, next_cursor = await test_result_service.get_recent_results(limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return results
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/failures", response_model=List[PromptTestResult])
 async def get_failure_results(
-    limit: int = Query(20, ge=1, le=100, description="Maximum number of results")
+    response: Response,
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ):
     """
-    실패한 테스트 결과 조회 (디버깅용)
+    실패한 테스트 결과 조회 (디버깅용, 커서 페이지네이션)
 
     Query Parameters:
     - limit: Maximum number of results (1-100, default: 20)
+    - cursor: 이전 응답의 X-Next-Cursor 헤더 값
 
     Response: Array of failed test results (camelCase)
     Only returns results where successYn = 0 and errorMsg is not null
     """
     try:
-        results = await test_result_service.get_failure_results(limit)
+        results, next_cursor = await test_result_service.get_failure_results(limit, cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return results
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -74,8 +86,10 @@ async def get_failure_results(
 @router.get("/prompt/{prompt_key}", response_model=List[PromptTestResult])
 async def get_results_by_prompt(
     prompt_key: int,
+    response: Response,
     success_only: bool = Query(False, description="Only return successful results"),
-    limit: int = Query(50, ge=1, le=100, description="Maximum number of results")
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page")
 ):
     """
     특정 프롬프트의 테스트 결과 조회
@@ -86,16 +100,23 @@ async def get_results_by_prompt(
     Query Parameters (camelCase → snake_case 자동 변환):
     - successOnly: Only return successful results (default: false)
     - limit: Maximum number of results (1-100, default: 50)
+    - cursor: 이전 응답의 X-Next-Cursor 헤더 값
 
     Response: Array of test results (camelCase, ordered by creDate desc)
+    다음 페이지가 있으면 X-Next-Cursor 헤더 포함
     """
     try:
-        results = await test_result_service.get_results_by_prompt(
+        results, next_cursor = await test_result_service.get_results_by_prompt(
             prompt_key=prompt_key,
             success_only=success_only,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return results
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
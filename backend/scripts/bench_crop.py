@@ -0,0 +1,235 @@
+"""
+crop_to_object 마이크로 벤치마크
+기존 구현(PIL 변환 + int16 전체 배열)과 현재 구현(uint8 뷰 + LUT 단일 패스)의
+소요 시간과 peak 메모리를 1-24MP 합성 이미지로 비교
+
+각 케이스는 별도 프로세스에서 실행하여 peak RSS(ru_maxrss) 증가분을 측정합니다.
+(resource 모듈이 없는 Windows에서는 tracemalloc peak로 대체 - PIL 내부 할당은 집계되지 않음)
+
+사용법:
+    python scripts/bench_crop.py --sizes 1 4 12 24 --repeat 3
+"""
+
+import sys
+import io
+import time
+import argparse
+import tracemalloc
+import multiprocessing
+from pathlib import Path
+from typing import List, Tuple
+
+# Windows 인코딩 문제 해결: UTF-8 강제
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image, ImageStat
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# ==================== Legacy Implementation ====================
+
+def legacy_estimate_background_color(image: Image.Image) -> Tuple[int, int, int]:
+    """기존 _estimate_background_color (getpixel 샘플링)"""
+    rgb_image = image.convert("RGB")
+    width, height = rgb_image.size
+
+    if width == 0 or height == 0:
+        return (255, 255, 255)
+
+    step_x = max(1, width // 50)
+    step_y = max(1, height // 50)
+    samples: List[Tuple[int, int, int]] = []
+
+    for x in range(0, width, step_x):
+        samples.append(rgb_image.getpixel((x, 0)))
+        samples.append(rgb_image.getpixel((x, height - 1)))
+
+    for y in range(0, height, step_y):
+        samples.append(rgb_image.getpixel((0, y)))
+        samples.append(rgb_image.getpixel((width - 1, y)))
+
+    if not samples:
+        stats = ImageStat.Stat(rgb_image)
+        return tuple(int(channel) for channel in stats.mean[:3])
+
+    sample_count = len(samples)
+    avg = [sum(channel[i] for channel in samples) / sample_count for i in range(3)]
+    return tuple(int(round(value)) for value in avg)
+
+
+def legacy_crop_to_object(
+    image: Image.Image,
+    difference_threshold: int = 8,
+    padding_ratio: float = 0.01
+) -> Image.Image:
+    """기존 crop_to_object (RGBA 복사 → RGB 변환 → int16 차이 배열)"""
+    original_mode = image.mode
+    working_image = image.copy()
+
+    if working_image.mode not in ("RGBA", "LA"):
+        working_image = working_image.convert("RGBA")
+
+    alpha_channel = working_image.getchannel("A")
+    bbox = alpha_channel.getbbox()
+
+    if not (bbox and bbox != (0, 0, working_image.width, working_image.height)):
+        rgb_image = working_image.convert("RGB")
+        background_color = legacy_estimate_background_color(rgb_image)
+        rgb_array = np.asarray(rgb_image, dtype=np.int16)
+
+        background_vector = np.array(background_color, dtype=np.int16)
+        channel_diff = np.abs(rgb_array - background_vector)
+        max_diff = channel_diff.max(axis=2)
+
+        border = max(1, min(working_image.width, working_image.height) // 20)
+        border_mask = np.concatenate(
+            [
+                max_diff[:border, :].ravel(),
+                max_diff[-border:, :].ravel(),
+                max_diff[:, :border].ravel(),
+                max_diff[:, -border:].ravel(),
+            ]
+        )
+        noise_floor = float(np.percentile(border_mask, 95)) if border_mask.size else 0.0
+
+        adaptive_threshold = max(difference_threshold, noise_floor + 3.0)
+        mask = max_diff > adaptive_threshold
+
+        if not np.any(mask):
+            bbox = None
+        else:
+            ys = np.where(mask.any(axis=1))[0]
+            xs = np.where(mask.any(axis=0))[0]
+            bbox = (int(xs[0]), int(ys[0]), int(xs[-1]) + 1, int(ys[-1]) + 1)
+
+    if not bbox:
+        return image
+
+    left, upper, right, lower = bbox
+    if padding_ratio > 0:
+        width, height = working_image.size
+        pad_w = int((right - left) * padding_ratio)
+        pad_h = int((lower - upper) * padding_ratio)
+        left = max(0, left - pad_w)
+        upper = max(0, upper - pad_h)
+        right = min(width, right + pad_w)
+        lower = min(height, lower + pad_h)
+
+    cropped = working_image.crop((left, upper, right, lower))
+    try:
+        return cropped.convert(original_mode)
+    except ValueError:
+        return cropped.convert("RGB")
+
+
+# ==================== Fixtures ====================
+
+def make_image(megapixels: float, mode: str, seed: int = 0) -> Image.Image:
+    """노이즈가 있는 밝은 배경 위에 가구 형태의 사각형을 그린 합성 이미지"""
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(megapixels * 1_000_000 / width)
+
+    rng = np.random.default_rng(seed)
+    pixels = np.full((height, width, 3), 242, dtype=np.uint8)
+    pixels += rng.integers(0, 4, size=(height, width, 1), dtype=np.uint8)
+
+    top, bottom = int(height * 0.2), int(height * 0.85)
+    left, right = int(width * 0.15), int(width * 0.7)
+    pixels[top:bottom, left:right] = (120, 84, 60)
+
+    image = Image.fromarray(pixels, "RGB")
+    return image.convert(mode) if mode != "RGB" else image
+
+
+def _crop_fn(impl: str):
+    if impl == "legacy":
+        return lambda image: legacy_crop_to_object(image, difference_threshold=5, padding_ratio=0)
+
+    from services.bangkku.gemini_service import GeminiService
+
+    # API 클라이언트 초기화 없이 크롭 메서드만 사용
+    service = GeminiService.__new__(GeminiService)
+    return lambda image: service.crop_to_object(image, difference_threshold=5, padding_ratio=0)
+
+
+def _peak_rss_mb() -> float:
+    # Linux: KB, macOS: bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_case(impl: str, megapixels: float, mode: str, repeat: int) -> dict:
+    """별도 프로세스에서 실행: 시간 + peak 메모리 증가분"""
+    crop = _crop_fn(impl)
+    image = make_image(megapixels, mode)
+    image.load()
+
+    if resource is not None:
+        baseline = _peak_rss_mb()
+        result = crop(image)
+        peak_mb = _peak_rss_mb() - baseline
+    else:
+        tracemalloc.start()
+        result = crop(image)
+        peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        crop(image)
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "size": image.size,
+        "crop_box": result.size,
+        "best_ms": min(timings) * 1000,
+        "peak_mb": peak_mb
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="crop_to_object benchmark")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 4, 12, 24], help="Megapixels")
+    parser.add_argument("--modes", nargs="+", default=["RGB", "RGBA"], help="Input image modes")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    memory_label = "peak RSS +MB" if resource is not None else "tracemalloc MB"
+
+    print(f"{'MP':>4} {'mode':>5} {'impl':>8} {'size':>12} {'best ms':>10} {memory_label:>14} {'crop':>12}")
+    for megapixels in args.sizes:
+        for mode in args.modes:
+            results = {}
+            for impl in ("legacy", "current"):
+                with context.Pool(1) as worker:
+                    results[impl] = worker.apply(_run_case, (impl, megapixels, mode, args.repeat))
+
+            for impl, result in results.items():
+                print(
+                    f"{megapixels:>4g} {mode:>5} {impl:>8} "
+                    f"{'x'.join(map(str, result['size'])):>12} "
+                    f"{result['best_ms']:>10.1f} {result['peak_mb']:>14.1f} "
+                    f"{'x'.join(map(str, result['crop_box'])):>12}"
+                )
+
+            if results["legacy"]["crop_box"] != results["current"]["crop_box"]:
+                print(f"  ⚠️ crop mismatch at {megapixels}MP {mode}")
+            speedup = results["legacy"]["best_ms"] / max(results["current"]["best_ms"], 1e-9)
+            print(f"  → {speedup:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+DB 접근 동시성 벤치마크
+동기 psycopg2 Repository(기존)와 async psycopg3 Repository(신규)를 async 핸들러에서 호출할 때
+요청 처리량과 이벤트 루프 지연을 비교
+
+사용법:
+    python scripts/bench_db_concurrency.py --requests 200 --concurrency 20 --query-delay 0.05
+"""
+
+import sys
+import io
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+
+# Windows 인코딩 문제 해결: UTF-8 강제
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from database.connection import DatabaseConnection
+from database.async_connection import AsyncDatabaseConnection
+from repos.base import BaseRepository
+from repos.async_base import AsyncBaseRepository
+
+
+QUERY = "SELECT pg_sleep(%s) AS slept"
+
+
+async def _loop_lag_monitor(stop: asyncio.Event, samples: list, interval: float = 0.01):
+    """이벤트 루프 지연 측정 (예정 시각 대비 실제 깨어난 시각)"""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - expected))
+
+
+async def _run(label: str, handler, total: int, concurrency: int, query_delay: float) -> dict:
+    """handler를 동시 요청 concurrency개로 total번 실행"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    lag_samples = []
+
+    async def request():
+        async with semaphore:
+            started = time.perf_counter()
+            await handler(query_delay)
+            latencies.append(time.perf_counter() - started)
+
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(_loop_lag_monitor(stop, lag_samples))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await monitor
+
+    latencies.sort()
+    return {
+        "label": label,
+        "elapsed_s": elapsed,
+        "throughput_rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_loop_lag_ms": max(lag_samples, default=0.0) * 1000
+    }
+
+
+async def main(args):
+    sync_repo = BaseRepository(table_name='prompts', pk_column='prompt_key')
+    async_repo = AsyncBaseRepository(table_name='prompts', pk_column='prompt_key')
+
+    async def sync_handler(delay: float):
+        # 기존 방식: async 서비스 안에서 동기 psycopg2 호출 (이벤트 루프 블로킹)
+        sync_repo.execute(QUERY, (delay,))
+
+    async def async_handler(delay: float):
+        await async_repo.execute(QUERY, (delay,))
+
+    DatabaseConnection.initialize_pool()
+    await AsyncDatabaseConnection.initialize_pool()
+
+    # 연결 워밍업
+    sync_repo.execute(QUERY, (0,))
+    await asyncio.gather(*(async_repo.execute(QUERY, (0,)) for _ in range(args.concurrency)))
+
+    results = [
+        await _run("sync psycopg2 (before)", sync_handler, args.requests, args.concurrency, args.query_delay),
+        await _run("async psycopg3 (after)", async_handler, args.requests, args.concurrency, args.query_delay)
+    ]
+
+    await AsyncDatabaseConnection.close_pool()
+    DatabaseConnection.close_all_connections()
+
+    print(f"\n📊 requests={args.requests}, concurrency={args.concurrency}, query_delay={args.query_delay}s\n")
+    print(f"{'mode':<26}{'elapsed(s)':>12}{'req/s':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'loop lag(ms)':>14}")
+    for r in results:
+        print(
+            f"{r['label']:<26}{r['elapsed_s']:>12.2f}{r['throughput_rps']:>10.1f}"
+            f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['max_loop_lag_ms']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DB 접근 동시성 벤치마크 (sync vs async)")
+    parser.add_argument("--requests", type=int, default=200, help="총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20, help="동시 요청 수 (async 풀 크기 이하 권장)")
+    parser.add_argument("--query-delay", type=float, default=0.05, help="쿼리당 DB 지연 (pg_sleep 초)")
+    asyncio.run(main(parser.parse_args()))
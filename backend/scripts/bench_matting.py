@@ -0,0 +1,166 @@
+"""
+배경 제거 품질 모드 벤치마크 (fast / balanced / full)
+static/prompts/images 픽스처로 remove_background_and_crop 지연 시간과
+full 대비 알파 품질(MAE, IoU, bbox 오차)을 비교
+
+Gemini 출력 해상도를 흉내 내기 위해 --upscale 배율로 픽스처를 확대할 수 있습니다.
+rembg가 설치되어 있어야 하며, 실제 서비스와 같은 프로세스 풀(REMBG_WORKERS)을 사용합니다.
+
+사용법:
+    python scripts/bench_matting.py --upscale 1 2 4 --repeat 3
+"""
+
+import sys
+import io
+import time
+import asyncio
+import hashlib
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Windows 인코딩 문제 해결: UTF-8 강제
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import numpy as np
+from PIL import Image
+
+from services.bangkku.background_removal import background_removal_executor
+from services.bangkku.matting import MATTING_QUALITIES, matting_settings, refine_alpha
+
+FIXTURE_DIR = project_root / "static" / "prompts" / "images"
+
+
+def load_fixtures() -> List[Tuple[str, Image.Image]]:
+    """픽스처 이미지 로드 (내용이 같은 파일은 한 번만)"""
+    fixtures = []
+    seen = set()
+    for path in sorted(FIXTURE_DIR.iterdir()):
+        if path.suffix.lower() not in (".png", ".jpg", ".jpeg", ".webp"):
+            continue
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        image = Image.open(path)
+        image.load()
+        fixtures.append((path.name, image.convert("RGB")))
+    return fixtures
+
+
+async def full_frame_alpha(image: Image.Image, quality: str) -> np.ndarray:
+    """품질 모드별 전체 프레임 알파 (크롭 전, 품질 비교용)"""
+    working_size = matting_settings.working_size(image.size, quality)
+    if working_size is None:
+        output = await background_removal_executor.remove(image)
+        return np.asarray(output.getchannel("A"))
+
+    low_image = image.resize(working_size, Image.BILINEAR, reducing_gap=2.0)
+    low_mask = await background_removal_executor.remove(low_image, only_mask=True)
+    alpha = refine_alpha(
+        image,
+        low_image,
+        low_mask,
+        (0, 0, image.width, image.height),
+        radius=matting_settings.radius[quality],
+        eps=matting_settings.eps
+    )
+    return np.asarray(alpha)
+
+
+def _bbox(alpha: np.ndarray) -> Tuple[int, int, int, int]:
+    rows = np.flatnonzero(alpha.any(axis=1))
+    cols = np.flatnonzero(alpha.any(axis=0))
+    if rows.size == 0:
+        return 0, 0, 0, 0
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
+def compare_alpha(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """full 알파 대비 품질 지표"""
+    reference_mask = reference > 127
+    candidate_mask = candidate > 127
+    union = np.logical_or(reference_mask, candidate_mask).sum()
+    intersection = np.logical_and(reference_mask, candidate_mask).sum()
+
+    # 경계(반투명 또는 전경/배경 전이) 영역 오차
+    edge = (reference > 0) & (reference < 255)
+    diff = np.abs(reference.astype(np.int16) - candidate.astype(np.int16))
+
+    bbox_error = max(abs(a - b) for a, b in zip(_bbox(reference), _bbox(candidate)))
+    return {
+        "mae": float(diff.mean()),
+        "edge_mae": float(diff[edge].mean()) if edge.any() else 0.0,
+        "iou": float(intersection / union) if union else 1.0,
+        "bbox_px": bbox_error
+    }
+
+
+async def run(upscales: List[float], repeat: int) -> None:
+    from services.bangkku.gemini_service import GeminiService
+
+    # API 클라이언트 초기화 없이 후처리 메서드만 사용
+    service = GeminiService.__new__(GeminiService)
+    fixtures = load_fixtures()
+    print(f"Fixtures: {len(fixtures)} unique images from {FIXTURE_DIR}")
+
+    # 워커 프로세스 / rembg 세션 워밍업
+    await background_removal_executor.remove(fixtures[0][1].resize((64, 64)))
+
+    print(f"{'x':>4} {'image':>14} {'size':>11} {'quality':>9} {'p50 ms':>9} {'mae':>6} {'edge':>6} {'iou':>7} {'bbox':>5}")
+    summary: Dict[Tuple[float, str], List[float]] = {}
+
+    for upscale in upscales:
+        for name, fixture in fixtures:
+            image = fixture if upscale == 1 else fixture.resize(
+                (round(fixture.width * upscale), round(fixture.height * upscale)),
+                Image.LANCZOS
+            )
+            reference = await full_frame_alpha(image, "full")
+
+            for quality in MATTING_QUALITIES:
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    await service.remove_background_and_crop(image, quality)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                p50 = statistics.median(timings)
+                summary.setdefault((upscale, quality), []).append(p50)
+                metrics = compare_alpha(reference, await full_frame_alpha(image, quality))
+                print(
+                    f"{upscale:>4g} {name[:14]:>14} {image.width:>5}x{image.height:<5} {quality:>9} "
+                    f"{p50:>9.1f} {metrics['mae']:>6.2f} {metrics['edge_mae']:>6.1f} "
+                    f"{metrics['iou']:>7.4f} {metrics['bbox_px']:>5}"
+                )
+
+    print("\nMean p50 latency (ms)")
+    for upscale in upscales:
+        row = "  ".join(
+            f"{quality}={statistics.mean(summary[(upscale, quality)]):.1f}"
+            for quality in MATTING_QUALITIES
+        )
+        print(f"  x{upscale:g}: {row}")
+
+    background_removal_executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Matting quality benchmark")
+    parser.add_argument("--upscale", type=float, nargs="+", default=[1, 2, 4], help="Fixture upscale factors")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.upscale, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
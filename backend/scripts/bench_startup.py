@@ -0,0 +1,116 @@
+"""
+앱 시작 시간 벤치마크 (python -X importtime)
+`import main` 을 깨끗한 하위 프로세스에서 반복 실행하여 import 시간과 무거운 모듈을 집계하고,
+예산 초과 또는 지연 로드 대상 모듈(google.genai, rembg, onnxruntime)이 import 시점에 로드되면 실패 코드로 종료
+
+자격 증명 / DB 없이도 import 되어야 하므로 GOOGLE_API_KEY, PG_* 환경변수를 지우고 실행합니다.
+
+사용법:
+    python scripts/bench_startup.py --repeat 5 --budget-ms 900 --top 15
+"""
+
+import os
+import re
+import sys
+import io
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Windows 인코딩 문제 해결: UTF-8 강제
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+
+project_root = Path(__file__).parent.parent
+
+# 요청 처리 경로에서 처음 필요할 때 로드해야 하는 모듈
+LAZY_MODULES = ("google.genai", "rembg", "onnxruntime")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_import(module: str) -> List[Tuple[str, int, int, int]]:
+    """
+    하위 프로세스에서 -X importtime 으로 모듈 import
+
+    Returns:
+        [(모듈, self us, cumulative us, 깊이)]
+    """
+    env = {
+        key: value for key, value in os.environ.items()
+        if key != "GOOGLE_API_KEY" and not key.startswith("PG_")
+    }
+    # .env가 있어도 DB에 접속할 수 없는 주소로 고정
+    env["PG_DB_HOST"] = "127.0.0.1"
+    env["PG_DB_PORT"] = "1"
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_root,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Application import-time benchmark")
+    parser.add_argument("--module", default="main", help="Module to import")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=900.0, help="Fail if median import time exceeds this")
+    parser.add_argument("--top", type=int, default=15, help="Show the N slowest first-party/top-level imports")
+    args = parser.parse_args()
+
+    totals: List[float] = []
+    cumulative: Dict[str, List[int]] = {}
+    loaded_lazy = set()
+
+    for _ in range(args.repeat):
+        rows = run_import(args.module)
+        for name, _, cumulative_us, depth in rows:
+            if depth <= 2:
+                cumulative.setdefault(name, []).append(cumulative_us)
+            if name == args.module:
+                totals.append(cumulative_us / 1000)
+            for lazy in LAZY_MODULES:
+                if name == lazy or name.startswith(lazy + "."):
+                    loaded_lazy.add(lazy)
+
+    median_ms = statistics.median(totals)
+    print(f"import {args.module}: median {median_ms:.1f} ms, min {min(totals):.1f} ms, max {max(totals):.1f} ms ({args.repeat} runs)")
+
+    print("\nSlowest imports (median cumulative, depth <= 2)")
+    slowest = sorted(
+        ((statistics.median(values), name) for name, values in cumulative.items() if name != args.module),
+        reverse=True
+    )[:args.top]
+    for value, name in slowest:
+        print(f"  {value / 1000:>8.1f} ms  {name}")
+
+    failed = False
+    if loaded_lazy:
+        print(f"\nFAIL: lazily loaded modules imported at startup: {', '.join(sorted(loaded_lazy))}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"\nFAIL: median import time {median_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print(f"\nOK: within {args.budget_ms:.0f} ms budget, no lazy modules imported")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
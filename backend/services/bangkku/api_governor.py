@@ -0,0 +1,429 @@
+"""
+API Governor
+Gemini / Veo API 호출 속도 및 동시 실행 제한 (프로세스 전역)
+
+- 모델별 / API 키별 토큰 버킷 (분당 요청 수 + 버스트)
+- 모델별 / API 키별 최대 동시 호출 수
+- 429 / 일시적 5xx 재시도: 지터를 넣은 지수 백오프, 서버 재시도 힌트(RetryInfo, Retry-After) 우선
+- 429를 받으면 해당 모델 버킷 속도를 낮추고(적응형), 성공할 때마다 설정 속도로 서서히 복구
+- 예상 대기 시간이 너무 길거나 재시도가 소진되면 ApiRateLimited (라우터에서 429로 변환)
+"""
+import os
+import re
+import time
+import random
+import asyncio
+import hashlib
+import logging
+import contextvars
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Callable, Awaitable, TypeVar, Iterator
+
+from utils.metrics import observe_external_call
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 재시도 가능한 일시적 서버 오류 (멱등 호출만 재시도)
+TRANSIENT_STATUS_CODES = (500, 502, 503, 504)
+
+# 현재 요청(태스크)에서 발생한 API 호출 기록 (응답 메타데이터용)
+_call_records: contextvars.ContextVar[Optional[List[Dict[str, Any]]]] = contextvars.ContextVar(
+    "api_governor_call_records", default=None
+)
+
+
+class ApiRateLimited(Exception):
+    """API 호출 한도 초과 (라우터에서 429 + Retry-After로 변환)"""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+# ==================== Token Bucket ====================
+
+class TokenBucket:
+    """
+    예약 방식 토큰 버킷
+
+    토큰이 모자라면 잔량을 음수로 예약하고 채워질 때까지의 대기 시간을 반환하므로,
+    호출자는 도착 순서대로 대기합니다 (잠금 / 재시도 루프 없음).
+    """
+
+    def __init__(self, rate_per_minute: float, burst: int, min_rate_ratio: float):
+        self.base_rate = rate_per_minute / 60.0
+        self.rate = self.base_rate
+        self.min_rate = self.base_rate * min_rate_ratio
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.throttled_at = float("-inf")
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """지금 토큰 하나를 예약하면 기다려야 하는 시간 (예약하지 않음)"""
+        self._refill(now)
+        deficit = max(0.0, 1.0 - self.tokens)
+        return max(self.paused_until - now, deficit / self.rate)
+
+    def reserve(self, now: float) -> float:
+        """토큰 하나 예약 → 대기 시간(초)"""
+        wait = self.delay(now)
+        self.tokens -= 1.0
+        return wait
+
+    def throttle(self, now: float, pause: float) -> None:
+        """
+        429 수신: 속도 절반으로 낮추고 pause초 동안 새 예약 중지
+
+        동시에 나간 요청들이 한꺼번에 429를 받아도 한 번만 줄이도록 1초(또는 pause) 안의 429는 합칩니다.
+        """
+        if now - self.throttled_at >= max(1.0, pause):
+            self.rate = max(self.min_rate, self.rate / 2.0)
+            self.throttled_at = now
+        self.paused_until = max(self.paused_until, now + pause)
+
+    def recover(self) -> None:
+        """성공: 설정 속도의 10%씩 복구"""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.1)
+
+
+class _Limit:
+    """버킷 하나 + 동시 호출 제한 + 메트릭 (모델 또는 API 키 단위)"""
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_in_flight: int, min_rate_ratio: float):
+        self.name = name
+        self.bucket = TokenBucket(rate_per_minute, burst, min_rate_ratio)
+        self.max_in_flight = max_in_flight
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {
+            "calls": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "rejected": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0
+        }
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def record_wait(self, wait_ms: float) -> None:
+        self.stats["queue_wait_ms_total"] += wait_ms
+        self.stats["queue_wait_ms_max"] = max(self.stats["queue_wait_ms_max"], wait_ms)
+
+    def get_stats(self) -> Dict[str, Any]:
+        attempts = self.stats["calls"] + self.stats["retries"] or 1
+        return {
+            "rate_per_minute": round(self.bucket.rate * 60, 2),
+            "configured_rate_per_minute": round(self.bucket.base_rate * 60, 2),
+            "burst": int(self.bucket.capacity),
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "paused_for_s": round(max(0.0, self.bucket.paused_until - time.monotonic()), 2),
+            **{key: value for key, value in self.stats.items() if key != "queue_wait_ms_total"},
+            "queue_wait_ms_max": round(self.stats["queue_wait_ms_max"], 2),
+            "avg_queue_wait_ms": round(self.stats["queue_wait_ms_total"] / attempts, 2)
+        }
+
+
+# ==================== Governor ====================
+
+class ApiGovernor:
+    """Gemini / Veo 공용 호출 제한기"""
+
+    def __init__(self):
+        """환경변수에서 공통 설정 로드 (모델별 한도는 configure_model에서)"""
+        self.key_rate_per_minute = max(1.0, float(os.getenv("GENAI_KEY_RPM", 120)))
+        self.key_burst = max(1, int(os.getenv("GENAI_KEY_BURST", 10)))
+        self.key_max_in_flight = max(1, int(os.getenv("GENAI_KEY_MAX_IN_FLIGHT", 16)))
+
+        self.max_retries = max(0, int(os.getenv("GENAI_MAX_RETRIES", 3)))
+        self.backoff_base = max(0.0, float(os.getenv("GENAI_BACKOFF_BASE", 1.0)))
+        self.backoff_max = max(self.backoff_base, float(os.getenv("GENAI_BACKOFF_MAX", 30.0)))
+        # 이보다 오래 기다려야 하면 대기하지 않고 바로 ApiRateLimited
+        self.max_queue_wait = max(0.0, float(os.getenv("GENAI_MAX_QUEUE_WAIT", 30.0)))
+        # 429 연속 수신 시 속도 하한 (설정 속도 대비)
+        self.min_rate_ratio = min(1.0, max(0.01, float(os.getenv("GENAI_MIN_RATE_RATIO", 0.1))))
+
+        self._models: Dict[str, _Limit] = {}
+        self._keys: Dict[str, _Limit] = {}
+        self._apis: Dict[str, str] = {}  # 모델 → API 이름 (메트릭 라벨, env_prefix 소문자)
+
+    def configure_model(
+        self,
+        model: str,
+        env_prefix: str,
+        rate_per_minute: float,
+        burst: int,
+        max_in_flight: int
+    ) -> None:
+        """
+        모델 한도 등록 (<env_prefix>_RPM / _BURST / _MAX_IN_FLIGHT 환경변수로 재정의)
+
+        Args:
+            model: 모델 이름 (call()의 model과 동일)
+            env_prefix: 환경변수 접두어 (예: GEMINI, VEO, 소문자로 바꿔 메트릭 api 라벨로도 사용)
+            rate_per_minute: 기본 분당 요청 수
+            burst: 기본 버스트 크기
+            max_in_flight: 기본 최대 동시 호출 수
+        """
+        self._apis[model] = env_prefix.lower()
+        self._models[model] = _Limit(
+            model,
+            max(0.1, float(os.getenv(f"{env_prefix}_RPM", rate_per_minute))),
+            max(1, int(os.getenv(f"{env_prefix}_BURST", burst))),
+            max(1, int(os.getenv(f"{env_prefix}_MAX_IN_FLIGHT", max_in_flight))),
+            self.min_rate_ratio
+        )
+
+    def _model_limit(self, model: str) -> _Limit:
+        if model not in self._models:
+            self.configure_model(model, "GENAI_DEFAULT", 60, 5, 8)
+        return self._models[model]
+
+    def _key_limit(self, api_key: str) -> _Limit:
+        # 메트릭에 키 원문이 노출되지 않도록 해시 앞자리로 구분
+        label = "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:8]
+        if label not in self._keys:
+            self._keys[label] = _Limit(
+                label, self.key_rate_per_minute, self.key_burst, self.key_max_in_flight, self.min_rate_ratio
+            )
+        return self._keys[label]
+
+    # ==================== Call ====================
+
+    async def call(
+        self,
+        model: str,
+        api_key: str,
+        request: Callable[[], Awaitable[T]],
+        idempotent: bool = True
+    ) -> T:
+        """
+        한도 안에서 API 호출 (429 / 일시적 오류 재시도 포함)
+
+        Args:
+            model: 모델 이름 (모델별 버킷 / 동시 호출 제한)
+            api_key: 호출에 사용하는 API 키 (키별 버킷 / 동시 호출 제한)
+            request: 호출할 때마다 새 coroutine을 만드는 함수
+            idempotent: False면 5xx / 타임아웃은 재시도하지 않음 (429만 재시도)
+
+        Returns:
+            request() 결과
+
+        Raises:
+            ApiRateLimited: 예상 대기 시간 초과 또는 429 재시도 소진
+        """
+        limits = [self._model_limit(model), self._key_limit(api_key)]
+        for limit in limits:
+            limit.stats["calls"] += 1
+
+        record = {"model": model, "attempts": 0, "queue_ms": 0.0, "backoff_ms": 0.0}
+        records = _call_records.get()
+        if records is not None:
+            records.append(record)
+
+        attempt = 0
+        while True:
+            record["queue_ms"] += await self._acquire(limits, model)
+            attempt += 1
+            record["attempts"] = attempt
+
+            started = time.perf_counter()
+            retry_delay = None
+            try:
+                result = await request()
+            except Exception as e:
+                observe_external_call(
+                    self._apis[model], model, time.perf_counter() - started, e, self._status_code(e)
+                )
+                rate_limited = self._status_code(e) == 429
+                retryable = rate_limited or (idempotent and self._is_transient(e))
+                hint = self._retry_hint(e) if retryable else None
+
+                if rate_limited:
+                    # 할당량은 모델 단위로 적용되므로 모델 버킷만 속도를 낮춤 (키 버킷은 고정 상한)
+                    for limit in limits:
+                        limit.stats["rate_limited"] += 1
+                    limits[0].bucket.throttle(time.monotonic(), hint or 0.0)
+
+                if not retryable or attempt > self.max_retries or (hint or 0.0) > self.backoff_max:
+                    for limit in limits:
+                        limit.stats["failed"] += 1
+                    if rate_limited:
+                        for limit in limits:
+                            limit.stats["rejected"] += 1
+                        raise ApiRateLimited(
+                            f"{model} rate limit exceeded after {attempt} attempt(s)",
+                            retry_after=hint or self._backoff(attempt)
+                        ) from e
+                    raise
+
+                retry_delay = hint if hint is not None else self._backoff(attempt)
+                for limit in limits:
+                    limit.stats["retries"] += 1
+                logger.warning(
+                    f"{model} call failed ({self._status_code(e) or type(e).__name__}), "
+                    f"retry {attempt}/{self.max_retries} in {retry_delay:.2f}s"
+                )
+            finally:
+                for limit in reversed(limits):
+                    limit.in_flight -= 1
+                    limit.semaphore.release()
+
+            if retry_delay is not None:
+                # 백오프 동안에는 슬롯을 반납하고 대기 (다른 호출이 사용), 재시도 시 다시 획득
+                record["backoff_ms"] += retry_delay * 1000
+                await asyncio.sleep(retry_delay)
+                continue
+
+            observe_external_call(self._apis[model], model, time.perf_counter() - started)
+            for limit in limits:
+                limit.stats["succeeded"] += 1
+            limits[0].bucket.recover()
+            return result
+
+    async def _acquire(self, limits: List[_Limit], model: str) -> float:
+        """
+        토큰 예약 후 동시 호출 슬롯 획득 (모델 → 키 순서)
+
+        Returns:
+            대기 시간 (ms)
+        """
+        started = time.monotonic()
+        wait = max(limit.bucket.delay(started) for limit in limits)
+        if wait > self.max_queue_wait:
+            for limit in limits:
+                limit.stats["rejected"] += 1
+            raise ApiRateLimited(
+                f"{model} is rate limited, estimated wait {wait:.1f}s exceeds {self.max_queue_wait:.0f}s",
+                retry_after=wait
+            )
+
+        for limit in limits:
+            limit.bucket.reserve(started)
+            limit.waiting += 1
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+            acquired = []
+            try:
+                for limit in limits:
+                    await limit.semaphore.acquire()
+                    acquired.append(limit)
+            except BaseException:
+                for limit in acquired:
+                    limit.semaphore.release()
+                raise
+        finally:
+            for limit in limits:
+                limit.waiting -= 1
+
+        for limit in limits:
+            limit.in_flight += 1
+        wait_ms = (time.monotonic() - started) * 1000
+        for limit in limits:
+            limit.record_wait(wait_ms)
+        return wait_ms
+
+    # ==================== Errors ====================
+
+    @staticmethod
+    def _status_code(error: Exception) -> Optional[int]:
+        # 오류가 났을 때만 필요하고, 호출 시점에는 SDK가 이미 로드되어 있음
+        from google.genai import errors as genai_errors
+
+        if isinstance(error, genai_errors.APIError):
+            return error.code
+        return None
+
+    def _is_transient(self, error: Exception) -> bool:
+        if self._status_code(error) in TRANSIENT_STATUS_CODES:
+            return True
+        return isinstance(error, (asyncio.TimeoutError, ConnectionError))
+
+    @staticmethod
+    def _retry_hint(error: Exception) -> Optional[float]:
+        """
+        서버 재시도 힌트 (초)
+
+        - google.rpc.RetryInfo의 retryDelay (예: "32s", "1.5s")
+        - Retry-After 헤더 (초)
+        """
+        details = getattr(error, "details", None)
+        if isinstance(details, dict):
+            for detail in (details.get("error") or {}).get("details") or []:
+                if isinstance(detail, dict) and detail.get("retryDelay"):
+                    match = re.fullmatch(r"([\d.]+)s", str(detail["retryDelay"]).strip())
+                    if match:
+                        return float(match.group(1))
+
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers:
+            try:
+                return max(0.0, float(headers.get("Retry-After")))
+            except (TypeError, ValueError):
+                pass
+        return None
+
+    def _backoff(self, attempt: int) -> float:
+        """지수 백오프 + full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    # ==================== Tracking ====================
+
+    @contextmanager
+    def track(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        블록 안에서 발생한 API 호출 기록 수집 (같은 태스크 기준)
+
+        Yields:
+            [{'model', 'attempts', 'queue_ms', 'backoff_ms'}] (호출 순서)
+        """
+        records: List[Dict[str, Any]] = []
+        token = _call_records.set(records)
+        try:
+            yield records
+        finally:
+            _call_records.reset(token)
+
+    @staticmethod
+    def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """호출 기록 요약 (응답 메타데이터용)"""
+        return {
+            "calls": len(records),
+            "attempts": sum(record["attempts"] for record in records),
+            "queue_ms": round(sum(record["queue_ms"] for record in records), 2),
+            "backoff_ms": round(sum(record["backoff_ms"] for record in records), 2)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """모델별 / 키별 버킷, 동시 호출, 재시도 메트릭"""
+        return {
+            "max_retries": self.max_retries,
+            "max_queue_wait_s": self.max_queue_wait,
+            "models": {name: limit.get_stats() for name, limit in self._models.items()},
+            "keys": {name: limit.get_stats() for name, limit in self._keys.items()}
+        }
+
+
+# 싱글톤 인스턴스
+api_governor = ApiGovernor()
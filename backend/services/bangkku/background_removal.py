@@ -0,0 +1,235 @@
+"""
+Background Removal Executor
+rembg 배경 제거를 전용 프로세스 풀에서 실행하는 서비스
+
+- 워커 프로세스마다 rembg/onnxruntime 세션을 하나씩 미리 로드
+- 대기열 깊이 제한 (초과 시 BackgroundRemovalQueueFull)
+- 워커별 대기 시간 / 추론 시간 메트릭
+"""
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any, List, Tuple
+
+from PIL import Image
+
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundRemovalQueueFull(Exception):
+    """배경 제거 대기열이 가득 찼을 때 발생 (라우터에서 503으로 변환)"""
+
+
+# ==================== Worker Process ====================
+
+# 워커 프로세스 전역 rembg 세션 (프로세스당 하나)
+_worker_session = None
+
+
+def _init_worker(model_name: str, providers: List[str]) -> None:
+    """워커 프로세스 초기화: rembg 세션을 미리 로드"""
+    global _worker_session
+    from rembg import new_session
+
+    _worker_session = new_session(model_name, providers=providers)
+
+
+def _remove_in_worker(
+    mode: str,
+    size: Tuple[int, int],
+    raw: bytes,
+    submitted_at: float,
+    only_mask: bool = False
+) -> Tuple[str, Tuple[int, int], bytes, int, float, float]:
+    """
+    워커 프로세스에서 배경 제거 실행
+
+    Returns:
+        (출력 모드, 출력 크기, RGBA 또는 L(only_mask) raw bytes, 워커 PID, 대기 시간(초), 추론 시간(초))
+    """
+    started_at = time.time()
+    from rembg import remove
+
+    image = Image.frombytes(mode, size, raw)
+    output = remove(image, session=_worker_session, only_mask=only_mask)
+    output_mode = "L" if only_mask else "RGBA"
+    if output.mode != output_mode:
+        output = output.convert(output_mode)
+
+    inference_time = time.time() - started_at
+    return output.mode, output.size, output.tobytes(), os.getpid(), started_at - submitted_at, inference_time
+
+
+# ==================== Executor ====================
+
+class BackgroundRemovalExecutor:
+    """rembg 전용 프로세스 풀 실행기"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드 (풀은 첫 사용 시 생성)"""
+        self.model_name = os.getenv("REMBG_MODEL", "u2net")
+        self.providers = [
+            provider.strip()
+            for provider in os.getenv("REMBG_PROVIDERS", "CPUExecutionProvider").split(",")
+            if provider.strip()
+        ]
+        self.max_workers = max(1, int(os.getenv("REMBG_WORKERS", 2)))
+        self.max_queue_depth = max(0, int(os.getenv("REMBG_MAX_QUEUE", 8)))
+        self.start_method = os.getenv("REMBG_MP_START_METHOD", "spawn")
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._rejected = 0
+        self._failed = 0
+        self._worker_metrics: Dict[int, Dict[str, float]] = {}
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        """프로세스 풀 생성 (지연 초기화)"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self.model_name, self.providers)
+            )
+            logger.info(
+                f"Background removal pool started: workers={self.max_workers}, "
+                f"model={self.model_name}, providers={self.providers}"
+            )
+        return self._pool
+
+    @property
+    def queue_depth(self) -> int:
+        """워커에 할당되지 못하고 대기 중인 작업 수"""
+        return max(0, self._pending - self.max_workers)
+
+    async def remove(self, image: Image.Image, only_mask: bool = False) -> Image.Image:
+        """
+        배경 제거 (프로세스 풀에서 실행)
+
+        Args:
+            image: 배경을 제거할 PIL 이미지
+            only_mask: True면 알파 마스크(L)만 반환
+
+        Returns:
+            투명 배경(RGBA)의 이미지 또는 알파 마스크(L)
+
+        Raises:
+            BackgroundRemovalQueueFull: 대기열이 가득 찬 경우
+        """
+        if self._pending >= self.max_workers + self.max_queue_depth:
+            self._rejected += 1
+            raise BackgroundRemovalQueueFull(
+                f"Background removal queue is full (max depth: {self.max_queue_depth})"
+            )
+
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+
+        pool = self._ensure_pool()
+        loop = asyncio.get_running_loop()
+
+        self._pending += 1
+        try:
+            with span("rembg", model=self.model_name, only_mask=only_mask) as rembg_span:
+                output_mode, size, raw, pid, queue_wait, inference_time = await loop.run_in_executor(
+                    pool,
+                    _remove_in_worker,
+                    image.mode,
+                    image.size,
+                    image.tobytes(),
+                    time.time(),
+                    only_mask
+                )
+                rembg_span.set_attribute("queue_wait_ms", round(max(0.0, queue_wait) * 1000, 1))
+                rembg_span.set_attribute("inference_ms", round(inference_time * 1000, 1))
+        except BrokenProcessPool:
+            # 워커 초기화 실패/비정상 종료 시 다음 요청에서 풀을 재생성
+            self._failed += 1
+            self._discard_pool(pool)
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._record(pid, queue_wait, inference_time)
+        return Image.frombytes(output_mode, size, raw)
+
+    async def warmup(self) -> None:
+        """
+        워커 프로세스 시작 및 rembg 세션 로드
+
+        워커 수만큼 작은 이미지를 동시에 제출하여 모든 워커가 세션을 로드하도록 합니다.
+        """
+        image = Image.new("RGB", (32, 32), (255, 255, 255))
+        await asyncio.gather(*(self.remove(image) for _ in range(self.max_workers)))
+
+    def _record(self, pid: int, queue_wait: float, inference_time: float) -> None:
+        """워커별 메트릭 누적"""
+        metrics = self._worker_metrics.setdefault(pid, {
+            "jobs": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0,
+            "inference_ms_total": 0.0,
+            "inference_ms_max": 0.0
+        })
+        queue_wait_ms = max(0.0, queue_wait) * 1000
+        inference_ms = inference_time * 1000
+
+        metrics["jobs"] += 1
+        metrics["queue_wait_ms_total"] += queue_wait_ms
+        metrics["queue_wait_ms_max"] = max(metrics["queue_wait_ms_max"], queue_wait_ms)
+        metrics["inference_ms_total"] += inference_ms
+        metrics["inference_ms_max"] = max(metrics["inference_ms_max"], inference_ms)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """대기열 상태 및 워커별 메트릭 반환"""
+        workers = []
+        for pid, metrics in self._worker_metrics.items():
+            jobs = metrics["jobs"] or 1
+            workers.append({
+                "pid": pid,
+                "jobs": metrics["jobs"],
+                "avg_queue_wait_ms": round(metrics["queue_wait_ms_total"] / jobs, 2),
+                "max_queue_wait_ms": round(metrics["queue_wait_ms_max"], 2),
+                "avg_inference_ms": round(metrics["inference_ms_total"] / jobs, 2),
+                "max_inference_ms": round(metrics["inference_ms_max"], 2)
+            })
+
+        return {
+            "model": self.model_name,
+            "providers": self.providers,
+            "max_workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self._pending,
+            "queue_depth": self.queue_depth,
+            "rejected": self._rejected,
+            "failed": self._failed,
+            "workers": workers
+        }
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        """손상된 프로세스 풀 폐기"""
+        if self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            logger.warning("Background removal pool is broken, it will be recreated on next use")
+
+    def shutdown(self) -> None:
+        """프로세스 풀 종료"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            logger.info("Background removal pool stopped")
+
+
+# 싱글톤 인스턴스
+background_removal_executor = BackgroundRemovalExecutor()
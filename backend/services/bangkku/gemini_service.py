@@ -3,6 +3,7 @@ Gemini Image Processing Service
 Google Gemini 2.5 Flash를 사용한 이미지 처리 서비스
 """
 import os
+import asyncio
 import base64
 import logging
 import time
@@ -10,13 +11,21 @@ from typing import List, Optional, Dict, Any, Tuple
 from io import BytesIO
 
 import dotenv
-from PIL import Image, ImageChops, ImageStat
+from PIL import Image
 import numpy as np
-from google import genai
-from google.genai.types import GenerateContentConfig, Part
-from rembg import remove
 
+from services.bangkku.background_removal import (
+    background_removal_executor,
+    BackgroundRemovalQueueFull
+)
+from services.bangkku.result_cache import result_cache
+from services.bangkku.matting import matting_settings, map_bbox_to_full, refine_alpha
+from services.bangkku.image_encoder import image_encoder
+from services.bangkku.api_governor import api_governor
+from services.bangkku.single_flight import single_flight
+from services.lazy_service import LazyService
 from services.prompt_service import PromptService
+from utils.tracing import span, collect_stages, round_stages
 from services.test_result_service import TestResultService
 
 logger = logging.getLogger(__name__)
@@ -31,8 +40,17 @@ class GeminiService:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY environment variable is required")
 
+        # google-genai는 import 비용이 커서 서비스 생성 시점에 로드
+        from google import genai
+
+        self.api_key = api_key
         self.client = genai.Client(api_key=api_key)
         self.model = "gemini-2.5-flash-preview-01-15"
+        api_governor.configure_model(self.model, "GEMINI", rate_per_minute=60, burst=5, max_in_flight=8)
+        self.generation_config = {
+            "temperature": 0.7,
+            "max_output_tokens": 8192
+        }
 
         # Service layer instances
         self.prompt_service = PromptService()
@@ -40,49 +58,153 @@ class GeminiService:
 
     def base64_to_pil(self, base64_string: str) -> Image.Image:
         """Base64 문자열을 PIL Image로 변환"""
-        # data:image/jpeg;base64, 부분 제거
-        if "," in base64_string:
-            base64_string = base64_string.split(",")[1]
-
-        image_bytes = base64.b64decode(base64_string)
-        return Image.open(BytesIO(image_bytes))
+        return Image.open(BytesIO(self.decode_data_url(base64_string)))
 
     def pil_to_base64(self, image: Image.Image, format: str = "PNG") -> str:
         """PIL Image를 Base64 문자열로 변환"""
+        return self.encode_data_url(self.encode_image(image, format), f"image/{format.lower()}")
+
+    def decode_data_url(self, data_url: str) -> bytes:
+        """Base64 data URL(또는 순수 base64 문자열)을 bytes로 변환"""
+        with span("decode"):
+            # data:image/jpeg;base64, 부분 제거
+            if "," in data_url:
+                data_url = data_url.split(",", 1)[1]
+            return base64.b64decode(data_url)
+
+    def encode_data_url(self, image_bytes: bytes, mime_type: str) -> str:
+        """bytes를 Base64 data URL로 변환"""
+        return f"data:{mime_type};base64,{base64.b64encode(image_bytes).decode()}"
+
+    def encode_image(self, image: Image.Image, format: str = "PNG") -> bytes:
+        """PIL Image를 지정한 포맷의 bytes로 인코딩"""
         buffered = BytesIO()
         image.save(buffered, format=format)
-        img_bytes = buffered.getvalue()
-        img_base64 = base64.b64encode(img_bytes).decode()
-        return f"data:image/{format.lower()};base64,{img_base64}"
-
-    def _estimate_background_color(self, image: Image.Image) -> Tuple[int, int, int]:
-        """이미지 가장자리 색상을 샘플링하여 배경색을 추정합니다."""
-
-        rgb_image = image.convert("RGB")
-        width, height = rgb_image.size
+        return buffered.getvalue()
+
+    def sniff_mime_type(self, image_bytes: bytes) -> str:
+        """매직 바이트로 이미지 MIME 타입 추정 (알 수 없으면 image/png)"""
+        if image_bytes.startswith(b"\xff\xd8\xff"):
+            return "image/jpeg"
+        if image_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
+            return "image/png"
+        if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+            return "image/webp"
+        if image_bytes[:6] in (b"GIF87a", b"GIF89a"):
+            return "image/gif"
+        if image_bytes[4:12] in (b"ftypavif", b"ftypavis"):
+            return "image/avif"
+        if image_bytes[4:12] in (b"ftypheic", b"ftypheix", b"ftypmif1"):
+            return "image/heic"
+        return "image/png"
+
+    def _estimate_background_color(self, pixels: np.ndarray) -> np.ndarray:
+        """
+        이미지 가장자리 픽셀을 샘플링하여 배경색을 추정합니다.
 
-        if width == 0 or height == 0:
-            return (255, 255, 255)
+        Args:
+            pixels: (H, W, C) uint8 배열 뷰
 
+        Returns:
+            채널별 배경색 (C,) int 배열
+        """
+        height, width = pixels.shape[:2]
         step_x = max(1, width // 50)
         step_y = max(1, height // 50)
-        samples: List[Tuple[int, int, int]] = []
-
-        for x in range(0, width, step_x):
-            samples.append(rgb_image.getpixel((x, 0)))
-            samples.append(rgb_image.getpixel((x, height - 1)))
 
-        for y in range(0, height, step_y):
-            samples.append(rgb_image.getpixel((0, y)))
-            samples.append(rgb_image.getpixel((width - 1, y)))
-
-        if not samples:
-            stats = ImageStat.Stat(rgb_image)
-            return tuple(int(channel) for channel in stats.mean[:3])
+        samples = np.concatenate([
+            pixels[0, ::step_x],
+            pixels[-1, ::step_x],
+            pixels[::step_y, 0],
+            pixels[::step_y, -1]
+        ])
+        return np.round(samples.mean(axis=0)).astype(np.int16)
+
+    def _channel_diff_luts(self, background: np.ndarray) -> np.ndarray:
+        """채널별 |픽셀값 - 배경색| 룩업 테이블 (C, 256) uint8"""
+        levels = np.arange(256, dtype=np.int16)
+        return np.abs(levels[None, :] - background[:, None]).astype(np.uint8)
+
+    def _max_channel_diff(self, pixels: np.ndarray, luts: np.ndarray) -> np.ndarray:
+        """채널 중 배경색과의 최대 차이 (int16 전체 이미지 복사 없이 LUT로 계산)"""
+        max_diff = luts[0][pixels[..., 0]]
+        for channel in range(1, pixels.shape[2]):
+            np.maximum(max_diff, luts[channel][pixels[..., channel]], out=max_diff)
+        return max_diff
+
+    def _border_noise_floor(self, pixels: np.ndarray, luts: np.ndarray, percentile: float = 95) -> float:
+        """
+        가장자리 띠의 배경색 차이 분포에서 noise floor(기본 95 percentile) 계산
+        차이값이 0-255 정수이므로 히스토그램으로 np.percentile(linear)과 동일한 값을 구합니다.
+        """
+        height, width = pixels.shape[:2]
+        border = max(1, min(width, height) // 20)
+
+        histogram = np.zeros(256, dtype=np.int64)
+        for strip in (pixels[:border], pixels[-border:], pixels[:, :border], pixels[:, -border:]):
+            histogram += np.bincount(self._max_channel_diff(strip, luts).ravel(), minlength=256)
+
+        total = int(histogram.sum())
+        if total == 0:
+            return 0.0
+
+        position = (total - 1) * percentile / 100.0
+        lower_index = int(np.floor(position))
+        upper_index = min(lower_index + 1, total - 1)
+        cumulative = np.cumsum(histogram)
+        lower_value = int(np.searchsorted(cumulative, lower_index, side="right"))
+        upper_value = int(np.searchsorted(cumulative, upper_index, side="right"))
+        return lower_value + (upper_value - lower_value) * (position - lower_index)
+
+    def _find_object_bbox(
+        self,
+        image: Image.Image,
+        difference_threshold: int
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        객체 bounding box 계산 (투명 영역 → 배경색 차이 순)
 
-        sample_count = len(samples)
-        avg = [sum(channel[i] for channel in samples) / sample_count for i in range(3)]
-        return tuple(int(round(value)) for value in avg)
+        Returns:
+            (left, upper, right, lower) 또는 None
+        """
+        if image.mode in ("RGBA", "LA"):
+            # 투명 픽셀 기준 bbox (알파 채널 복사 없이 PIL에서 계산)
+            bbox = image.getbbox()
+            if bbox and bbox != (0, 0, image.width, image.height):
+                return bbox
+        elif image.mode not in ("RGB", "L"):
+            # 팔레트/CMYK 등은 한 번만 변환 (팔레트 투명도 반영)
+            image = image.convert("RGBA")
+            bbox = image.getbbox()
+            if bbox and bbox != (0, 0, image.width, image.height):
+                return bbox
+
+        pixels = np.asarray(image)
+        if pixels.ndim == 2:
+            pixels = pixels[..., None]
+        if image.mode in ("RGBA", "LA"):
+            # 알파 채널 제외 (복사 없는 뷰)
+            pixels = pixels[..., :-1]
+
+        background = self._estimate_background_color(pixels)
+        luts = self._channel_diff_luts(background)
+
+        # Adaptive thresholding: look at border noise to avoid full-frame crops
+        noise_floor = self._border_noise_floor(pixels, luts)
+        adaptive_threshold = max(difference_threshold, noise_floor + 3.0)
+
+        # 채널별 "배경과 다름" 여부 룩업 → 단일 bool 마스크
+        foreground_luts = luts > adaptive_threshold
+        mask = foreground_luts[0][pixels[..., 0]]
+        for channel in range(1, pixels.shape[2]):
+            mask |= foreground_luts[channel][pixels[..., channel]]
+
+        rows = np.flatnonzero(mask.any(axis=1))
+        if rows.size == 0:
+            return None
+        cols = np.flatnonzero(mask[rows[0]:rows[-1] + 1].any(axis=0))
+
+        return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
 
     def crop_to_object(
         self,
@@ -99,76 +221,19 @@ class GeminiService:
             padding_ratio: 객체가 잘리지 않도록 bbox에 추가할 여유 비율
 
         Returns:
-            여백이 제거된 이미지
+            여백이 제거된 이미지 (원본 모드 유지)
         """
 
-        if image is None:
+        if image is None or image.width == 0 or image.height == 0:
             return image
 
-        original_mode = image.mode
-        working_image = image.copy()
-
-        if working_image.mode not in ("RGBA", "LA"):
-            working_image = working_image.convert("RGBA")
-
-        alpha_channel = working_image.getchannel("A")
-        bbox = alpha_channel.getbbox()
-
-        if bbox and bbox != (0, 0, working_image.width, working_image.height):
-            crop_source = working_image
-        else:
-            rgb_image = working_image.convert("RGB")
-            background_color = self._estimate_background_color(rgb_image)
-            rgb_array = np.asarray(rgb_image, dtype=np.int16)
-
-            if rgb_array.ndim != 3 or rgb_array.shape[2] != 3:
-                crop_source = working_image
-                bbox = None
-            else:
-                background_vector = np.array(background_color, dtype=np.int16)
-                channel_diff = np.abs(rgb_array - background_vector)
-                max_diff = channel_diff.max(axis=2)
-
-                # Adaptive thresholding: look at border noise to avoid full-frame crops
-                border = max(1, min(working_image.width, working_image.height) // 20)
-                border_mask = np.concatenate(
-                    [
-                        max_diff[:border, :].ravel(),
-                        max_diff[-border:, :].ravel(),
-                        max_diff[:, :border].ravel(),
-                        max_diff[:, -border:].ravel(),
-                    ]
-                )
-
-                if border_mask.size:
-                    noise_floor = float(np.percentile(border_mask, 95))
-                else:
-                    noise_floor = 0.0
-
-                adaptive_threshold = max(difference_threshold, noise_floor + 3.0)
-                mask = max_diff > adaptive_threshold
-
-                if not np.any(mask):
-                    bbox = None
-                    crop_source = working_image
-                else:
-                    ys = np.where(mask.any(axis=1))[0]
-                    xs = np.where(mask.any(axis=0))[0]
-
-                    top = int(ys[0])
-                    bottom = int(ys[-1]) + 1
-                    left_idx = int(xs[0])
-                    right_idx = int(xs[-1]) + 1
-
-                    bbox = (left_idx, top, right_idx, bottom)
-                    crop_source = working_image
-
+        bbox = self._find_object_bbox(image, difference_threshold)
         if not bbox:
             return image
 
         left, upper, right, lower = bbox
         if padding_ratio > 0:
-            width, height = crop_source.size
+            width, height = image.size
             pad_w = int((right - left) * padding_ratio)
             pad_h = int((lower - upper) * padding_ratio)
             left = max(0, left - pad_w)
@@ -176,43 +241,28 @@ class GeminiService:
             right = min(width, right + pad_w)
             lower = min(height, lower + pad_h)
 
-        cropped = crop_source.crop((left, upper, right, lower))
-
-        if cropped.mode != original_mode:
-            try:
-                cropped = cropped.convert(original_mode)
-            except ValueError:
-                cropped = cropped.convert("RGB")
-
-        return cropped
+        return image.crop((left, upper, right, lower))
 
-    def _format_from_mime(self, mime_type: Optional[str]) -> str:
-        if not mime_type:
-            return "PNG"
-
-        try:
-            format_name = mime_type.split("/")[-1].upper()
-            if format_name == "JPG":
-                format_name = "JPEG"
-            return format_name
-        except Exception:
-            return "PNG"
-
-    def remove_background(self, image: Image.Image) -> Image.Image:
+    async def remove_background(self, image: Image.Image) -> Image.Image:
         """
-        AI 기반 배경 제거 (rembg 사용)
+        AI 기반 배경 제거 (rembg 프로세스 풀 사용)
 
         Args:
             image: 배경을 제거할 PIL 이미지
 
         Returns:
             투명 배경(RGBA)의 이미지
+
+        Raises:
+            BackgroundRemovalQueueFull: 배경 제거 대기열이 가득 찬 경우
         """
         try:
-            # rembg로 배경 제거 (자동으로 RGBA 반환)
-            output = remove(image)
+            # 전용 프로세스 풀에서 rembg 실행 (이벤트 루프 블로킹 방지)
+            output = await background_removal_executor.remove(image)
             logger.info("Background removed successfully using rembg")
             return output
+        except BackgroundRemovalQueueFull:
+            raise
         except Exception as e:
             logger.warning(f"Background removal failed: {str(e)}, returning original")
             # 실패시 원본을 RGBA로 변환해서 반환
@@ -220,177 +270,489 @@ class GeminiService:
                 return image.convert("RGBA")
             return image
 
-    async def process_single_image(
+    async def remove_background_and_crop(
+        self,
+        image: Image.Image,
+        matting_quality: Optional[str] = None
+    ) -> Image.Image:
+        """
+        배경 제거 + 여백 크롭 (품질 모드 선택)
+
+        - full: 원본 해상도로 배경 제거 후 crop_to_object
+        - fast / balanced: 축소본으로 마스크 계산 → 저해상도 bbox를 원본 좌표로 변환 →
+          해당 영역만 guided filter로 알파 업샘플
+
+        Args:
+            image: 원본 PIL 이미지
+            matting_quality: fast / balanced / full (None이면 MATTING_QUALITY)
+
+        Returns:
+            투명 배경(RGBA)의 크롭된 이미지
+
+        Raises:
+            BackgroundRemovalQueueFull: 배경 제거 대기열이 가득 찬 경우
+            ValueError: 지원하지 않는 품질 모드
+        """
+        quality = matting_settings.resolve(matting_quality)
+        working_size = matting_settings.working_size(image.size, quality)
+
+        # 원본 해상도 변환 / 알파 업샘플 / 크롭은 CPU 작업이므로 스레드에서 실행 (이벤트 루프 블로킹 방지)
+        if working_size is None:
+            transparent_image = await self.remove_background(image)
+            with span("crop", matting_quality=quality):
+                return await asyncio.to_thread(
+                    self.crop_to_object, transparent_image, difference_threshold=5, padding_ratio=0.0
+                )
+
+        rgb_image, low_image = await asyncio.to_thread(self._prepare_matting_input, image, working_size)
+
+        try:
+            low_mask = await background_removal_executor.remove(low_image, only_mask=True)
+        except BackgroundRemovalQueueFull:
+            raise
+        except Exception as e:
+            logger.warning(f"Background removal failed: {str(e)}, returning original")
+            return await asyncio.to_thread(self._crop_original, image)
+
+        with span("crop", matting_quality=quality):
+            cutout = await asyncio.to_thread(
+                self._apply_low_res_mask, rgb_image, low_image, low_mask, working_size, quality
+            )
+        logger.info(f"Background removed on {working_size[0]}x{working_size[1]} mask ({quality})")
+        return cutout
+
+    @staticmethod
+    def _prepare_matting_input(
+        image: Image.Image,
+        working_size: Tuple[int, int]
+    ) -> Tuple[Image.Image, Image.Image]:
+        """원본 RGB 변환 + 마스크 계산용 축소본 생성"""
+        rgb_image = image if image.mode == "RGB" else image.convert("RGB")
+        low_image = rgb_image.resize(working_size, Image.BILINEAR, reducing_gap=2.0)
+        return rgb_image, low_image
+
+    def _crop_original(self, image: Image.Image) -> Image.Image:
+        """배경 제거 실패 시 원본을 RGBA로 크롭"""
+        return self.crop_to_object(image.convert("RGBA"), difference_threshold=5, padding_ratio=0.0)
+
+    def _apply_low_res_mask(
+        self,
+        rgb_image: Image.Image,
+        low_image: Image.Image,
+        low_mask: Image.Image,
+        working_size: Tuple[int, int],
+        quality: str
+    ) -> Image.Image:
+        """저해상도 마스크를 원본에 적용 (bbox 영역만 guided filter 업샘플 후 크롭)"""
+        # 저해상도 bbox → 원본 좌표 영역만 업샘플 (영역 밖은 어차피 크롭됨)
+        region = map_bbox_to_full(low_mask.getbbox(), working_size, rgb_image.size)
+        alpha = refine_alpha(
+            rgb_image,
+            low_image,
+            low_mask,
+            region,
+            radius=matting_settings.radius[quality],
+            eps=matting_settings.eps
+        )
+        cutout = rgb_image.crop(region)
+        cutout.putalpha(alpha)
+
+        # 업샘플 여유 영역의 투명 픽셀 정리 (알파 bbox 기준)
+        return self.crop_to_object(cutout, difference_threshold=5, padding_ratio=0.0)
+
+    # ==================== Byte-level Pipeline ====================
+
+    async def _generate_image_bytes(
         self,
         prompt: str,
-        image: str
+        images: List[bytes]
+    ) -> Optional[Tuple[bytes, str]]:
+        """
+        Gemini 호출 후 생성된 이미지 bytes 추출
+
+        Args:
+            prompt: 이미지 처리 프롬프트
+            images: 입력 이미지 bytes 리스트
+
+        Returns:
+            (이미지 bytes, MIME 타입) 또는 이미지가 생성되지 않은 경우 None
+        """
+        from google.genai.types import GenerateContentConfig, Part
+
+        # 컨텐츠 구성: 프롬프트 + 이미지들 (디코딩 없이 원본 bytes 전달)
+        contents = [Part.from_text(text=prompt)]
+        contents.extend([
+            Part.from_bytes(data=image_bytes, mime_type=self.sniff_mime_type(image_bytes))
+            for image_bytes in images
+        ])
+
+        # Gemini API 호출 (모델/키별 속도 제한, 429 재시도)
+        with span("gemini", model=self.model, images=len(images)):
+            response = await api_governor.call(
+                self.model,
+                self.api_key,
+                lambda: self.client.aio.models.generate_content(
+                    model=self.model,
+                    contents=contents,
+                    config=GenerateContentConfig(**self.generation_config)
+                )
+            )
+
+        # 생성된 이미지 추출
+        if response.candidates and len(response.candidates) > 0:
+            candidate = response.candidates[0]
+
+            # 이미지 파트 찾기
+            for part in candidate.content.parts:
+                if hasattr(part, 'inline_data') and part.inline_data:
+                    return part.inline_data.data, part.inline_data.mime_type
+
+        return None
+
+    def _result_cache_key(
+        self,
+        prompt: str,
+        images: List[bytes],
+        matting_quality: str,
+        accept: Optional[str]
     ) -> str:
+        """결과 캐시 키 (모델, 프롬프트, 생성 설정, 입력 이미지, 후처리/인코딩 설정)"""
+        extra = {
+            "rembg_model": background_removal_executor.model_name,
+            "encode": image_encoder.cache_token("process", accept)
+        }
+        if matting_quality != "full":
+            extra["matting"] = matting_quality
+        return result_cache.make_key(
+            model=self.model,
+            prompt=prompt,
+            config=self.generation_config,
+            images=images,
+            extra=extra
+        )
+
+    async def _generate_and_postprocess(
+        self,
+        prompt: str,
+        images: List[bytes],
+        use_cache: bool,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Optional[Tuple[bytes, str, Dict[str, Any]]]:
         """
-        단일 이미지 처리
+        결과 캐시 조회 → (동일 요청 병합) Gemini 호출 → 후처리 → 캐시 저장
 
         Args:
             prompt: 이미지 처리 프롬프트
-            image: 이미지 (base64)
+            images: 입력 이미지 bytes 리스트
+            use_cache: False면 캐시를 조회/저장하지 않음 (A/B 테스트용)
+            matting_quality: 배경 제거 품질 모드 (fast / balanced / full)
+            accept: 클라이언트 Accept 헤더 (출력 포맷 협상)
 
         Returns:
-            처리된 이미지 (base64 data URL)
+            (처리된 이미지 bytes, MIME 타입, 인코딩 메타데이터) 또는 이미지가 생성되지 않은 경우 None
         """
-        try:
-            # Base64 → PIL Image 변환
-            pil_image = self.base64_to_pil(image)
+        matting_quality = matting_settings.resolve(matting_quality)
+
+        cache_key = None
+        if result_cache.enabled:
+            if use_cache:
+                cache_key = self._result_cache_key(prompt, images, matting_quality, accept)
+                cached = await result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Gemini result cache hit")
+                    return (*cached, image_encoder.reused_metadata(*cached, "process", "cache"))
+            else:
+                result_cache.record_bypass()
+
+        # 같은 입력의 동시 요청은 Gemini 호출/후처리를 한 번만 실행
+        flight_key = cache_key or self._result_cache_key(prompt, images, matting_quality, accept)
+        is_leader = False
+
+        async def work():
+            nonlocal is_leader
+            is_leader = True
+            return await self._generate_uncached(prompt, images, matting_quality, accept, cache_key)
 
+        result = await single_flight.run("process", flight_key, work)
+        if result is None or is_leader:
+            return result
+        return result[0], result[1], {**result[2], "coalesced": True}
+
+    async def _generate_uncached(
+        self,
+        prompt: str,
+        images: List[bytes],
+        matting_quality: str,
+        accept: Optional[str],
+        cache_key: Optional[str]
+    ) -> Optional[Tuple[bytes, str, Dict[str, Any]]]:
+        """Gemini 호출 → 후처리 → 캐시 저장 (cache_key가 있을 때)"""
+        with api_governor.track() as calls:
+            generated = await self._generate_image_bytes(prompt, images)
+        if generated is None:
+            return None
+
+        result = await self._postprocess_image_bytes(
+            generated[0],
+            matting_quality=matting_quality,
+            accept=accept
+        )
+        # API 대기/재시도 시간 (캐시 hit에는 없음)
+        result[2]["governor"] = api_governor.summarize(calls)
+        if cache_key:
+            await result_cache.put(cache_key, result[0], result[1])
+        return result
+
+    async def _postprocess_image_bytes(
+        self,
+        image_bytes: bytes,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Tuple[bytes, str, Dict[str, Any]]:
+        """
+        생성된 이미지 후처리: 배경 제거 → 여백 크롭 → 인코딩
+
+        Args:
+            image_bytes: Gemini가 생성한 이미지 bytes
+            matting_quality: 배경 제거 품질 모드 (fast / balanced / full)
+            accept: 클라이언트 Accept 헤더 (출력 포맷 협상)
+
+        Returns:
+            (처리된 이미지 bytes, MIME 타입, 인코딩 메타데이터)
+        """
+        generated_image = Image.open(BytesIO(image_bytes))
+
+        # 1-2단계: AI 배경 제거 (투명 배경으로) + 여백 크롭 (알파 채널 기반으로 정확하게)
+        cropped_image = await self.remove_background_and_crop(generated_image, matting_quality)
+
+        # 3단계: 출력 정책에 따라 인코딩 (알파 → 무손실 WebP, 불투명 → JPEG 등, Accept 협상)
+        # WebP/AVIF 인코딩은 수백 ms 걸릴 수 있으므로 스레드에서 실행
+        return await asyncio.to_thread(image_encoder.encode, cropped_image, "process", accept)
+
+    async def process_single_image_bytes(
+        self,
+        prompt: str,
+        image_bytes: bytes,
+        use_cache: bool = True,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Tuple[bytes, str, Dict[str, Any]]:
+        """
+        단일 이미지 처리 (bytes 입출력)
+
+        Args:
+            prompt: 이미지 처리 프롬프트
+            image_bytes: 원본 이미지 bytes
+            use_cache: 결과 캐시 사용 여부
+            matting_quality: 배경 제거 품질 모드 (fast / balanced / full)
+            accept: 클라이언트 Accept 헤더 (출력 포맷 협상)
+
+        Returns:
+            (처리된 이미지 bytes, MIME 타입, 인코딩 메타데이터)
+        """
+        try:
             logger.info(f"Gemini single image processing: {prompt[:50]}...")
 
-            # Gemini API 호출
-            response = await self.client.aio.models.generate_content(
-                model=self.model,
-                contents=[
-                    Part.from_text(prompt),
-                    Part.from_image(pil_image)
-                ],
-                config=GenerateContentConfig(
-                    temperature=0.7,
-                    max_output_tokens=8192
-                )
+            result = await self._generate_and_postprocess(
+                prompt, [image_bytes], use_cache, matting_quality, accept
             )
+            if result is None:
+                # 이미지가 없으면 원본 반환
+                logger.warning("No image generated, returning original")
+                mime_type = self.sniff_mime_type(image_bytes)
+                return image_bytes, mime_type, image_encoder.reused_metadata(
+                    image_bytes, mime_type, "process", "original"
+                )
 
-            # 생성된 이미지 추출
-            if response.candidates and len(response.candidates) > 0:
-                candidate = response.candidates[0]
-
-                # 이미지 파트 찾기
-                for part in candidate.content.parts:
-                    if hasattr(part, 'inline_data') and part.inline_data:
-                        # 이미지 데이터를 base64로 변환
-                        image_bytes = part.inline_data.data
-                        # img_base64 = base64.b64encode(image_bytes).decode()
-                        mime_type = part.inline_data.mime_type
-                        # result_url = f"data:{mime_type};base64,{img_base64}"
-
-                        # 이미지 처리: 배경 제거 → 여백 크롭
-                        format_name = self._format_from_mime(mime_type)
-                        generated_image = Image.open(BytesIO(image_bytes))
-
-                        # 1단계: AI 배경 제거 (투명 배경으로)
-                        transparent_image = self.remove_background(generated_image)
-
-                        # 2단계: 여백 크롭 (알파 채널 기반으로 정확하게)
-                        cropped_image = self.crop_to_object(
-                            transparent_image,
-                            difference_threshold=5,  # 더 민감하게
-                            padding_ratio=0.0  # 여백 없이
-                        )
-
-                        # 3단계: 포맷에 맞게 변환
-                        if format_name in {"JPEG", "JPG"}:
-                            # JPEG는 투명도 지원 안함 → 흰 배경으로
-                            if cropped_image.mode == "RGBA":
-                                white_bg = Image.new("RGB", cropped_image.size, (255, 255, 255))
-                                white_bg.paste(cropped_image, mask=cropped_image.split()[3])
-                                cropped_image = white_bg
-
-                        result_url = self.pil_to_base64(cropped_image, format=format_name)
-
-                        logger.info("Gemini single image processing completed")
-                        return result_url
-
-            # 이미지가 없으면 원본 반환
-            logger.warning("No image generated, returning original")
-            return image
+            logger.info("Gemini single image processing completed")
+            return result
 
         except Exception as e:
             logger.error(f"Gemini single image processing failed: {str(e)}")
             raise
 
-    async def process_multiple_images(
+    async def process_multiple_images_bytes(
         self,
         prompt: str,
-        images: List[str]
-    ) -> str:
+        images: List[bytes],
+        use_cache: bool = True,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Tuple[bytes, str, Dict[str, Any]]:
         """
-        다중 이미지 처리
+        다중 이미지 처리 (bytes 입출력)
 
         Args:
             prompt: 이미지 처리 프롬프트
-            images: 이미지 리스트 (base64)
+            images: 원본 이미지 bytes 리스트
+            use_cache: 결과 캐시 사용 여부
+            matting_quality: 배경 제거 품질 모드 (fast / balanced / full)
+            accept: 클라이언트 Accept 헤더 (출력 포맷 협상)
 
         Returns:
-            처리된 이미지 (base64 data URL)
+            (처리된 이미지 bytes, MIME 타입, 인코딩 메타데이터)
         """
         try:
             logger.info(f"Gemini multiple images processing: {len(images)} images, {prompt[:50]}...")
 
-            # Base64 → PIL Image 변환
-            pil_images = [self.base64_to_pil(img) for img in images]
-
-            # 컨텐츠 구성: 프롬프트 + 이미지들
-            contents = [Part.from_text(prompt)]
-            contents.extend([Part.from_image(img) for img in pil_images])
-
-            # Gemini API 호출
-            response = await self.client.aio.models.generate_content(
-                model=self.model,
-                contents=contents,
-                config=GenerateContentConfig(
-                    temperature=0.7,
-                    max_output_tokens=8192
-                )
+            result = await self._generate_and_postprocess(
+                prompt, images, use_cache, matting_quality, accept
             )
+            if result is None:
+                # 이미지가 없으면 첫 번째 이미지 반환
+                logger.warning("No image generated, returning first image")
+                mime_type = self.sniff_mime_type(images[0])
+                return images[0], mime_type, image_encoder.reused_metadata(
+                    images[0], mime_type, "process", "original"
+                )
 
-            # 생성된 이미지 추출
-            if response.candidates and len(response.candidates) > 0:
-                candidate = response.candidates[0]
-
-                # 이미지 파트 찾기
-                for part in candidate.content.parts:
-                    if hasattr(part, 'inline_data') and part.inline_data:
-                        # 이미지 데이터를 base64로 변환
-                        image_bytes = part.inline_data.data
-                        # img_base64 = base64.b64encode(image_bytes).decode()
-                        mime_type = part.inline_data.mime_type
-                        # result_url = f"data:{mime_type};base64,{img_base64}"
-
-                        # 이미지 처리: 배경 제거 → 여백 크롭
-                        format_name = self._format_from_mime(mime_type)
-                        generated_image = Image.open(BytesIO(image_bytes))
-
-                        # 1단계: AI 배경 제거 (투명 배경으로)
-                        transparent_image = self.remove_background(generated_image)
-
-                        # 2단계: 여백 크롭 (알파 채널 기반으로 정확하게)
-                        cropped_image = self.crop_to_object(
-                            transparent_image,
-                            difference_threshold=5,  # 더 민감하게
-                            padding_ratio=0.0  # 여백 없이
-                        )
-
-                        # 3단계: 포맷에 맞게 변환
-                        if format_name in {"JPEG", "JPG"}:
-                            # JPEG는 투명도 지원 안함 → 흰 배경으로
-                            if cropped_image.mode == "RGBA":
-                                white_bg = Image.new("RGB", cropped_image.size, (255, 255, 255))
-                                white_bg.paste(cropped_image, mask=cropped_image.split()[3])
-                                cropped_image = white_bg
-
-                        result_url = self.pil_to_base64(cropped_image, format=format_name)
-
-                        logger.info("Gemini multiple images processing completed")
-                        return result_url
-
-            # 이미지가 없으면 첫 번째 이미지 반환
-            logger.warning("No image generated, returning first image")
-            return images[0]
+            logger.info("Gemini multiple images processing completed")
+            return result
 
         except Exception as e:
             logger.error(f"Gemini multiple images processing failed: {str(e)}")
             raise
 
+    async def remove_background_bytes(
+        self,
+        image_bytes: bytes,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Tuple[bytes, str, Dict[str, Any]]:
+        """
+        배경 제거 및 여백 크롭 (bytes 입출력, 투명 배경 유지 포맷으로 인코딩)
+
+        Args:
+            image_bytes: 원본 이미지 bytes
+            matting_quality: 배경 제거 품질 모드 (fast / balanced / full)
+            accept: 클라이언트 Accept 헤더 (출력 포맷 협상)
+
+        Returns:
+            (처리된 이미지 bytes, MIME 타입, 인코딩 메타데이터)
+        """
+        matting_quality = matting_settings.resolve(matting_quality)
+        flight_key = result_cache.make_key(
+            model=background_removal_executor.model_name,
+            prompt="",
+            config={},
+            images=[image_bytes],
+            extra={
+                "matting": matting_quality,
+                "encode": image_encoder.cache_token("remove_background", accept)
+            }
+        )
+        is_leader = False
+
+        async def work():
+            nonlocal is_leader
+            is_leader = True
+            pil_image = Image.open(BytesIO(image_bytes))
+
+            # 배경 제거 (프로세스 풀) → 여백 크롭
+            cropped_image = await self.remove_background_and_crop(pil_image, matting_quality)
+
+            return await asyncio.to_thread(image_encoder.encode, cropped_image, "remove_background", accept)
+
+        # 같은 이미지의 동시 요청은 배경 제거를 한 번만 실행
+        result = await single_flight.run("remove_background", flight_key, work)
+        if is_leader:
+            return result
+        return result[0], result[1], {**result[2], "coalesced": True}
+
+    # ==================== Data URL Wrappers ====================
+
+    async def process_single_image(
+        self,
+        prompt: str,
+        image: str,
+        use_cache: bool = True,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        단일 이미지 처리
+
+        Args:
+            prompt: 이미지 처리 프롬프트
+            image: 이미지 (base64)
+            use_cache: 결과 캐시 사용 여부
+            matting_quality: 배경 제거 품질 모드 (fast / balanced / full)
+            accept: 클라이언트 Accept 헤더 (출력 포맷 협상)
+
+        Returns:
+            (처리된 이미지 base64 data URL, 인코딩 메타데이터)
+        """
+        result_bytes, mime_type, metadata = await self.process_single_image_bytes(
+            prompt,
+            self.decode_data_url(image),
+            use_cache=use_cache,
+            matting_quality=matting_quality,
+            accept=accept
+        )
+        return self.encode_data_url(result_bytes, mime_type), metadata
+
+    async def process_multiple_images(
+        self,
+        prompt: str,
+        images: List[str],
+        use_cache: bool = True,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        다중 이미지 처리
+
+        Args:
+            prompt: 이미지 처리 프롬프트
+            images: 이미지 리스트 (base64)
+            use_cache: 결과 캐시 사용 여부
+            matting_quality: 배경 제거 품질 모드 (fast / balanced / full)
+            accept: 클라이언트 Accept 헤더 (출력 포맷 협상)
+
+        Returns:
+            (처리된 이미지 base64 data URL, 인코딩 메타데이터)
+        """
+        result_bytes, mime_type, metadata = await self.process_multiple_images_bytes(
+            prompt,
+            [self.decode_data_url(img) for img in images],
+            use_cache=use_cache,
+            matting_quality=matting_quality,
+            accept=accept
+        )
+        return self.encode_data_url(result_bytes, mime_type), metadata
+
+    async def remove_background_data_url(
+        self,
+        image: str,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        배경 제거 및 여백 크롭
+
+        Args:
+            image: 이미지 (base64)
+            matting_quality: 배경 제거 품질 모드 (fast / balanced / full)
+            accept: 클라이언트 Accept 헤더 (출력 포맷 협상)
+
+        Returns:
+            (처리된 이미지 base64 data URL, 인코딩 메타데이터)
+        """
+        result_bytes, mime_type, metadata = await self.remove_background_bytes(
+            self.decode_data_url(image),
+            matting_quality=matting_quality,
+            accept=accept
+        )
+        return self.encode_data_url(result_bytes, mime_type), metadata
+
     async def process_with_default_prompt(
         self,
         prompt_kind: str,
         image: str,
         input_params: Optional[Dict[str, Any]] = None,
-        save_result: bool = True
+        save_result: bool = True,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         기본 프롬프트를 사용한 이미지 처리 (DB 연동)
@@ -401,13 +763,15 @@ class GeminiService:
             image: Image (base64)
             input_params: Additional input parameters to save
             save_result: Whether to save test result to DB
+            use_cache: Whether to use the result cache
 
         Returns:
             Dict: {
                 'result': base64 image,
                 'prompt_key': prompt ID used,
                 'execution_time_ms': processing time,
-                'test_result_key': saved result ID (if save_result=True)
+                'test_result_key': reserved result ID (if save_result=True, written in background),
+                'encode': output encoding metadata (format, bytes, encode_ms)
             }
         """
         start_time = time.time()
@@ -416,36 +780,43 @@ class GeminiService:
         error_msg = None
         result_image = None
 
+        stages: Dict[str, float] = {}
+
         try:
-            # 1. Get default prompt from DB
-            prompt_data = await self.prompt_service.get_default_prompt(prompt_kind)
-            if not prompt_data:
-                raise ValueError(f"No default prompt found for {prompt_kind}")
+            # 스테이지별 소요 시간 (테스트 결과 input_params.stage_ms)
+            with collect_stages() as stages:
+                # 1. Get default prompt from DB
+                with span("prompt_lookup", prompt_kind=prompt_kind):
+                    prompt_data = await self.prompt_service.get_default_prompt(prompt_kind)
+                if not prompt_data:
+                    raise ValueError(f"No default prompt found for {prompt_kind}")
 
-            prompt_key = prompt_data['prompt_key']
-            prompt_text = prompt_data['prompt_text']
+                prompt_key = prompt_data['prompt_key']
+                prompt_text = prompt_data['prompt_text']
 
-            # 2. Increment usage count
-            await self.prompt_service.increment_usage(prompt_key)
+                # 2. Increment usage count
+                with span("db_write"):
+                    await self.prompt_service.increment_usage(prompt_key)
 
-            # 3. Process image with AI
-            result_image = await self.process_single_image(prompt_text, image)
+                # 3. Process image with AI
+                result_image, encode_metadata = await self.process_single_image(prompt_text, image, use_cache=use_cache)
 
-            # 4. Mark as success
-            success = True
-            await self.prompt_service.increment_success(prompt_key)
+                # 4. Mark as success
+                success = True
+                with span("db_write"):
+                    await self.prompt_service.increment_success(prompt_key)
 
             execution_time_ms = int((time.time() - start_time) * 1000)
 
-            # 5. Save test result if requested
+            # 5. Queue test result if requested (written in background; stage_ms is complete at this point)
             test_result_key = None
             if save_result and prompt_key:
                 from database.models import TestResultCreate
 
-                test_result_key = await self.test_result_service.create_test_result(
+                test_result_key = await self.test_result_service.enqueue_test_result(
                     TestResultCreate(
                         prompt_key=prompt_key,
-                        input_params=input_params or {},
+                        input_params={**(input_params or {}), 'stage_ms': round_stages(stages)},
                         output_url=result_image[:100] if result_image else None,  # Save first 100 chars
                         execution_time_ms=execution_time_ms,
                         token_cnt=None,  # Gemini doesn't provide token count easily
@@ -459,21 +830,22 @@ class GeminiService:
                 'result': result_image,
                 'prompt_key': prompt_key,
                 'execution_time_ms': execution_time_ms,
-                'test_result_key': test_result_key
+                'test_result_key': test_result_key,
+                'encode': encode_metadata
             }
 
         except Exception as e:
             error_msg = str(e)
             execution_time_ms = int((time.time() - start_time) * 1000)
 
-            # Save failure result
+            # Queue failure result
             if save_result and prompt_key:
                 from database.models import TestResultCreate
 
-                await self.test_result_service.create_test_result(
+                await self.test_result_service.enqueue_test_result(
                     TestResultCreate(
                         prompt_key=prompt_key,
-                        input_params=input_params or {},
+                        input_params={**(input_params or {}), 'stage_ms': round_stages(stages)},
                         output_url=None,
                         execution_time_ms=execution_time_ms,
                         token_cnt=None,
@@ -491,7 +863,8 @@ class GeminiService:
         prompt_kind: str,
         images: List[str],
         input_params: Optional[Dict[str, Any]] = None,
-        save_result: bool = True
+        save_result: bool = True,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """
         기본 프롬프트를 사용한 다중 이미지 처리 (DB 연동)
@@ -501,13 +874,15 @@ class GeminiService:
             images: Images list (base64)
             input_params: Additional input parameters to save
             save_result: Whether to save test result to DB
+            use_cache: Whether to use the result cache
 
         Returns:
             Dict: {
                 'result': base64 image,
                 'prompt_key': prompt ID used,
                 'execution_time_ms': processing time,
-                'test_result_key': saved result ID (if save_result=True)
+                'test_result_key': reserved result ID (if save_result=True, written in background),
+                'encode': output encoding metadata (format, bytes, encode_ms)
             }
         """
         start_time = time.time()
@@ -515,35 +890,42 @@ class GeminiService:
         error_msg = None
         result_image = None
 
+        stages: Dict[str, float] = {}
+
         try:
-            # 1. Get default prompt
-            prompt_data = await self.prompt_service.get_default_prompt(prompt_kind)
-            if not prompt_data:
-                raise ValueError(f"No default prompt found for {prompt_kind}")
+            # 스테이지별 소요 시간 (테스트 결과 input_params.stage_ms)
+            with collect_stages() as stages:
+                # 1. Get default prompt
+                with span("prompt_lookup", prompt_kind=prompt_kind):
+                    prompt_data = await self.prompt_service.get_default_prompt(prompt_kind)
+                if not prompt_data:
+                    raise ValueError(f"No default prompt found for {prompt_kind}")
 
-            prompt_key = prompt_data['prompt_key']
-            prompt_text = prompt_data['prompt_text']
+                prompt_key = prompt_data['prompt_key']
+                prompt_text = prompt_data['prompt_text']
 
-            # 2. Increment usage
-            await self.prompt_service.increment_usage(prompt_key)
+                # 2. Increment usage
+                with span("db_write"):
+                    await self.prompt_service.increment_usage(prompt_key)
 
-            # 3. Process images
-            result_image = await self.process_multiple_images(prompt_text, images)
+                # 3. Process images
+                result_image, encode_metadata = await self.process_multiple_images(prompt_text, images, use_cache=use_cache)
 
-            # 4. Mark success
-            await self.prompt_service.increment_success(prompt_key)
+                # 4. Mark success
+                with span("db_write"):
+                    await self.prompt_service.increment_success(prompt_key)
 
             execution_time_ms = int((time.time() - start_time) * 1000)
 
-            # 5. Save test result
+            # 5. Queue test result (written in background)
             test_result_key = None
             if save_result and prompt_key:
                 from database.models import TestResultCreate
 
-                test_result_key = await self.test_result_service.create_test_result(
+                test_result_key = await self.test_result_service.enqueue_test_result(
                     TestResultCreate(
                         prompt_key=prompt_key,
-                        input_params=input_params or {},
+                        input_params={**(input_params or {}), 'stage_ms': round_stages(stages)},
                         output_url=result_image[:100] if result_image else None,
                         execution_time_ms=execution_time_ms,
                         token_cnt=None,
@@ -557,21 +939,22 @@ class GeminiService:
                 'result': result_image,
                 'prompt_key': prompt_key,
                 'execution_time_ms': execution_time_ms,
-                'test_result_key': test_result_key
+                'test_result_key': test_result_key,
+                'encode': encode_metadata
             }
 
         except Exception as e:
             error_msg = str(e)
             execution_time_ms = int((time.time() - start_time) * 1000)
 
-            # Save failure result
+            # Queue failure result
             if save_result and prompt_key:
                 from database.models import TestResultCreate
 
-                await self.test_result_service.create_test_result(
+                await self.test_result_service.enqueue_test_result(
                     TestResultCreate(
                         prompt_key=prompt_key,
-                        input_params=input_params or {},
+                        input_params={**(input_params or {}), 'stage_ms': round_stages(stages)},
                         output_url=None,
                         execution_time_ms=execution_time_ms,
                         token_cnt=None,
@@ -584,5 +967,5 @@ class GeminiService:
             logger.error(f"Process multiple with default prompt failed: {error_msg}")
             raise
 
-# 싱글톤 인스턴스
-gemini_service = GeminiService()
+# 싱글톤 인스턴스 (첫 사용 시 생성)
+gemini_service: GeminiService = LazyService(GeminiService, "gemini_service")
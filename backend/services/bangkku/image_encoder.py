@@ -0,0 +1,277 @@
+"""
+Image Encoder
+처리된 이미지 출력 인코딩 (엔드포인트별 정책 + Accept 협상)
+
+- 투명(알파) 출력: 무손실 WebP 우선
+- 불투명 출력: 품질 지정 JPEG / WebP
+- PNG 압축 레벨, 선택적 최대 변 길이 리사이즈
+- 클라이언트 Accept 헤더의 image/* 선호도로 포맷 선택 (없으면 정책 순서)
+"""
+import os
+import time
+import logging
+from io import BytesIO
+from typing import Optional, Dict, Any, List, Tuple
+
+from PIL import Image
+
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+try:
+    # AVIF 인코더 (선택 의존성, Pillow에 내장되지 않은 경우)
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+FORMAT_MIME_TYPES = {
+    "WEBP": "image/webp",
+    "AVIF": "image/avif",
+    "PNG": "image/png",
+    "JPEG": "image/jpeg"
+}
+
+# 정책 기본값: (알파 출력 포맷 순서, 불투명 출력 포맷 순서)
+# JPEG은 투명도를 지원하지 않으므로 알파 출력에서는 흰 배경으로 합성
+DEFAULT_POLICIES = {
+    "process": (["WEBP", "AVIF", "PNG", "JPEG"], ["JPEG", "WEBP", "AVIF", "PNG"]),
+    "remove_background": (["WEBP", "AVIF", "PNG", "JPEG"], ["WEBP", "AVIF", "PNG", "JPEG"])
+}
+
+
+class EncodePolicy:
+    """엔드포인트별 인코딩 정책 (IMAGE_ENCODE_<NAME>_* 환경변수로 재정의)"""
+
+    def __init__(self, name: str, alpha_formats: List[str], opaque_formats: List[str], supported: List[str]):
+        prefix = f"IMAGE_ENCODE_{name.upper()}_"
+        self.name = name
+        self.alpha_formats = self._formats(os.getenv(prefix + "ALPHA_FORMATS"), alpha_formats, supported)
+        self.opaque_formats = self._formats(os.getenv(prefix + "OPAQUE_FORMATS"), opaque_formats, supported)
+        self.quality = min(100, max(1, int(os.getenv(prefix + "QUALITY", os.getenv("IMAGE_ENCODE_QUALITY", 85)))))
+        self.png_level = min(9, max(0, int(os.getenv(prefix + "PNG_LEVEL", os.getenv("IMAGE_ENCODE_PNG_LEVEL", 6)))))
+        self.max_dimension = max(0, int(os.getenv(prefix + "MAX_DIMENSION", os.getenv("IMAGE_ENCODE_MAX_DIMENSION", 0))))
+
+    @staticmethod
+    def _formats(value: Optional[str], default: List[str], supported: List[str]) -> List[str]:
+        formats = [f.strip().upper() for f in value.split(",")] if value else default
+        formats = [("JPEG" if f == "JPG" else f) for f in formats]
+        # 설치된 인코더만 사용 (PNG는 항상 마지막 대안으로 보장)
+        formats = [f for f in formats if f in supported]
+        return formats or ["PNG"]
+
+    def signature(self) -> Dict[str, Any]:
+        """결과 캐시 키에 들어가는 정책 설정"""
+        return {
+            "alpha": self.alpha_formats,
+            "opaque": self.opaque_formats,
+            "quality": self.quality,
+            "png_level": self.png_level,
+            "max_dimension": self.max_dimension
+        }
+
+
+class ImageEncoder:
+    """정책 기반 이미지 인코더"""
+
+    def __init__(self):
+        """환경변수에서 정책 로드"""
+        Image.init()
+        self.supported = [name for name in FORMAT_MIME_TYPES if name in Image.SAVE]
+        self.webp_method = min(6, max(0, int(os.getenv("IMAGE_ENCODE_WEBP_METHOD", 4))))
+        # 무손실 WebP의 quality는 압축 노력(effort): 가구 컷아웃에서는 0이 80(PIL 기본)보다 작고 3배 빠름
+        self.webp_lossless_effort = min(100, max(0, int(os.getenv("IMAGE_ENCODE_WEBP_LOSSLESS_EFFORT", 0))))
+        self.policies = {
+            name: EncodePolicy(name, alpha, opaque, self.supported)
+            for name, (alpha, opaque) in DEFAULT_POLICIES.items()
+        }
+
+    def get_policy(self, name: str) -> EncodePolicy:
+        policy = self.policies.get(name)
+        if policy is None:
+            raise ValueError(f"Unknown encode policy: {name}")
+        return policy
+
+    # ==================== Negotiation ====================
+
+    @staticmethod
+    def _parse_accept(accept: Optional[str]) -> List[Tuple[str, float]]:
+        """Accept 헤더 → [(미디어 범위, q)]"""
+        ranges = []
+        for item in (accept or "").split(","):
+            parts = [part.strip() for part in item.split(";")]
+            media_range = parts[0].lower()
+            if not media_range:
+                continue
+            q = 1.0
+            for param in parts[1:]:
+                key, _, value = param.partition("=")
+                if key.strip().lower() == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            ranges.append((media_range, q))
+        return ranges
+
+    def negotiate(self, formats: List[str], accept: Optional[str]) -> List[str]:
+        """
+        Accept 선호도에 따라 정책 포맷 순서 재정렬
+
+        Accept에 image/* 관련 범위가 없으면(application/json, */* 등) 정책 순서를 그대로 사용하고,
+        허용되는 포맷이 하나도 없으면 정책 순서로 대체합니다 (406 대신 기본 포맷 응답).
+
+        Args:
+            formats: 정책 포맷 순서
+            accept: Accept 헤더 값
+
+        Returns:
+            우선순위 순 포맷 리스트
+        """
+        ranges = dict(self._parse_accept(accept))
+        if not any(media.startswith("image/") for media in ranges):
+            return list(formats)
+
+        default_q = ranges.get("image/*", ranges.get("*/*", 0.0))
+        scored = []
+        for index, format_name in enumerate(formats):
+            q = ranges.get(FORMAT_MIME_TYPES[format_name], default_q)
+            if q > 0:
+                scored.append((-q, index, format_name))
+
+        if not scored:
+            return list(formats)
+        return [format_name for _, _, format_name in sorted(scored)]
+
+    def cache_token(self, policy_name: str, accept: Optional[str]) -> Dict[str, Any]:
+        """정책 + 협상 결과 (결과 캐시 키 구성용)"""
+        policy = self.get_policy(policy_name)
+        return {
+            **policy.signature(),
+            "alpha": self.negotiate(policy.alpha_formats, accept),
+            "opaque": self.negotiate(policy.opaque_formats, accept)
+        }
+
+    # ==================== Encode ====================
+
+    @staticmethod
+    def has_alpha(image: Image.Image) -> bool:
+        """실제로 투명한 픽셀이 있는지 확인"""
+        if image.mode not in ("RGBA", "LA", "PA"):
+            return image.mode == "P" and "transparency" in image.info
+        return image.getchannel("A").getextrema()[0] < 255
+
+    def encode(
+        self,
+        image: Image.Image,
+        policy_name: str,
+        accept: Optional[str] = None
+    ) -> Tuple[bytes, str, Dict[str, Any]]:
+        """
+        정책과 Accept 협상에 따라 이미지 인코딩
+
+        Args:
+            image: 인코딩할 PIL 이미지
+            policy_name: 엔드포인트 정책 이름 (process / remove_background)
+            accept: 클라이언트 Accept 헤더
+
+        Returns:
+            (이미지 bytes, MIME 타입, 인코딩 메타데이터)
+        """
+        with span("encode", policy=policy_name) as encode_span:
+            data, mime_type, metadata = self._encode(image, self.get_policy(policy_name), accept)
+            encode_span.set_attribute("format", metadata["format"])
+            encode_span.set_attribute("bytes", metadata["bytes"])
+        return data, mime_type, metadata
+
+    def _encode(
+        self,
+        image: Image.Image,
+        policy: EncodePolicy,
+        accept: Optional[str]
+    ) -> Tuple[bytes, str, Dict[str, Any]]:
+        """리사이즈 → 포맷 선택 → 저장 (encode()의 span 안에서 실행)"""
+        started = time.perf_counter()
+
+        original_size = image.size
+        if policy.max_dimension and max(image.size) > policy.max_dimension:
+            image = image.copy()
+            image.thumbnail((policy.max_dimension, policy.max_dimension), Image.LANCZOS)
+
+        alpha = self.has_alpha(image)
+        formats = policy.alpha_formats if alpha else policy.opaque_formats
+        format_name = self.negotiate(formats, accept)[0]
+
+        options: Dict[str, Any] = {}
+        lossless = False
+        if not alpha:
+            image = image if image.mode in ("RGB", "L") else image.convert("RGB")
+        elif format_name == "JPEG":
+            image = self._flatten(image)
+
+        if format_name == "WEBP":
+            lossless = alpha
+            if alpha:
+                options = {"lossless": True, "quality": self.webp_lossless_effort}
+            else:
+                options = {"quality": policy.quality}
+            options["method"] = self.webp_method
+        elif format_name == "AVIF":
+            options = {"quality": policy.quality}
+        elif format_name == "JPEG":
+            options = {"quality": policy.quality, "optimize": True}
+        else:
+            lossless = True
+            options = {"compress_level": policy.png_level}
+
+        buffered = BytesIO()
+        image.save(buffered, format=format_name, **options)
+        data = buffered.getvalue()
+
+        metadata = {
+            "policy": policy.name,
+            "format": format_name.lower(),
+            "mime_type": FORMAT_MIME_TYPES[format_name],
+            "bytes": len(data),
+            "width": image.width,
+            "height": image.height,
+            "alpha": alpha and format_name != "JPEG",
+            "lossless": lossless,
+            "quality": None if lossless else policy.quality,
+            "encode_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+        if image.size != original_size:
+            metadata["resized_from"] = list(original_size)
+        return data, FORMAT_MIME_TYPES[format_name], metadata
+
+    @staticmethod
+    def _flatten(image: Image.Image) -> Image.Image:
+        """알파 채널 제거 (투명 영역은 흰 배경으로 합성)"""
+        if image.mode in ("RGB", "L"):
+            return image
+        if image.mode not in ("RGBA", "LA"):
+            image = image.convert("RGBA")
+        white_bg = Image.new("RGB", image.size, (255, 255, 255))
+        white_bg.paste(image.convert("RGBA"), mask=image.getchannel("A"))
+        return white_bg
+
+    @staticmethod
+    def reused_metadata(data: bytes, mime_type: str, policy_name: str, source: str) -> Dict[str, Any]:
+        """
+        인코딩 없이 반환하는 bytes의 메타데이터
+
+        Args:
+            source: cache (결과 캐시 hit) / original (생성 결과가 없어 입력 이미지 반환)
+        """
+        return {
+            "policy": policy_name,
+            "format": mime_type.split("/")[-1],
+            "mime_type": mime_type,
+            "bytes": len(data),
+            "encode_ms": 0.0,
+            "source": source
+        }
+
+
+# 싱글톤 인스턴스
+image_encoder = ImageEncoder()
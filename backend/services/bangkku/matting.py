@@ -0,0 +1,243 @@
+"""
+Matting Quality
+배경 제거 품질 모드 (fast / balanced / full)
+
+- full: 원본 해상도로 rembg 실행 (기존 동작)
+- fast / balanced: 축소본에서 알파 마스크를 계산하고,
+  Fast Guided Filter(He & Sun, 2015)로 원본 해상도 가이드에 맞춰 경계를 복원하며 업샘플
+- 크롭 영역은 저해상도 마스크 bbox를 원본 좌표로 옮겨 계산 (원본 해상도 전체 스캔 없음)
+"""
+import os
+import math
+from typing import Optional, Dict, Tuple
+
+import numpy as np
+from PIL import Image
+
+MATTING_QUALITIES = ("fast", "balanced", "full")
+
+
+class MattingSettings:
+    """품질 모드별 작업 해상도 / guided filter 설정"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드"""
+        self.default_quality = os.getenv("MATTING_QUALITY", "full").lower()
+        if self.default_quality not in MATTING_QUALITIES:
+            self.default_quality = "full"
+
+        # 마스크 계산 해상도 (긴 변 기준 px)
+        self.max_side: Dict[str, int] = {
+            "fast": max(64, int(os.getenv("MATTING_FAST_MAX_SIDE", 512))),
+            "balanced": max(64, int(os.getenv("MATTING_BALANCED_MAX_SIDE", 1024)))
+        }
+        # guided filter 반경 (저해상도 px 기준)
+        self.radius: Dict[str, int] = {
+            "fast": max(1, int(os.getenv("MATTING_FAST_RADIUS", 2))),
+            "balanced": max(1, int(os.getenv("MATTING_BALANCED_RADIUS", 4)))
+        }
+        self.eps = float(os.getenv("MATTING_GUIDED_EPS", 1e-4))
+
+    def resolve(self, quality: Optional[str]) -> str:
+        """
+        요청 품질 모드 확인 (None이면 기본값)
+
+        Raises:
+            ValueError: 지원하지 않는 품질 모드
+        """
+        if quality is None:
+            return self.default_quality
+        quality = quality.lower()
+        if quality not in MATTING_QUALITIES:
+            raise ValueError(f"Unsupported matting quality: {quality} (expected one of {', '.join(MATTING_QUALITIES)})")
+        return quality
+
+    def working_size(self, size: Tuple[int, int], quality: str) -> Optional[Tuple[int, int]]:
+        """
+        마스크 계산 해상도 (축소가 필요 없으면 None → full 경로)
+
+        Args:
+            size: 원본 (width, height)
+            quality: resolve()된 품질 모드
+        """
+        if quality == "full":
+            return None
+
+        width, height = size
+        scale = self.max_side[quality] / max(width, height)
+        if scale >= 1.0:
+            return None
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+# ==================== Guided Upsampling ====================
+
+def box_filter(array: np.ndarray, radius: int) -> np.ndarray:
+    """(2r+1)x(2r+1) 평균 필터 (누적합, 가장자리는 유효 픽셀 수로 정규화)"""
+    height, width = array.shape
+
+    def _axis_sum(values: np.ndarray, axis: int, length: int) -> np.ndarray:
+        cumulative = np.cumsum(values, axis=axis, dtype=np.float64)
+        pad_shape = list(values.shape)
+        pad_shape[axis] = 1
+        cumulative = np.concatenate([np.zeros(pad_shape), cumulative], axis=axis)
+
+        index = np.arange(length)
+        upper = np.minimum(index + radius + 1, length)
+        lower = np.maximum(index - radius, 0)
+        return np.take(cumulative, upper, axis=axis) - np.take(cumulative, lower, axis=axis)
+
+    summed = _axis_sum(_axis_sum(array, 0, height), 1, width)
+
+    rows = np.minimum(np.arange(height) + radius + 1, height) - np.maximum(np.arange(height) - radius, 0)
+    cols = np.minimum(np.arange(width) + radius + 1, width) - np.maximum(np.arange(width) - radius, 0)
+    return (summed / np.outer(rows, cols)).astype(np.float32)
+
+
+def guided_coefficients(
+    guide: np.ndarray,
+    source: np.ndarray,
+    radius: int,
+    eps: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Guided filter 선형 계수 (q = a * I + b) 계산
+
+    Args:
+        guide: 저해상도 가이드 (그레이스케일, 0-1 float32)
+        source: 저해상도 알파 마스크 (0-1 float32)
+        radius: 윈도우 반경
+        eps: 정규화 항 (클수록 부드러움)
+
+    Returns:
+        (mean_a, mean_b) 저해상도 계수
+    """
+    mean_i = box_filter(guide, radius)
+    mean_p = box_filter(source, radius)
+    cov_ip = box_filter(guide * source, radius) - mean_i * mean_p
+    var_i = box_filter(guide * guide, radius) - mean_i * mean_i
+
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    return box_filter(a, radius), box_filter(b, radius)
+
+
+def map_bbox_to_full(
+    bbox: Optional[Tuple[int, int, int, int]],
+    low_size: Tuple[int, int],
+    full_size: Tuple[int, int]
+) -> Tuple[int, int, int, int]:
+    """
+    저해상도 bbox를 원본 좌표로 변환 (경계 보정을 위해 저해상도 1px 여유 포함)
+
+    Returns:
+        원본 해상도 (left, upper, right, lower), bbox가 없으면 전체 영역
+    """
+    full_width, full_height = full_size
+    if not bbox:
+        return 0, 0, full_width, full_height
+
+    scale_x = full_width / low_size[0]
+    scale_y = full_height / low_size[1]
+    left, upper, right, lower = bbox
+    return (
+        max(0, math.floor((left - 1) * scale_x)),
+        max(0, math.floor((upper - 1) * scale_y)),
+        min(full_width, math.ceil((right + 1) * scale_x)),
+        min(full_height, math.ceil((lower + 1) * scale_y))
+    )
+
+
+def refine_alpha(
+    image: Image.Image,
+    low_image: Image.Image,
+    low_mask: Image.Image,
+    region: Tuple[int, int, int, int],
+    radius: int,
+    eps: float,
+    tile_size: int = 256
+) -> Image.Image:
+    """
+    저해상도 마스크를 원본 해상도 region 크기로 edge-aware 업샘플
+
+    마스크가 주변 2r+1 저해상도 px 안에서 완전 불투명/투명인 타일은 guided filter 결과도
+    상수(255/0)이므로 계산을 생략하고, 경계가 지나가는 타일만 원본 해상도로 계산합니다.
+
+    Args:
+        image: 원본 해상도 이미지
+        low_image: 마스크 계산에 사용한 축소 이미지
+        low_mask: 저해상도 알파 마스크 (L)
+        region: 원본 좌표 크롭 영역 (left, upper, right, lower)
+        radius: guided filter 반경 (저해상도 px)
+        eps: guided filter 정규화 항
+        tile_size: 원본 해상도 타일 크기 (px)
+
+    Returns:
+        region 크기의 알파 마스크 (L)
+    """
+    scale_x = low_image.width / image.width
+    scale_y = low_image.height / image.height
+    margin = 2 * radius + 1
+    left, upper, right, lower = region
+
+    # region 주변 저해상도 영역만 계수 계산 (여유 margin 밖의 값은 region에 영향 없음)
+    low_region = (
+        max(0, math.floor(left * scale_x) - margin - 1),
+        max(0, math.floor(upper * scale_y) - margin - 1),
+        min(low_image.width, math.ceil(right * scale_x) + margin + 1),
+        min(low_image.height, math.ceil(lower * scale_y) + margin + 1)
+    )
+    offset_x, offset_y = low_region[:2]
+
+    guide_low = np.asarray(low_image.crop(low_region).convert("L"), dtype=np.float32) / 255.0
+    mask = np.asarray(low_mask.crop(low_region))
+    mean_a, mean_b = guided_coefficients(guide_low, mask.astype(np.float32) / 255.0, radius, eps)
+
+    # 원본 가이드를 uint8 그대로 쓰도록 계수에 스케일 반영: alpha(0-255) = a * I + b * 255
+    # (+0.5는 uint8 변환 시 반올림)
+    coefficient_a = Image.fromarray(mean_a)
+    coefficient_b = Image.fromarray(mean_b * 255.0 + 0.5)
+    support_mask = Image.fromarray(mask)
+
+    alpha = np.zeros((lower - upper, right - left), dtype=np.uint8)
+
+    for top in range(upper, lower, tile_size):
+        bottom = min(top + tile_size, lower)
+        for start in range(left, right, tile_size):
+            end = min(start + tile_size, right)
+
+            # 타일의 저해상도 좌표 (계수 배열 기준 PIL resize box) 및 주변 마스크 범위
+            low_box = (
+                start * scale_x - offset_x,
+                top * scale_y - offset_y,
+                end * scale_x - offset_x,
+                bottom * scale_y - offset_y
+            )
+            window = mask[
+                max(0, math.floor(low_box[1]) - margin):math.ceil(low_box[3]) + margin,
+                max(0, math.floor(low_box[0]) - margin):math.ceil(low_box[2]) + margin
+            ]
+            target = alpha[top - upper:bottom - upper, start - left:end - left]
+
+            if window.min() == 255:
+                target[:] = 255
+                continue
+            if window.max() == 0:
+                continue
+
+            size = (end - start, bottom - top)
+            tile = np.asarray(coefficient_a.resize(size, Image.BILINEAR, box=low_box)).copy()
+            tile *= np.asarray(image.crop((start, top, end, bottom)).convert("L"))
+            tile += np.asarray(coefficient_b.resize(size, Image.BILINEAR, box=low_box))
+            np.clip(tile, 0.0, 255.0, out=tile)
+            target[:] = tile
+
+            # 저해상도 마스크가 완전 투명인 곳은 투명 유지 (guided filter 번짐으로 bbox가 커지지 않도록)
+            support = np.asarray(support_mask.resize(size, Image.BILINEAR, box=low_box))
+            target[support == 0] = 0
+
+    return Image.fromarray(alpha)
+
+
+# 싱글톤 인스턴스
+matting_settings = MattingSettings()
@@ -0,0 +1,284 @@
+"""
+Prompt Compare Service
+한 장의 이미지에 여러 후보 프롬프트를 동시에 적용하는 비교 실행 (프롬프트 플레이그라운드)
+
+- 입력 이미지는 한 번만 디코딩하여 모든 후보에 같은 bytes 전달
+- 전역 세마포어로 Gemini 동시 호출 수 제한 (여러 비교 요청이 함께 들어와도 공유)
+- 완료되는 순서대로 결과 이벤트 전달, 후보마다 프롬프트에 연결된 테스트 결과 기록
+"""
+import os
+import time
+import uuid
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List, AsyncIterator
+
+from database.models import PromptCreate, TestResultCreate
+from services.bangkku.gemini_service import gemini_service
+from services.prompt_service import PromptService
+from services.test_result_service import TestResultService
+from utils.tracing import span, collect_stages, round_stages
+
+logger = logging.getLogger(__name__)
+
+
+class PromptCompareService:
+    """다중 프롬프트 비교 실행 서비스"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드"""
+        self.max_concurrency = max(1, int(os.getenv("COMPARE_MAX_CONCURRENCY", 4)))
+        self.max_candidates = max(1, int(os.getenv("COMPARE_MAX_PROMPTS", 8)))
+        self.prompt_service = PromptService()
+        self.test_result_service = TestResultService()
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._stats = {
+            "runs": 0,
+            "candidates": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "cancelled": 0
+        }
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    # ==================== Candidates ====================
+
+    async def resolve_candidates(
+        self,
+        prompt_keys: List[int],
+        prompt_texts: List[str],
+        prompt_kind: Optional[str],
+        save_results: bool
+    ) -> List[Dict[str, Any]]:
+        """
+        후보 프롬프트 확인 (스트림 시작 전에 검증)
+
+        - prompt_keys: DB 프롬프트 조회 (prompt_kind가 있으면 일치 여부 확인)
+        - prompt_texts: save_results면 prompt_kind의 비기본 프롬프트로 저장하여 테스트 결과와 연결
+          (같은 prompt_kind / prompt_text의 프롬프트가 이미 있으면 재사용)
+
+        Returns:
+            List[Dict]: [{'prompt_key', 'prompt_text'}] (요청 순서)
+
+        Raises:
+            ValueError: 후보가 없거나 너무 많은 경우, 프롬프트 종류 불일치, prompt_kind 누락
+            LookupError: 존재하지 않는 prompt_key
+        """
+        total = len(prompt_keys) + len(prompt_texts)
+        if total == 0:
+            raise ValueError("At least one prompt key or prompt text is required")
+        if total > self.max_candidates:
+            raise ValueError(f"Too many prompts ({total}), max {self.max_candidates} per comparison")
+        if prompt_texts and save_results and not prompt_kind:
+            raise ValueError("promptKind is required to save results for prompt texts")
+
+        candidates = []
+        with span("prompt_lookup", prompts=len(prompt_keys)):
+            prompts = await asyncio.gather(*[self.prompt_service.get_prompt_by_id(key) for key in prompt_keys])
+        for prompt_key, prompt in zip(prompt_keys, prompts):
+            if not prompt:
+                raise LookupError(f"Prompt {prompt_key} not found")
+            if prompt_kind and prompt['prompt_kind'] != prompt_kind:
+                raise ValueError(f"Prompt {prompt_key} belongs to {prompt['prompt_kind']}, not {prompt_kind}")
+            candidates.append({'prompt_key': prompt_key, 'prompt_text': prompt['prompt_text']})
+
+        for prompt_text in prompt_texts:
+            prompt_key = None
+            if save_results:
+                with span("db_write"):
+                    prompt_key = await self.prompt_service.get_or_create_prompt(PromptCreate(
+                        prompt_kind=prompt_kind,
+                        model_kind="gemini",
+                        prompt_text=prompt_text,
+                        is_default_yn=0
+                    ))
+            candidates.append({'prompt_key': prompt_key, 'prompt_text': prompt_text})
+
+        return candidates
+
+    # ==================== Run ====================
+
+    async def run(
+        self,
+        image_bytes: bytes,
+        candidates: List[Dict[str, Any]],
+        prompt_kind: Optional[str] = None,
+        save_results: bool = True,
+        use_cache: bool = True,
+        matting_quality: Optional[str] = None,
+        accept: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        후보 프롬프트를 동시에 실행하고 완료 순서대로 이벤트 반환
+
+        Args:
+            image_bytes: 디코딩된 입력 이미지 bytes (모든 후보가 공유)
+            candidates: resolve_candidates() 결과
+            prompt_kind: 테스트 결과 input_params에 기록할 프롬프트 종류
+            save_results: 후보별 테스트 결과 기록 여부
+            use_cache: 결과 캐시 사용 여부
+            matting_quality: 배경 제거 품질 모드
+            accept: 출력 포맷 협상용 Accept 헤더
+
+        Yields:
+            {'event': 'start' | 'result' | 'done', 'data': {...}}
+        """
+        compare_id = uuid.uuid4().hex
+        started = time.time()
+        self._stats["runs"] += 1
+        self._stats["candidates"] += len(candidates)
+
+        yield {'event': 'start', 'data': {
+            'compareId': compare_id,
+            'total': len(candidates),
+            'concurrency': self.max_concurrency
+        }}
+
+        tasks = [
+            asyncio.create_task(self._run_candidate(
+                compare_id, index, candidate, image_bytes,
+                prompt_kind, save_results, use_cache, matting_quality, accept
+            ))
+            for index, candidate in enumerate(candidates)
+        ]
+
+        succeeded = 0
+        try:
+            for finished in asyncio.as_completed(tasks):
+                result = await finished
+                succeeded += result['status'] == 'success'
+                yield {'event': 'result', 'data': result}
+        finally:
+            # 클라이언트 연결이 끊기면 남은 후보 취소
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                self._stats["cancelled"] += len(pending)
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        yield {'event': 'done', 'data': {
+            'compareId': compare_id,
+            'succeeded': succeeded,
+            'failed': len(candidates) - succeeded,
+            'elapsedMs': int((time.time() - started) * 1000)
+        }}
+
+    async def _run_candidate(
+        self,
+        compare_id: str,
+        index: int,
+        candidate: Dict[str, Any],
+        image_bytes: bytes,
+        prompt_kind: Optional[str],
+        save_results: bool,
+        use_cache: bool,
+        matting_quality: Optional[str],
+        accept: Optional[str]
+    ) -> Dict[str, Any]:
+        """후보 하나 실행 (세마포어 내) → 결과 이벤트 데이터"""
+        prompt_key = candidate['prompt_key']
+        input_params = {
+            'compare_id': compare_id,
+            'candidate_index': index,
+            'prompt_kind': prompt_kind,
+            'matting_quality': matting_quality
+        }
+
+        async with self.semaphore:
+            self._in_flight += 1
+            start_time = time.time()
+            stages: Dict[str, float] = {}
+            try:
+                # 후보별 스테이지 소요 시간 (동시에 실행되는 다른 후보와 분리해서 수집)
+                with collect_stages() as stages:
+                    if prompt_key:
+                        with span("db_write"):
+                            await self.prompt_service.increment_usage(prompt_key)
+
+                    result_bytes, mime_type, metadata = await gemini_service.process_single_image_bytes(
+                        candidate['prompt_text'],
+                        image_bytes,
+                        use_cache=use_cache,
+                        matting_quality=matting_quality,
+                        accept=accept
+                    )
+                    result_image = gemini_service.encode_data_url(result_bytes, mime_type)
+
+                    if prompt_key:
+                        with span("db_write"):
+                            await self.prompt_service.increment_success(prompt_key)
+                execution_time_ms = int((time.time() - start_time) * 1000)
+
+                # 큐에 넣기만 하므로 별도 스테이지로 기록하지 않음 (stage_ms는 위에서 수집 완료)
+                test_result_key = None
+                if save_results and prompt_key:
+                    test_result_key = await self.test_result_service.enqueue_test_result(TestResultCreate(
+                        prompt_key=prompt_key,
+                        input_params={**input_params, 'stage_ms': round_stages(stages)},
+                        output_url=result_image[:100],
+                        execution_time_ms=execution_time_ms,
+                        success_yn=1
+                    ))
+
+                self._stats["succeeded"] += 1
+                return {
+                    'index': index,
+                    'promptKey': prompt_key,
+                    'status': 'success',
+                    'result': result_image,
+                    'metadata': metadata,
+                    'executionTimeMs': execution_time_ms,
+                    'stageMs': round_stages(stages),
+                    'testResultKey': test_result_key
+                }
+
+            except Exception as e:
+                execution_time_ms = int((time.time() - start_time) * 1000)
+                logger.warning(f"Prompt compare candidate {index} (prompt {prompt_key}) failed: {str(e)}")
+
+                test_result_key = None
+                if save_results and prompt_key:
+                    test_result_key = await self.test_result_service.enqueue_test_result(TestResultCreate(
+                        prompt_key=prompt_key,
+                        input_params={**input_params, 'stage_ms': round_stages(stages)},
+                        execution_time_ms=execution_time_ms,
+                        success_yn=0,
+                        error_msg=str(e)
+                    ))
+
+                self._stats["failed"] += 1
+                return {
+                    'index': index,
+                    'promptKey': prompt_key,
+                    'status': 'failed',
+                    'error': str(e),
+                    'executionTimeMs': execution_time_ms,
+                    'stageMs': round_stages(stages),
+                    'testResultKey': test_result_key
+                }
+
+            finally:
+                self._in_flight -= 1
+
+    # ==================== Stats ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """비교 실행 카운터 및 세마포어 상태"""
+        return {
+            **self._stats,
+            "max_concurrency": self.max_concurrency,
+            "max_prompts": self.max_candidates,
+            "in_flight": self._in_flight
+        }
+
+
+# 싱글톤 인스턴스
+prompt_compare_service = PromptCompareService()
@@ -0,0 +1,305 @@
+"""
+Image Result Cache
+Gemini 이미지 변환 결과 캐시 (content-addressed)
+
+- 키: (모델, 프롬프트, 생성 설정, 입력 이미지 bytes) 해시
+- 저장소: 용량 제한 디스크 LRU + 선택적 메모리 LRU 티어
+- hit/miss/eviction 카운터 제공
+- 캐시 디렉터리 오류(권한, 디스크 등)는 로그만 남기고 miss로 처리 (요청은 실패하지 않음)
+- 디스크 인덱스는 프로세스마다 따로 유지하므로, GEMINI_CACHE_RESCAN_SECONDS마다 디렉터리를 다시 읽어
+  다른 워커 프로세스가 쓴 파일까지 포함해 용량 상한 적용 (그 사이에는 일시적으로 상한을 넘을 수 있음)
+"""
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# 기본 디스크 캐시 경로 (backend/cache/gemini_results)
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "gemini_results"
+
+
+class ImageResultCache:
+    """디스크 LRU + 메모리 LRU 2단 이미지 결과 캐시"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드 (디스크 인덱스는 첫 사용 시 로드)"""
+        self.enabled = os.getenv("GEMINI_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.cache_dir = Path(os.getenv("GEMINI_CACHE_DIR", str(DEFAULT_CACHE_DIR)))
+        self.max_disk_bytes = int(float(os.getenv("GEMINI_CACHE_MAX_MB", 512)) * MB)
+        self.max_memory_bytes = int(float(os.getenv("GEMINI_CACHE_MEMORY_MB", 64)) * MB)
+        self.rescan_seconds = float(os.getenv("GEMINI_CACHE_RESCAN_SECONDS", 60))
+
+        # 메모리 티어: key -> (bytes, mime_type)
+        self._memory: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._memory_bytes = 0
+
+        # 디스크 인덱스: key -> 파일 크기 (LRU 순서)
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._disk_loaded = False
+        self._disk_loaded_at = 0.0
+        self._load_lock = asyncio.Lock()
+
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "bypassed": 0,
+            "errors": 0
+        }
+
+    # ==================== Key ====================
+
+    def make_key(
+        self,
+        model: str,
+        prompt: str,
+        config: Dict[str, Any],
+        images: List[bytes],
+        extra: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        캐시 키 생성
+
+        Args:
+            model: Gemini 모델명
+            prompt: 프롬프트 텍스트
+            config: 생성 설정 (temperature 등)
+            images: 정규화된 입력 이미지 bytes (data URL 헤더 제거 후 디코딩된 원본)
+            extra: 결과에 영향을 주는 후처리 설정 (배경 제거 모델 등)
+
+        Returns:
+            sha256 hex digest
+        """
+        header = json.dumps(
+            {"model": model, "prompt": prompt, "config": config, "extra": extra or {}},
+            sort_keys=True,
+            ensure_ascii=False
+        ).encode("utf-8")
+
+        digest = hashlib.sha256()
+        digest.update(len(header).to_bytes(8, "big"))
+        digest.update(header)
+        for image_bytes in images:
+            digest.update(len(image_bytes).to_bytes(8, "big"))
+            digest.update(hashlib.sha256(image_bytes).digest())
+        return digest.hexdigest()
+
+    # ==================== Get / Put ====================
+
+    async def get(self, key: str) -> Optional[Tuple[bytes, str]]:
+        """
+        캐시 조회 (메모리 → 디스크)
+
+        Returns:
+            (이미지 bytes, MIME 타입) 또는 None
+        """
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            self._stats["memory_hits"] += 1
+            return cached
+
+        try:
+            await self._ensure_disk_index()
+            # 인덱스에 없어도 다른 워커 프로세스가 쓴 파일일 수 있으므로 파일을 직접 확인
+            cached = await asyncio.to_thread(self._read_file, key)
+            if cached is not None:
+                if key not in self._disk_index:
+                    self._disk_index[key] = len(cached[0])
+                    self._disk_bytes += len(cached[0])
+                self._disk_index.move_to_end(key)
+                self._stats["disk_hits"] += 1
+                self._put_memory(key, cached)
+                return cached
+
+            # 파일이 사라진 경우 인덱스에서 제거
+            self._disk_bytes -= self._disk_index.pop(key, 0)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Result cache read failed, treating as miss: {str(e)}")
+
+        self._stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, data: bytes, mime_type: str) -> None:
+        """캐시 저장 (메모리 + 디스크)"""
+        self._put_memory(key, (data, mime_type))
+
+        size = len(data)
+        if size > self.max_disk_bytes:
+            return
+
+        try:
+            await self._ensure_disk_index()
+            await asyncio.to_thread(self._write_file, key, data, mime_type)
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Result cache write failed: {str(e)}")
+            return
+
+        self._disk_bytes -= self._disk_index.pop(key, 0)
+        self._disk_index[key] = size
+        self._disk_bytes += size
+        self._stats["stores"] += 1
+
+        evicted = []
+        while self._disk_bytes > self.max_disk_bytes and self._disk_index:
+            old_key, old_size = self._disk_index.popitem(last=False)
+            self._disk_bytes -= old_size
+            evicted.append(old_key)
+
+        if evicted:
+            self._stats["disk_evictions"] += len(evicted)
+            await asyncio.to_thread(self._delete_files, evicted)
+
+        if time.monotonic() - self._disk_loaded_at >= self.rescan_seconds:
+            await self._rescan_disk()
+
+    def record_bypass(self) -> None:
+        """캐시 우회 요청 기록 (A/B 테스트 등)"""
+        self._stats["bypassed"] += 1
+
+    # ==================== Memory Tier ====================
+
+    def _put_memory(self, key: str, value: Tuple[bytes, str]) -> None:
+        """메모리 티어 저장 (용량 초과 시 LRU 제거)"""
+        size = len(value[0])
+        if self.max_memory_bytes <= 0 or size > self.max_memory_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous[0])
+
+        self._memory[key] = value
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, (old_data, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_data)
+            self._stats["memory_evictions"] += 1
+
+    # ==================== Disk Tier ====================
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.bin"
+
+    async def _ensure_disk_index(self) -> None:
+        """디스크 인덱스 로드 (수정 시각 순으로 LRU 복원, 실패하면 다음 호출에서 재시도)"""
+        if self._disk_loaded:
+            return
+
+        async with self._load_lock:
+            if self._disk_loaded:
+                return
+
+            entries = await asyncio.to_thread(self._scan_dir)
+            self._set_disk_index(entries)
+            self._disk_loaded = True
+            logger.info(f"Result cache index loaded: {len(entries)} entries, {self._disk_bytes} bytes")
+
+    async def _rescan_disk(self) -> None:
+        """디렉터리 기준으로 인덱스를 다시 만들고 전체 용량 상한 적용 (다른 프로세스가 쓴 파일 포함)"""
+        try:
+            entries = await asyncio.to_thread(self._scan_dir)
+        except OSError as e:
+            self._stats["errors"] += 1
+            logger.warning(f"Result cache rescan failed: {str(e)}")
+            return
+        self._set_disk_index(entries)
+
+        evicted = []
+        while self._disk_bytes > self.max_disk_bytes and self._disk_index:
+            old_key, old_size = self._disk_index.popitem(last=False)
+            self._disk_bytes -= old_size
+            evicted.append(old_key)
+        if evicted:
+            self._stats["disk_evictions"] += len(evicted)
+            await asyncio.to_thread(self._delete_files, evicted)
+
+    def _set_disk_index(self, entries: List[Tuple[str, int]]) -> None:
+        self._disk_index = OrderedDict(entries)
+        self._disk_bytes = sum(size for _, size in entries)
+        self._disk_loaded_at = time.monotonic()
+
+    def _scan_dir(self) -> List[Tuple[str, int]]:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.cache_dir.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        entries.sort()
+        return [(key, size) for _, key, size in entries]
+
+    def _read_file(self, key: str) -> Optional[Tuple[bytes, str]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                mime_type = f.readline().decode("ascii").strip()
+                data = f.read()
+            # LRU 순서를 재시작 후에도 유지하기 위해 수정 시각 갱신
+            os.utime(path)
+            return data, mime_type
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def _write_file(self, key: str, data: bytes, mime_type: str) -> None:
+        # 여러 워커 프로세스가 같은 키를 동시에 써도 서로 덮어쓰지 않도록 고유한 임시 파일 사용
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{key[:16]}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(mime_type.encode("ascii") + b"\n")
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _delete_files(self, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    # ==================== Stats ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 카운터 및 사용량 반환"""
+        hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "max_memory_bytes": self.max_memory_bytes,
+            "disk_entries": len(self._disk_index),
+            "disk_bytes": self._disk_bytes,
+            "max_disk_bytes": self.max_disk_bytes
+        }
+
+
+# 싱글톤 인스턴스
+result_cache = ImageResultCache()
@@ -0,0 +1,91 @@
+"""
+Single Flight
+동일한 이미지 작업이 동시에 들어오면 하나만 실행하고 결과를 공유 (요청 병합)
+
+- 키: 엔드포인트 + 입력 내용 해시 (프롬프트, 이미지 bytes, 후처리/인코딩 설정)
+- 첫 요청(leader)이 작업을 별도 태스크로 실행하고, 같은 키의 후속 요청은 같은 future를 대기
+- 대기 중인 요청이 모두 취소되면(연결 끊김) 작업도 취소
+- 완료 즉시 키 제거 (결과 보관은 result_cache 담당)
+"""
+import asyncio
+import logging
+from typing import Dict, Any, Callable, Awaitable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Flight:
+    """진행 중인 작업 하나와 대기자 수"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """진행 중 작업 병합기"""
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self._stats = {
+            "executed": 0,
+            "coalesced": 0,
+            "cancelled": 0
+        }
+        self._coalesced_by_endpoint: Dict[str, int] = {}
+
+    async def run(self, endpoint: str, key: str, work: Callable[[], Awaitable[T]]) -> T:
+        """
+        같은 (endpoint, key) 작업이 진행 중이면 그 결과를 기다리고, 아니면 새로 실행
+
+        Args:
+            endpoint: 작업 종류 (process / remove_background 등, 메트릭 구분용)
+            key: 입력 내용 해시
+            work: 작업 coroutine을 만드는 함수 (leader만 호출)
+
+        Returns:
+            작업 결과 (병합된 요청도 같은 객체를 받으므로 호출자가 변경하지 않아야 함)
+        """
+        flight_key = f"{endpoint}:{key}"
+        flight = self._flights.get(flight_key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(work()))
+            self._flights[flight_key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(flight_key, flight))
+            self._stats["executed"] += 1
+        else:
+            self._stats["coalesced"] += 1
+            self._coalesced_by_endpoint[endpoint] = self._coalesced_by_endpoint.get(endpoint, 0) + 1
+            logger.info(f"Coalesced identical in-flight {endpoint} request ({flight.waiters} already waiting)")
+
+        flight.waiters += 1
+        try:
+            # 한 대기자의 취소가 공유 작업을 취소하지 않도록 shield
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+                self._stats["cancelled"] += 1
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, flight_key: str, flight: _Flight) -> None:
+        """완료된 작업 제거 (같은 키로 새 작업이 등록된 경우는 유지)"""
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """실행/병합 카운터 및 진행 중 작업 수"""
+        return {
+            **self._stats,
+            "coalesced_by_endpoint": dict(self._coalesced_by_endpoint),
+            "in_flight": len(self._flights),
+            "waiters": sum(flight.waiters for flight in self._flights.values())
+        }
+
+
+# 싱글톤 인스턴스
+single_flight = SingleFlight()
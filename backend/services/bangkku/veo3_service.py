@@ -4,14 +4,17 @@ Google Veo 3.1을 사용한 비디오 생성 서비스
 """
 import os
 import base64
-import asyncio
 import logging
 import re
-from typing import Optional, Callable
-from google import genai
-from google.genai import types
-from utils.timer import Timer
+from typing import Optional, Callable, AsyncIterator, TYPE_CHECKING
 
+import httpx
+
+from services.bangkku.api_governor import api_governor
+from services.lazy_service import LazyService
+
+if TYPE_CHECKING:
+    from google.genai import types
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +28,16 @@ class Veo3Service:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY environment variable is required")
 
+        # google-genai는 import 비용이 커서 서비스 생성 시점에 로드
+        from google import genai
+
+        self.api_key = api_key
         self.client = genai.Client(api_key=api_key)
         self.model = "veo-3.1-generate-preview"
+        # 생성 요청과 operation 폴링은 한도를 따로 관리 (폴링이 생성 요청 한도를 소모하지 않도록)
+        self.operations_model = f"{self.model}:operations"
+        api_governor.configure_model(self.model, "VEO", rate_per_minute=10, burst=2, max_in_flight=4)
+        api_governor.configure_model(self.operations_model, "VEO_OPERATIONS", rate_per_minute=120, burst=10, max_in_flight=8)
 
     def base64_to_image(self, base64_string: str):
         """
@@ -35,6 +46,7 @@ class Veo3Service:
         - MIME 타입 자동 감지
         - padding 보정 처리
         """
+        from google.genai import types
 
         try:
             # 1️⃣ 헤더 제거
@@ -231,169 +243,149 @@ class Veo3Service:
     #         logger.error(f"Veo3 video generation failed: {str(e)}")
     #         raise
 
-    async def generate_video(
-            self,
-            prompt: str,
-            image: Optional[str] = None,
-            last_frame: Optional[str] = None,
-            progress_callback: Optional[Callable[[int, str], None]] = None
-        ) -> dict:
-            """
-            Veo3 비디오 생성 (디버깅 강화 버전)
-            """
-            timer = Timer()
-            timer.start()
+    async def start_generation(
+        self,
+        prompt: str,
+        image: str,
+        last_frame: Optional[str] = None
+    ) -> "types.GenerateVideosOperation":
+        """
+        비디오 생성 작업 시작 (비동기 클라이언트, 폴링은 하지 않음)
 
-            try:
-                logger.info("=" * 80)
-                logger.info("🎬 [Veo3] generate_video() invoked")
-                logger.info(f"Prompt preview: {prompt[:200].replace(chr(10), ' ')}")
-                logger.info(f"Image received? {'✅ yes' if image else '❌ no'}")
-                logger.info(f"Last frame received? {'✅ yes' if last_frame else '❌ no'}")
-
-                # 진행률 업데이트
-                if progress_callback:
-                    await progress_callback(5, "이미지 변환 중...")
-
-                # Base64 → Blob 변환
-                try:
-                    first_image = self.base64_to_image(image) if image else None
-                    if first_image:
-                        logger.info(f"✅ First frame image converted to blob ({type(first_image)})")
-                    else:
-                        logger.error("❌ Image conversion failed — first_image is None")
-                except Exception as e:
-                    logger.exception(f"⚠️ Image conversion exception: {str(e)}")
-                    raise ValueError("Image conversion failed")
-
-                # 마지막 프레임
-                last_image = None
-                if last_frame:
-                    try:
-                        last_image = self.base64_to_image(last_frame)
-                        logger.info(f"✅ Last frame converted successfully ({type(last_image)})")
-                    except Exception as e:
-                        logger.warning(f"⚠️ Last frame conversion failed: {e}")
-
-                if not first_image:
-                    raise ValueError("First image is required for video generation")
-
-                if progress_callback:
-                    await progress_callback(15, "비디오 생성 요청 중...")
-
-                logger.info(f"🧠 Model: {self.model}")
-                logger.info(f"Prompt length: {len(prompt)} chars")
-
-                # 모델 호출
-                try:
-                    if last_image:
-                        logger.info("⛓ Using last frame for interpolation (GenerateVideosConfig)")
-                        operation = self.client.models.generate_videos(
-                            model=self.model,
-                            prompt=prompt,
-                            image=first_image,
-                            config=types.GenerateVideosConfig(last_frame=last_image)
-                        )
-                    else:
-                        logger.info("🚀 Calling client.models.generate_videos() (no last frame)")
-                        operation = self.client.models.generate_videos(
-                            model=self.model,
-                            prompt=prompt,
-                            image=first_image
-                        )
-
-                    logger.info(f"✅ Operation started: {operation.name}")
-                except Exception as e:
-                    logger.exception(f"❌ generate_videos() call failed: {str(e)}")
-                    raise
-
-                # 폴링 (10초 간격)
-                poll_count = 0
-                max_polls = 60
-                logger.info("⏳ Polling operation status...")
-                while not operation.done and poll_count < max_polls:
-                    poll_count += 1
-                    percent = min(15 + (poll_count * 75 // max_polls), 90)
-                    if progress_callback:
-                        await progress_callback(percent, f"비디오 생성 중... ({percent}%)")
-
-                    logger.info(f"🌀 Poll {poll_count}/{max_polls} - done={operation.done}")
-                    await asyncio.sleep(10)
-
-                    try:
-                        operation = self.client.operations.get(operation)
-                    except Exception as e:
-                        logger.warning(f"⚠️ Operation polling error: {str(e)}")
-                        continue
-
-                if not operation.done:
-                    logger.error("⏰ Timeout: Video generation took too long")
-                    raise TimeoutError("Video generation timeout - exceeded maximum polling time")
-
-                logger.info("✅ Operation completed, fetching response...")
-
-                # 응답 점검
-                if not operation.response:
-                    logger.error("❌ operation.response is None or empty")
-                    logger.debug(f"🔍 Full operation dump: {operation}")
-                    raise ValueError("No operation.response returned from model")
-
-                # generated_videos 유무 확인
-                generated = getattr(operation.response, "generated_videos", None)
-                if not generated:
-                    logger.error("❌ operation.response.generated_videos is EMPTY or None")
-                    logger.debug(f"🔍 operation.response structure: {operation.response}")
-                    raise ValueError("No video generated in response")
-
-                logger.info(f"✅ {len(generated)} video(s) generated")
-
-                # 결과 추출
-                video = generated[0]
-                if hasattr(video.video, "bytes_base64_encoded"):
-                    video_base64 = video.video.bytes_base64_encoded
-                    logger.info("🎞 Retrieved video as base64 (new SDK format)")
-                elif hasattr(video.video, "video_bytes"):
-                    logger.info("📦 Downloading raw video bytes (old SDK format)")
-                    self.client.files.download(file=video.video)
-                    video_bytes = video.video.video_bytes
-                    video_base64 = base64.b64encode(video_bytes).decode("utf-8")
-                else:
-                    logger.warning("⚠️ Unknown video format — attempting manual download")
-                    self.client.files.download(file=video.video)
-                    video_bytes = video.video.video_bytes
-                    video_base64 = base64.b64encode(video_bytes).decode("utf-8")
-
-                video_data_url = f"data:video/mp4;base64,{video_base64}"
-                logger.info(f"📤 Video ready for return ({len(video_base64)} chars)")
-
-                # 썸네일 및 메타데이터
-                thumbnail_url = image
-                total_time = timer.stop()
-
-                metadata = {
-                    "model": self.model,
-                    "prompt": prompt[:200],
-                    "generation_time": total_time,
-                    "poll_count": poll_count,
-                    "has_last_frame": last_frame is not None
-                }
-
-                logger.info(f"🎉 Veo3 video generation completed in {total_time:.2f}s")
-                logger.info("=" * 80)
-
-                if progress_callback:
-                    await progress_callback(100, "완료!")
-
-                return {
-                    "video_url": video_data_url,
-                    "thumbnail_url": thumbnail_url,
-                    "duration": 10.0,
-                    "metadata": metadata
-                }
+        Args:
+            prompt: 비디오 생성 프롬프트
+            image: 첫 프레임 이미지 (base64)
+            last_frame: 마지막 프레임 이미지 (base64, optional)
+
+        Returns:
+            시작된 long-running operation
+        """
+        first_image = self.base64_to_image(image) if image else None
+        if not first_image:
+            raise ValueError("First image is required for video generation")
 
+        # 마지막 프레임 (변환 실패 시 없이 진행)
+        last_image = None
+        if last_frame:
+            try:
+                last_image = self.base64_to_image(last_frame)
             except Exception as e:
-                logger.exception(f"💥 Veo3 video generation failed: {str(e)}")
-                raise
+                logger.warning(f"⚠️ Last frame conversion failed: {e}")
+
+        from google.genai import types
+
+        config = types.GenerateVideosConfig(last_frame=last_image) if last_image else None
+
+        logger.info(f"🚀 Veo3 generation requested: model={self.model}, prompt length={len(prompt)}")
+        # 생성 요청은 비멱등 → 429만 재시도 (5xx 재시도 시 중복 생성 방지)
+        operation = await api_governor.call(
+            self.model,
+            self.api_key,
+            lambda: self.client.aio.models.generate_videos(
+                model=self.model,
+                prompt=prompt,
+                image=first_image,
+                config=config
+            ),
+            idempotent=False
+        )
+        logger.info(f"✅ Operation started: {operation.name}")
+        return operation
+
+    def operation_from_name(self, operation_name: str) -> "types.GenerateVideosOperation":
+        """저장된 operation 이름으로 operation 객체 복원 (재시작 후 폴링 재개용)"""
+        from google.genai import types
+
+        return types.GenerateVideosOperation(name=operation_name)
+
+    async def refresh_operation(
+        self,
+        operation: "types.GenerateVideosOperation"
+    ) -> "types.GenerateVideosOperation":
+        """operation 상태 조회 (비동기 클라이언트)"""
+        return await api_governor.call(
+            self.operations_model,
+            self.api_key,
+            lambda: self.client.aio.operations.get(operation)
+        )
+
+    def extract_video(self, operation: "types.GenerateVideosOperation") -> "types.Video":
+        """
+        완료된 operation에서 생성된 비디오 추출
+
+        Raises:
+            ValueError: 응답에 비디오가 없는 경우
+        """
+        if operation.error:
+            raise ValueError(f"Video generation failed: {operation.error}")
+
+        if not operation.response:
+            logger.error("❌ operation.response is None or empty")
+            raise ValueError("No operation.response returned from model")
+
+        generated = getattr(operation.response, "generated_videos", None)
+        if not generated:
+            logger.error("❌ operation.response.generated_videos is EMPTY or None")
+            raise ValueError("No video generated in response")
+
+        logger.info(f"✅ {len(generated)} video(s) generated")
+        return generated[0].video
+
+    async def stream_video(
+        self,
+        video: "types.Video",
+        chunk_size: int = 256 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        생성된 비디오를 청크 단위로 다운로드
+        전체 파일을 메모리에 올리지 않도록 video.uri를 스트리밍으로 읽습니다.
+        """
+        if video.video_bytes:
+            for offset in range(0, len(video.video_bytes), chunk_size):
+                yield video.video_bytes[offset:offset + chunk_size]
+            return
+
+        if not video.uri:
+            raise Exception("Generated video has neither bytes nor uri")
+
+        async with httpx.AsyncClient(follow_redirects=True, timeout=httpx.Timeout(60.0)) as client:
+            async with client.stream("GET", video.uri, headers={"x-goog-api-key": self.api_key}) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(chunk_size):
+                    yield chunk
+
+    async def generate_video(
+        self,
+        prompt: str,
+        image: Optional[str] = None,
+        last_frame: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, str], None]] = None
+    ) -> dict:
+        """
+        Veo3 비디오 생성 (작업 제출 후 완료까지 대기)
+        작업 상태는 video_job_manager가 관리하므로 호출자가 중단돼도 작업은 계속 진행됩니다.
+
+        Returns:
+            {
+                "video_url": "...",
+                "thumbnail_url": "...",
+                "duration": 10.0,
+                "metadata": {...}
+            }
+        """
+        from services.bangkku.video_job_service import video_job_manager
+
+        job_key = await video_job_manager.submit(prompt, image, last_frame)
+
+        async for job in video_job_manager.watch(job_key):
+            if job["status"] == "completed":
+                return job["result"]
+            if job["status"] == "failed":
+                raise RuntimeError(job["error"] or "Video generation failed")
+            if progress_callback:
+                await progress_callback(job["percent"], job["message"])
+
+        raise RuntimeError(f"Video job {job_key} not found")
 
 
     async def generate_showroom_video(
@@ -431,6 +423,6 @@ class Veo3Service:
 
 
 
-# 싱글톤 인스턴스
-veo3_service = Veo3Service()
+# 싱글톤 인스턴스 (첫 사용 시 생성)
+veo3_service: Veo3Service = LazyService(Veo3Service, "veo3_service")
 
@@ -0,0 +1,486 @@
+"""
+Video Job Service
+Veo3 비디오 생성 작업 관리
+
+- 작업 제출 시 job key 반환 (video_jobs 테이블에 영속화)
+- 단일 백그라운드 폴러가 진행 중인 모든 operation을 비동기 클라이언트로 일괄 조회
+- WebSocket 재연결/HTTP 폴링으로 작업 상태 조회
+- 서버 재시작 시 진행 중 작업을 DB에서 복구하여 폴링 재개
+- 워커 프로세스가 여러 개면 작업별 리스(owner_id / lease_until)를 가진 워커만 폴링,
+  리스가 만료된 작업(중단된 워커)은 다른 워커가 인수
+"""
+import os
+import time
+import uuid
+import socket
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from typing import Optional, Dict, Any, AsyncIterator, List, TYPE_CHECKING
+
+from repos.video_job_repo import VideoJobRepository
+from services.bangkku.veo3_service import veo3_service
+from services.bangkku.api_governor import api_governor
+from services.bangkku.video_store import video_store
+
+if TYPE_CHECKING:
+    from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class VideoJobManager:
+    """Veo3 비디오 생성 작업 관리자"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드"""
+        self.repo = VideoJobRepository()
+        self.poll_interval = float(os.getenv("VEO_POLL_INTERVAL", 10))
+        self.max_wait_seconds = float(os.getenv("VEO_MAX_WAIT_SECONDS", 600))
+        self.max_cached_results = int(os.getenv("VEO_RESULT_CACHE_SIZE", 4))
+        self.lease_seconds = float(os.getenv("VEO_JOB_LEASE_SECONDS", 120))
+        # 리스 만료 전에 여러 번 갱신
+        self.claim_interval = max(1.0, self.lease_seconds / 3)
+
+        # 작업 소유 워커 ID (프로세스마다 고유)
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        # 진행 중 작업: job_key -> operation / 요청 정보 / 공개 상태
+        self._operations: Dict[int, "types.GenerateVideosOperation"] = {}
+        self._job_info: Dict[int, Dict[str, Any]] = {}
+        self._jobs: Dict[int, Dict[str, Any]] = {}
+
+        # 완료된 작업 결과 (최근 N개만 메모리에 유지)
+        self._results: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+        # 상태 변경 알림 (watch 대기자 깨우기) / 작업별 watch 수 (마지막 watcher가 끝나면 이벤트 제거)
+        self._events: Dict[int, asyncio.Event] = {}
+        self._watchers: Dict[int, int] = {}
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._poller: Optional[asyncio.Task] = None
+
+    # ==================== Lifecycle ====================
+
+    async def start(self) -> None:
+        """
+        폴러 시작 (진행 중 작업 복구는 폴러가 백그라운드에서 수행)
+
+        DB가 내려가 있어도 앱 시작을 막지 않고, 다음 claim 주기에 다시 시도합니다.
+        """
+        self._ensure_poller()
+
+    async def stop(self) -> None:
+        """폴러 중지 (진행 중 작업은 리스를 반납해 다른 워커 / 재시작 시 바로 인수)"""
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+
+        if self._operations:
+            try:
+                await self.repo.release_owned(self.owner_id)
+            except Exception as e:
+                logger.warning(f"Failed to release video job leases: {str(e)}")
+
+    def _ensure_poller(self) -> None:
+        if self._poller is None or self._poller.done():
+            self._wakeup = asyncio.Event()
+            self._poller = asyncio.create_task(self._poll_loop())
+        if self._operations:
+            self._wakeup.set()
+
+    # ==================== Submit / Query ====================
+
+    async def submit(
+        self,
+        prompt: str,
+        image: str,
+        last_frame: Optional[str] = None
+    ) -> int:
+        """
+        비디오 생성 작업 제출
+
+        Args:
+            prompt: 비디오 생성 프롬프트
+            image: 첫 프레임 이미지 (base64)
+            last_frame: 마지막 프레임 이미지 (base64, optional)
+
+        Returns:
+            int: video_job_key
+        """
+        if not prompt or not image:
+            raise ValueError("prompt and image are required")
+
+        job_key = await self.repo.create({
+            'model_kind': veo3_service.model,
+            'prompt_text': prompt,
+            'has_last_frame_yn': 1 if last_frame else 0,
+            'status_kind': 'pending',
+            'progress_pct': 5,
+            'owner_id': self.owner_id,
+            'lease_until': datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)
+        })
+        self._job_info[job_key] = {
+            'prompt': prompt,
+            'has_last_frame': last_frame is not None,
+            'started_at': time.time(),
+            'poll_count': 0,
+            'thumbnail_url': image
+        }
+        self._set_job(job_key, status='pending', percent=5, message="비디오 생성 요청 중...")
+
+        try:
+            with api_governor.track() as calls:
+                operation = await veo3_service.start_generation(prompt, image, last_frame)
+        except Exception as e:
+            await self._fail(job_key, str(e))
+            raise
+        self._job_info[job_key]['governor'] = api_governor.summarize(calls)
+
+        self._operations[job_key] = operation
+        await self._persist(job_key, {
+            'operation_name': operation.name,
+            'status_kind': 'running',
+            'progress_pct': 15
+        })
+        self._set_job(job_key, status='running', percent=15, message="비디오 생성 중... (15%)")
+        self._ensure_poller()
+
+        logger.info(f"Video job {job_key} submitted: {operation.name}")
+        return job_key
+
+    async def get_job(self, job_key: int) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태 조회
+
+        Returns:
+            {
+                "jobKey": 1,
+                "status": "pending|running|completed|failed",
+                "percent": 45,
+                "message": "...",
+                "result": {...} | None,
+                "error": "..." | None
+            }
+        """
+        job = self._jobs.get(job_key)
+        if job is not None:
+            return dict(job)
+
+        row = await self.repo.get_by_id(job_key)
+        if not row:
+            return None
+
+        job = self._row_to_job(row)
+        if job['status'] == 'completed':
+            job['result'] = await self._load_result(job_key, row)
+        return job
+
+    async def watch(self, job_key: int) -> AsyncIterator[Dict[str, Any]]:
+        """
+        작업 상태 변경 스트림 (종료 상태가 되면 끝남)
+        다른 워커 프로세스가 처리 중인 작업도 poll_interval마다 DB에서 다시 읽습니다.
+        """
+        last_job = None
+        self._watchers[job_key] = self._watchers.get(job_key, 0) + 1
+        try:
+            while True:
+                event = self._events.setdefault(job_key, asyncio.Event())
+                job = await self.get_job(job_key)
+                if job is None:
+                    return
+
+                if job != last_job:
+                    yield job
+                    last_job = job
+                if job['status'] in TERMINAL_STATUSES:
+                    return
+
+                try:
+                    await asyncio.wait_for(event.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # 종료 / 연결 끊김 / 다른 프로세스 소유 작업 모두 여기서 정리
+            remaining = self._watchers.pop(job_key, 1) - 1
+            if remaining > 0:
+                self._watchers[job_key] = remaining
+            else:
+                self._events.pop(job_key, None)
+
+    # ==================== Polling ====================
+
+    async def _poll_loop(self) -> None:
+        """진행 중 operation 일괄 폴링 루프 (claim_interval마다 리스 갱신 / 인수)"""
+        next_claim = 0.0
+        while True:
+            if time.monotonic() >= next_claim:
+                await self._claim()
+                next_claim = time.monotonic() + self.claim_interval
+
+            if not self._operations:
+                # 작업이 없어도 claim_interval마다 깨어나 중단된 워커의 작업을 인수
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.claim_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await asyncio.sleep(self.poll_interval)
+
+            try:
+                await self._poll_once()
+            except Exception as e:
+                logger.exception(f"Video job polling failed: {str(e)}")
+
+    async def _claim(self) -> None:
+        """
+        리스 갱신 및 인수
+
+        - 내 작업은 리스 연장, 소유자가 없거나 리스가 만료된 작업은 인수하여 폴링 재개
+        - 다른 워커가 가져간 작업은 메모리에서 정리 (이후 조회는 DB 기준)
+        """
+        try:
+            rows = await self.repo.claim_in_flight(self.owner_id, self.lease_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to claim video jobs: {str(e)}")
+            return
+
+        claimed = set()
+        restored = 0
+        for row in rows:
+            job_key = row['video_job_key']
+            claimed.add(job_key)
+            if job_key in self._operations or job_key in self._job_info:
+                # 이미 폴링 중이거나 이 워커에서 제출 진행 중
+                continue
+
+            if not row.get('operation_name'):
+                # operation 생성 전에 중단된 작업은 복구 불가
+                await self._persist(job_key, {
+                    'status_kind': 'failed',
+                    'error_msg': 'Interrupted before the generation request was submitted'
+                })
+                continue
+
+            cre_date = row.get('cre_date')
+            self._job_info[job_key] = {
+                'prompt': row.get('prompt_text') or '',
+                'has_last_frame': bool(row.get('has_last_frame_yn')),
+                'started_at': cre_date.timestamp() if cre_date else time.time(),
+                'poll_count': row.get('poll_cnt') or 0
+            }
+            self._operations[job_key] = veo3_service.operation_from_name(row['operation_name'])
+            self._jobs[job_key] = self._row_to_job(row)
+            restored += 1
+
+        for job_key in [key for key in self._operations if key not in claimed]:
+            # SKIP LOCKED로 잠시 빠졌을 수 있으므로 실제 소유자를 확인
+            row = await self.repo.get_by_id(job_key)
+            if not row or row.get('owner_id') != self.owner_id or row.get('status_kind') in TERMINAL_STATUSES:
+                logger.info(f"Video job {job_key} is now handled by another worker")
+                self._operations.pop(job_key, None)
+                self._finish(job_key)
+
+        if restored:
+            logger.info(f"Claimed {restored} in-flight video job(s) (owner={self.owner_id})")
+
+    async def _poll_once(self) -> None:
+        """모든 진행 중 operation 상태를 동시에 조회"""
+        job_keys = list(self._operations)
+        if not job_keys:
+            return
+
+        refreshed = await asyncio.gather(
+            *(veo3_service.refresh_operation(self._operations[job_key]) for job_key in job_keys),
+            return_exceptions=True
+        )
+
+        completions = []
+        for job_key, operation in zip(job_keys, refreshed):
+            info = self._job_info[job_key]
+            info['poll_count'] += 1
+
+            if isinstance(operation, Exception):
+                logger.warning(f"⚠️ Video job {job_key} polling error: {str(operation)}")
+            else:
+                self._operations[job_key] = operation
+                if operation.done:
+                    completions.append(self._complete(job_key, operation))
+                    continue
+
+            elapsed = time.time() - info['started_at']
+            if elapsed > self.max_wait_seconds:
+                await self._fail(job_key, "Video generation timeout - exceeded maximum polling time")
+                continue
+
+            percent = min(15 + int(elapsed * 75 / self.max_wait_seconds), 90)
+            await self._persist(job_key, {'progress_pct': percent, 'poll_cnt': info['poll_count']})
+            self._set_job(job_key, percent=percent, message=f"비디오 생성 중... ({percent}%)")
+
+        if completions:
+            await asyncio.gather(*completions)
+
+    async def _complete(self, job_key: int, operation: "types.GenerateVideosOperation") -> None:
+        """완료된 operation 처리: 비디오 다운로드 후 결과 저장"""
+        self._operations.pop(job_key, None)
+        info = self._job_info[job_key]
+        self._set_job(job_key, percent=95, message="비디오 처리 중...")
+
+        video_name = self._video_name(job_key)
+        try:
+            video = veo3_service.extract_video(operation)
+            await video_store.save(video_name, veo3_service.stream_video(video))
+        except Exception as e:
+            await self._fail(job_key, str(e))
+            return
+
+        metadata = {
+            "model": veo3_service.model,
+            "prompt": info['prompt'][:200],
+            "generation_time": time.time() - info['started_at'],
+            "poll_count": info['poll_count'],
+            "has_last_frame": info['has_last_frame']
+        }
+        if info.get('governor'):
+            metadata["governor"] = info['governor']
+        result = {
+            "video_url": video_store.url_for(video_name),
+            "thumbnail_url": info.get('thumbnail_url'),
+            "duration": 10.0,
+            "metadata": metadata
+        }
+
+        await self._persist(job_key, {
+            'status_kind': 'completed',
+            'progress_pct': 100,
+            'poll_cnt': info['poll_count'],
+            'result_json': {
+                "video_uri": video.uri,
+                "video_name": video_name,
+                "duration": 10.0,
+                "metadata": metadata
+            }
+        })
+        self._remember_result(job_key, result)
+        self._finish(job_key)
+
+        logger.info(f"🎉 Video job {job_key} completed in {metadata['generation_time']:.2f}s")
+
+    async def _fail(self, job_key: int, error_msg: str) -> None:
+        """작업 실패 처리"""
+        self._operations.pop(job_key, None)
+        await self._persist(job_key, {'status_kind': 'failed', 'error_msg': error_msg})
+        self._finish(job_key)
+        logger.error(f"💥 Video job {job_key} failed: {error_msg}")
+
+    def _finish(self, job_key: int) -> None:
+        """종료된 작업을 메모리에서 정리 (이후 조회는 DB 기준)"""
+        self._job_info.pop(job_key, None)
+        self._jobs.pop(job_key, None)
+        self._notify(job_key)
+
+    # ==================== Results ====================
+
+    async def _load_result(self, job_key: int, row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """완료 결과 조회 (메모리 → 저장소 → 저장된 video_uri로 재다운로드)"""
+        cached = self._results.get(job_key)
+        if cached is not None:
+            self._results.move_to_end(job_key)
+            return cached
+
+        stored = row.get('result_json') or {}
+        result = {
+            "video_url": None,
+            "thumbnail_url": None,
+            "duration": stored.get("duration", 10.0),
+            "metadata": stored.get("metadata", {})
+        }
+
+        video_name = stored.get("video_name") or self._video_name(job_key)
+        video_uri = stored.get("video_uri")
+        if video_store.exists(video_name):
+            result["video_url"] = video_store.url_for(video_name)
+            self._remember_result(job_key, result)
+        elif video_uri:
+            try:
+                from google.genai import types
+
+                video = types.Video(uri=video_uri)
+                await video_store.save(video_name, veo3_service.stream_video(video))
+                result["video_url"] = video_store.url_for(video_name)
+                self._remember_result(job_key, result)
+            except Exception as e:
+                logger.warning(f"Failed to re-download video for job {job_key}: {str(e)}")
+
+        return result
+
+    def _remember_result(self, job_key: int, result: Dict[str, Any]) -> None:
+        self._results[job_key] = result
+        self._results.move_to_end(job_key)
+        while len(self._results) > self.max_cached_results:
+            self._results.popitem(last=False)
+
+    def _video_name(self, job_key: int) -> str:
+        return f"veo_{job_key}.mp4"
+
+    # ==================== State Helpers ====================
+
+    def _set_job(self, job_key: int, **changes) -> None:
+        """진행 중 작업의 공개 상태 갱신 및 대기자 알림"""
+        job = self._jobs.setdefault(job_key, {
+            "jobKey": job_key,
+            "status": "pending",
+            "percent": 0,
+            "message": "",
+            "result": None,
+            "error": None
+        })
+        job.update(changes)
+        self._notify(job_key)
+
+    def _notify(self, job_key: int) -> None:
+        event = self._events.pop(job_key, None)
+        if event is not None:
+            event.set()
+
+    async def _persist(self, job_key: int, data: Dict[str, Any]) -> None:
+        """작업 상태 DB 저장 (실패해도 폴링은 계속)"""
+        try:
+            await self.repo.update(job_key, data)
+        except Exception as e:
+            logger.warning(f"Failed to persist video job {job_key}: {str(e)}")
+
+    def _row_to_job(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        status = row.get('status_kind') or 'pending'
+        percent = row.get('progress_pct') or 0
+        messages = {
+            'pending': "비디오 생성 요청 중...",
+            'running': f"비디오 생성 중... ({percent}%)",
+            'completed': "완료!",
+            'failed': "실패"
+        }
+        return {
+            "jobKey": row['video_job_key'],
+            "status": status,
+            "percent": percent,
+            "message": messages.get(status, ""),
+            "result": None,
+            "error": row.get('error_msg')
+        }
+
+    def list_in_flight(self) -> List[int]:
+        """이 프로세스가 폴링 중인 작업 목록"""
+        return list(self._operations)
+
+
+# 싱글톤 인스턴스
+video_job_manager = VideoJobManager()
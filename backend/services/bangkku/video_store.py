@@ -0,0 +1,134 @@
+"""
+Video Artifact Store
+생성된 비디오 파일 저장소
+
+- 다운로드 스트림을 청크 단위로 저장 (전체 비디오를 메모리에 올리지 않음)
+- 저장된 비디오는 짧은 URL로 제공 (HTTP Range 지원 라우트에서 서빙)
+- VIDEO_STORE_BACKEND로 저장소 구현 교체 가능 (기본: local)
+"""
+import os
+import re
+import asyncio
+import logging
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# 기본 저장 경로 (backend/static/videos)
+DEFAULT_VIDEO_DIR = Path(__file__).parent.parent.parent / "static" / "videos"
+
+# 허용 파일명 (경로 조작 방지)
+VIDEO_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_\-]+\.mp4$")
+
+
+class VideoArtifactStore(ABC):
+    """비디오 저장소 인터페이스"""
+
+    @abstractmethod
+    async def save(self, name: str, chunks: AsyncIterator[bytes]) -> int:
+        """
+        청크 스트림을 저장
+
+        Args:
+            name: 저장할 파일명 (예: veo_12.mp4)
+            chunks: 비디오 bytes 청크 스트림
+
+        Returns:
+            int: 저장된 바이트 수
+        """
+
+    @abstractmethod
+    def exists(self, name: str) -> bool:
+        """저장 여부 확인"""
+
+    @abstractmethod
+    def size(self, name: str) -> Optional[int]:
+        """저장된 파일 크기 (없으면 None)"""
+
+    @abstractmethod
+    def iter_range(self, name: str, start: int, end: int, chunk_size: int = 256 * 1024) -> Iterator[bytes]:
+        """[start, end] 구간을 청크 단위로 읽기 (end 포함)"""
+
+    @abstractmethod
+    def url_for(self, name: str) -> str:
+        """클라이언트에 전달할 URL"""
+
+    @staticmethod
+    def is_valid_name(name: str) -> bool:
+        return bool(VIDEO_NAME_PATTERN.match(name))
+
+
+class LocalVideoStore(VideoArtifactStore):
+    """로컬 디스크 비디오 저장소 (static/videos)"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드"""
+        self.video_dir = Path(os.getenv("VIDEO_STORE_DIR", str(DEFAULT_VIDEO_DIR)))
+        self.base_url = os.getenv("VIDEO_PUBLIC_BASE_URL", "/api/bangkku/videos").rstrip("/")
+
+    def _path(self, name: str) -> Path:
+        if not self.is_valid_name(name):
+            raise ValueError(f"Invalid video name: {name}")
+        return self.video_dir / name
+
+    async def save(self, name: str, chunks: AsyncIterator[bytes]) -> int:
+        path = self._path(name)
+        await asyncio.to_thread(self.video_dir.mkdir, parents=True, exist_ok=True)
+
+        # 같은 이름을 동시에 저장해도 서로 덮어쓰지 않도록 고유한 임시 파일 사용
+        written = 0
+        f = await asyncio.to_thread(
+            tempfile.NamedTemporaryFile, dir=self.video_dir, prefix=f".{path.stem}.", suffix=".part", delete=False
+        )
+        tmp_path = Path(f.name)
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                written += len(chunk)
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise
+        await asyncio.to_thread(f.close)
+
+        # 완성된 파일만 노출되도록 원자적 교체
+        await asyncio.to_thread(os.replace, tmp_path, path)
+        logger.info(f"Video stored: {path} ({written} bytes)")
+        return written
+
+    def exists(self, name: str) -> bool:
+        return self.is_valid_name(name) and self._path(name).is_file()
+
+    def size(self, name: str) -> Optional[int]:
+        if not self.exists(name):
+            return None
+        return self._path(name).stat().st_size
+
+    def iter_range(self, name: str, start: int, end: int, chunk_size: int = 256 * 1024) -> Iterator[bytes]:
+        with open(self._path(name), "rb") as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def url_for(self, name: str) -> str:
+        return f"{self.base_url}/{name}"
+
+
+def create_video_store() -> VideoArtifactStore:
+    """VIDEO_STORE_BACKEND 설정에 맞는 저장소 생성"""
+    backend = os.getenv("VIDEO_STORE_BACKEND", "local").lower()
+    if backend == "local":
+        return LocalVideoStore()
+    raise ValueError(f"Unsupported VIDEO_STORE_BACKEND: {backend}")
+
+
+# 싱글톤 인스턴스
+video_store = create_video_store()
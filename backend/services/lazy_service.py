@@ -0,0 +1,47 @@
+"""
+Lazy Service
+서비스 싱글톤 지연 생성 프록시
+
+- 모듈 import 시에는 생성하지 않고 첫 속성 접근 시 factory 호출 (자격 증명 / SDK import 비용을 첫 사용으로 미룸)
+- 기존 싱글톤과 같은 이름으로 노출하므로 호출부는 그대로 `gemini_service.method(...)`
+- get()으로 lifespan 워밍업에서 미리 생성 가능 (스레드에서 호출해도 한 번만 생성)
+"""
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LazyService(Generic[T]):
+    """첫 사용 시 생성되는 서비스 싱글톤"""
+
+    def __init__(self, factory: Callable[[], T], name: str):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def get(self) -> T:
+        """서비스 인스턴스 (없으면 생성)"""
+        instance: Optional[T] = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self.get(), name, value)
+
+    def __repr__(self) -> str:
+        state = "initialized" if self.initialized else "not initialized"
+        return f"<LazyService {self._name} ({state})>"
@@ -0,0 +1,178 @@
+"""
+Default Prompt Cache
+prompt_kind별 기본 프롬프트 인메모리 캐시
+
+- TTL 만료 + 버전(세대) 비교로 무효화 중 조회된 오래된 값 저장 방지
+- 프롬프트 변경 시 Postgres NOTIFY로 다른 uvicorn 워커에도 무효화 전파
+"""
+import os
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any, Callable, Awaitable, Tuple
+
+import psycopg
+
+from database.async_connection import AsyncDatabaseConnection, get_async_db_cursor
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY 채널 / 전체 무효화 payload
+INVALIDATION_CHANNEL = "prompt_cache_invalidate"
+INVALIDATE_ALL = "*"
+
+
+class DefaultPromptCache:
+    """기본 프롬프트 TTL 캐시 (LISTEN/NOTIFY 무효화)"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드"""
+        self.ttl = float(os.getenv("PROMPT_CACHE_TTL", 300))
+        self.enabled = self.ttl > 0
+
+        # prompt_kind -> (prompt 또는 None, 만료 시각)
+        self._entries: Dict[str, Tuple[Optional[Dict[str, Any]], float]] = {}
+
+        # 무효화 세대: 조회 시작 후 무효화가 일어나면 결과를 캐시에 저장하지 않음
+        self._generation = 0
+        self._kind_generation: Dict[str, int] = {}
+
+        self._listener: Optional[asyncio.Task] = None
+        # LISTEN 연결 상태 (재연결 대기 중이면 False)
+        self._listening = False
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "remote_invalidations": 0,
+            "listener_reconnects": 0
+        }
+
+    # ==================== Lookup ====================
+
+    async def get(
+        self,
+        prompt_kind: str,
+        loader: Callable[[str], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        기본 프롬프트 조회 (캐시 miss 시 loader로 DB 조회)
+
+        Args:
+            prompt_kind: Service/feature path
+            loader: DB 조회 함수 (PromptRepository.get_default)
+
+        Returns:
+            Optional[Dict]: Default prompt (copy) or None
+        """
+        if not self.enabled:
+            return await loader(prompt_kind)
+
+        entry = self._entries.get(prompt_kind)
+        if entry is not None and entry[1] > time.monotonic():
+            self._stats["hits"] += 1
+            return dict(entry[0]) if entry[0] else None
+
+        self._stats["misses"] += 1
+        version = self._version(prompt_kind)
+        prompt = await loader(prompt_kind)
+
+        if self._version(prompt_kind) == version:
+            self._entries[prompt_kind] = (prompt, time.monotonic() + self.ttl)
+        return dict(prompt) if prompt else None
+
+    def _version(self, prompt_kind: str) -> Tuple[int, int]:
+        return self._generation, self._kind_generation.get(prompt_kind, 0)
+
+    # ==================== Invalidation ====================
+
+    def invalidate_local(self, prompt_kind: Optional[str] = None) -> None:
+        """이 프로세스의 캐시 무효화 (prompt_kind가 None이면 전체)"""
+        self._stats["invalidations"] += 1
+        if prompt_kind is None:
+            self._generation += 1
+            self._entries.clear()
+        else:
+            self._kind_generation[prompt_kind] = self._kind_generation.get(prompt_kind, 0) + 1
+            self._entries.pop(prompt_kind, None)
+
+    async def invalidate(self, prompt_kind: Optional[str] = None) -> None:
+        """캐시 무효화 후 다른 워커에 NOTIFY 전파"""
+        self.invalidate_local(prompt_kind)
+        try:
+            async with get_async_db_cursor() as cursor:
+                await cursor.execute(
+                    "SELECT pg_notify(%s, %s)",
+                    (INVALIDATION_CHANNEL, prompt_kind or INVALIDATE_ALL)
+                )
+        except Exception as e:
+            # 전파 실패 시 다른 워커는 TTL 만료로 복구
+            logger.warning(f"Prompt cache invalidation notify failed: {str(e)}")
+
+    # ==================== Listener ====================
+
+    async def start(self) -> None:
+        """NOTIFY 수신 태스크 시작"""
+        if self.enabled and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen_loop())
+
+    async def stop(self) -> None:
+        """NOTIFY 수신 태스크 중지"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen_loop(self) -> None:
+        """LISTEN 전용 연결 유지 (끊기면 재연결 후 전체 무효화)"""
+        backoff = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    AsyncDatabaseConnection.conninfo(),
+                    autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {INVALIDATION_CHANNEL}")
+                    self._listening = True
+                    # 연결이 끊긴 동안 놓친 알림이 있을 수 있으므로 전체 무효화
+                    self.invalidate_local()
+                    backoff = 1.0
+                    logger.info(f"Prompt cache listening on '{INVALIDATION_CHANNEL}'")
+
+                    async for notify in conn.notifies():
+                        self._stats["remote_invalidations"] += 1
+                        payload = notify.payload
+                        self.invalidate_local(None if payload == INVALIDATE_ALL else payload)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._listening = False
+                self._stats["listener_reconnects"] += 1
+                logger.warning(f"Prompt cache listener disconnected: {str(e)} (retry in {backoff:.0f}s)")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+            finally:
+                # 알림 스트림이 끝났거나 태스크가 취소된 경우
+                self._listening = False
+
+    # ==================== Stats ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 카운터 반환"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "ttl_s": self.ttl,
+            "entries": len(self._entries),
+            "hit_ratio": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            "listening": self._listening
+        }
+
+
+# 싱글톤 인스턴스
+default_prompt_cache = DefaultPromptCache()
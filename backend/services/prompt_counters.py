@@ -0,0 +1,141 @@
+"""
+Prompt Counter Aggregator
+프롬프트 use_cnt / success_cnt write-behind 집계기
+
+- 요청 경로에서는 메모리 카운터만 증가 (DB 대기 없음)
+- 주기적으로 누적된 증가분을 multi-row UPDATE 한 번으로 반영
+- 종료 시 남은 증가분 flush
+"""
+import os
+import time
+import asyncio
+import logging
+from typing import Optional, Dict, Any, List
+
+from repos.prompt_repo import PromptRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PromptCounterAggregator:
+    """프롬프트 사용/성공 카운터 write-behind 집계기"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드"""
+        self.repo = PromptRepository()
+        self.flush_interval = max(0.1, float(os.getenv("PROMPT_COUNTER_FLUSH_INTERVAL", 5)))
+        self.max_pending_keys = max(1, int(os.getenv("PROMPT_COUNTER_MAX_PENDING", 500)))
+
+        # prompt_key -> [use_delta, success_delta]
+        self._pending: Dict[int, List[int]] = {}
+
+        self._flush_lock = asyncio.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+        self._stats = {
+            "flushes": 0,
+            "rows_flushed": 0,
+            "increments_flushed": 0,
+            "flush_failures": 0,
+            "last_flush_ms": 0.0
+        }
+
+    # ==================== Request Path ====================
+
+    def add_usage(self, prompt_key: int, count: int = 1) -> None:
+        """사용 횟수 증가분 기록"""
+        self._add(prompt_key, 0, count)
+
+    def add_success(self, prompt_key: int, count: int = 1) -> None:
+        """성공 횟수 증가분 기록"""
+        self._add(prompt_key, 1, count)
+
+    def _add(self, prompt_key: int, index: int, count: int) -> None:
+        self._pending.setdefault(prompt_key, [0, 0])[index] += count
+
+        # 대기 키가 너무 많으면 주기를 기다리지 않고 flush
+        if len(self._pending) >= self.max_pending_keys and self._wakeup is not None:
+            self._wakeup.set()
+
+    # ==================== Flush ====================
+
+    async def flush(self) -> int:
+        """
+        누적된 증가분을 DB에 반영
+
+        Returns:
+            int: 반영된 prompt 행 수
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            # 교체 후 반영 (flush 중 들어온 증가분은 다음 주기로)
+            pending, self._pending = self._pending, {}
+            deltas = [(prompt_key, use, success) for prompt_key, (use, success) in pending.items()]
+
+            started = time.time()
+            try:
+                rows = await self.repo.apply_counter_deltas(deltas)
+            except Exception as e:
+                # 실패한 증가분은 되돌려 다음 주기에 재시도
+                for prompt_key, use, success in deltas:
+                    counters = self._pending.setdefault(prompt_key, [0, 0])
+                    counters[0] += use
+                    counters[1] += success
+                self._stats["flush_failures"] += 1
+                logger.warning(f"Prompt counter flush failed ({len(deltas)} prompts): {str(e)}")
+                return 0
+
+            self._stats["flushes"] += 1
+            self._stats["rows_flushed"] += rows
+            self._stats["increments_flushed"] += sum(use + success for _, use, success in deltas)
+            self._stats["last_flush_ms"] = round((time.time() - started) * 1000, 2)
+            return rows
+
+    async def _flush_loop(self) -> None:
+        """flush_interval마다 (또는 대기 키 한도 도달 시) flush"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    # ==================== Lifecycle ====================
+
+    async def start(self) -> None:
+        """백그라운드 flush 태스크 시작"""
+        if self._flusher is None or self._flusher.done():
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """flush 태스크 중지 후 남은 증가분 반영"""
+        if self._flusher is not None:
+            # 진행 중인 flush가 끝난 뒤 취소 (교체된 증가분 유실 방지)
+            async with self._flush_lock:
+                self._flusher.cancel()
+                try:
+                    await self._flusher
+                except asyncio.CancelledError:
+                    pass
+            self._flusher = None
+        await self.flush()
+
+    # ==================== Stats ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """집계기 상태 반환"""
+        return {
+            **self._stats,
+            "pending_prompts": len(self._pending),
+            "pending_increments": sum(use + success for use, success in self._pending.values()),
+            "flush_interval_s": self.flush_interval
+        }
+
+
+# 싱글톤 인스턴스
+prompt_counter_aggregator = PromptCounterAggregator()
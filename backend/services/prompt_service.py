@@ -3,9 +3,11 @@ Prompt Service
 Business logic for prompt management
 Each function has a single responsibility
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from repos.prompt_repo import PromptRepository
 from database.models import PromptCreate, PromptUpdate
+from services.prompt_cache import default_prompt_cache
+from services.prompt_counters import prompt_counter_aggregator
 
 
 class PromptService:
@@ -17,6 +19,7 @@ class PromptService:
     async def get_default_prompt(self, prompt_kind: str) -> Optional[Dict[str, Any]]:
         """
         Get default prompt for a service/feature
+        Served from the in-process cache (invalidated on prompt writes)
 
         Args:
             prompt_kind: Service/feature path (e.g., 'bangkku/furniture_removal')
@@ -24,7 +27,7 @@ class PromptService:
         Returns:
             Optional[Dict]: Default prompt or None if not found
         """
-        return self.repo.get_default(prompt_kind)
+        return await default_prompt_cache.get(prompt_kind, self.repo.get_default)
 
     async def get_prompt_by_id(self, prompt_key: int) -> Optional[Dict[str, Any]]:
         """
@@ -36,24 +39,30 @@ class PromptService:
         Returns:
             Optional[Dict]: Prompt data or None
         """
-        return self.repo.get_by_id(prompt_key)
+        return await self.repo.get_by_id(prompt_key)
 
-    async def get_prompts_by_kind(
+    async def list_prompts(
         self,
-        prompt_kind: str,
-        include_non_default: bool = True
-    ) -> List[Dict[str, Any]]:
+        prompt_kind: Optional[str] = None,
+        include_non_default: bool = True,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        text_limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        Get all prompts for a service/feature
+        List prompts for a service/feature (or all kinds), newest first
 
         Args:
-            prompt_kind: Service/feature path
+            prompt_kind: Service/feature path (None for all kinds)
             include_non_default: Include non-default prompts
+            limit: Page size
+            cursor: next_cursor from the previous page
+            text_limit: Truncate prompt_text to this many characters
 
         Returns:
-            List[Dict]: List of prompts
+            Tuple[List[Dict], Optional[str]]: (prompts, next_cursor)
         """
-        return self.repo.get_by_kind(prompt_kind, include_non_default)
+        return await self.repo.list_by_kind(prompt_kind, include_non_default, limit, cursor, text_limit)
 
     async def create_prompt(self, prompt_data: PromptCreate) -> int:
         """
@@ -66,7 +75,24 @@ class PromptService:
             int: Created prompt key
         """
         data = prompt_data.model_dump()
-        return self.repo.create(data)
+        prompt_key = await self.repo.create(data)
+        await default_prompt_cache.invalidate(data.get('prompt_kind'))
+        return prompt_key
+
+    async def get_or_create_prompt(self, prompt_data: PromptCreate) -> int:
+        """
+        Reuse an existing prompt with the same kind and text, or create one
+
+        Args:
+            prompt_data: Prompt creation data
+
+        Returns:
+            int: Existing or created prompt key
+        """
+        existing = await self.repo.find_by_text(prompt_data.prompt_kind, prompt_data.prompt_text)
+        if existing:
+            return existing['prompt_key']
+        return await self.create_prompt(prompt_data)
 
     async def update_prompt(self, prompt_key: int, prompt_data: PromptUpdate) -> bool:
         """
@@ -82,33 +108,40 @@ class PromptService:
         data = prompt_data.model_dump(exclude_none=True)
         if not data:
             return False
-        return self.repo.update(prompt_key, data)
+        updated = await self.repo.update(prompt_key, data)
+        if updated:
+            await self._invalidate_kind_of(prompt_key)
+        return updated
 
     async def increment_usage(self, prompt_key: int) -> bool:
         """
         Increment prompt use count by 1
         Single responsibility: usage tracking only
+        Recorded in memory and flushed in batches (write-behind)
 
         Args:
             prompt_key: Prompt primary key
 
         Returns:
-            bool: True if incremented
+            bool: True if recorded
         """
-        return self.repo.increment_use_cnt(prompt_key)
+        prompt_counter_aggregator.add_usage(prompt_key)
+        return True
 
     async def increment_success(self, prompt_key: int) -> bool:
         """
         Increment prompt success count by 1
         Single responsibility: success tracking only
+        Recorded in memory and flushed in batches (write-behind)
 
         Args:
             prompt_key: Prompt primary key
 
         Returns:
-            bool: True if incremented
+            bool: True if recorded
         """
-        return self.repo.increment_success_cnt(prompt_key)
+        prompt_counter_aggregator.add_success(prompt_key)
+        return True
 
     async def set_as_default(self, prompt_key: int) -> bool:
         """
@@ -121,7 +154,10 @@ class PromptService:
         Returns:
             bool: True if set as default
         """
-        return self.repo.set_as_default(prompt_key)
+        updated = await self.repo.set_as_default(prompt_key)
+        if updated:
+            await self._invalidate_kind_of(prompt_key)
+        return updated
 
     async def update_avg_rating(self, prompt_key: int) -> bool:
         """
@@ -134,7 +170,7 @@ class PromptService:
         Returns:
             bool: True if updated
         """
-        return self.repo.update_avg_rating(prompt_key)
+        return await self.repo.update_avg_rating(prompt_key)
 
     async def get_statistics(self, prompt_key: int) -> Optional[Dict[str, Any]]:
         """
@@ -147,7 +183,7 @@ class PromptService:
         Returns:
             Optional[Dict]: Statistics or None
         """
-        return self.repo.get_statistics(prompt_key)
+        return await self.repo.get_statistics(prompt_key)
 
     async def delete_prompt(self, prompt_key: int) -> bool:
         """
@@ -159,4 +195,13 @@ class PromptService:
         Returns:
             bool: True if deleted
         """
-        return self.repo.delete(prompt_key)
+        prompt = await self.repo.get_by_id(prompt_key)
+        deleted = await self.repo.delete(prompt_key)
+        if deleted and prompt:
+            await default_prompt_cache.invalidate(prompt['prompt_kind'])
+        return deleted
+
+    async def _invalidate_kind_of(self, prompt_key: int) -> None:
+        """Invalidate the cached default prompt for the prompt's kind"""
+        prompt = await self.repo.get_by_id(prompt_key)
+        await default_prompt_cache.invalidate(prompt['prompt_kind'] if prompt else None)
@@ -2,10 +2,11 @@
 Rating Service
 프롬프트 평가 비즈니스 로직
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from database.models import PromptRating, RatingCreate
 from repos.rating_repo import RatingRepository
 from repos.prompt_repo import PromptRepository
+from services.test_result_writer import test_result_writer
 
 
 class RatingService:
@@ -37,10 +38,14 @@ class RatingService:
         # None 값 제거
         data = {k: v for k, v in data.items() if v is not None}
 
-        rating_key = self.repo.create(data)
+        # 비동기 저장 큐에 있는 테스트 결과면 저장될 때까지 대기
+        if request.test_result_key is not None:
+            await test_result_writer.wait_written(request.test_result_key)
+
+        rating_key = await self.repo.create(data)
 
         # Update prompt's average rating
-        self.prompt_repo.update_avg_rating(request.prompt_key)
+        await self.prompt_repo.update_avg_rating(request.prompt_key)
 
         return rating_key
 
@@ -54,7 +59,7 @@ class RatingService:
         Returns:
             Optional[PromptRating]: 평가 객체 또는 None
         """
-        result = self.repo.get_by_id(rating_key)
+        result = await self.repo.get_by_id(rating_key)
         if not result:
             return None
 
@@ -63,20 +68,22 @@ class RatingService:
     async def get_ratings_by_prompt(
         self,
         prompt_key: int,
-        limit: int = 50
-    ) -> List[PromptRating]:
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[PromptRating], Optional[str]]:
         """
-        특정 프롬프트의 평가 목록 조회
+        특정 프롬프트의 평가 목록 조회 (최신순, 커서 페이지)
 
         Args:
             prompt_key: 프롬프트 primary key
-            limit: 최대 조회 개수
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor
 
         Returns:
-            List[PromptRating]: 평가 목록
+            Tuple[List[PromptRating], Optional[str]]: (평가 목록, 다음 페이지 커서)
         """
-        results = self.repo.get_by_prompt_key(prompt_key, limit)
-        return [PromptRating(**row) for row in results]
+        results, next_cursor = await self.repo.get_by_prompt_key(prompt_key, limit, cursor)
+        return [PromptRating(**row) for row in results], next_cursor
 
     async def get_average_rating(self, prompt_key: int) -> Optional[Dict[str, Any]]:
         """
@@ -88,19 +95,24 @@ class RatingService:
         Returns:
             Optional[Dict]: 평균 평점 통계
         """
-        return self.repo.get_average_rating(prompt_key)
+        return await self.repo.get_average_rating(prompt_key)
 
-    async def get_recent_ratings(self, limit: int = 20) -> List[Dict[str, Any]]:
+    async def get_recent_ratings(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
-        최근 평가 목록 조회 (전체 프롬프트)
+        최근 평가 목록 조회 (전체 프롬프트, 커서 페이지)
 
         Args:
-            limit: 최대 조회 개수
+            limit: 페이지 크기
+            cursor: 이전 페이지의 next_cursor
 
         Returns:
-            List[Dict]: 평가 목록 (프롬프트 정보 포함)
+            Tuple[List[Dict], Optional[str]]: (평가 목록 (프롬프트 종류 포함), 다음 페이지 커서)
         """
-        return self.repo.get_recent_ratings(limit)
+        return await self.repo.get_recent_ratings(limit, cursor)
 
     async def delete_rating(self, rating_key: int) -> bool:
         """
@@ -113,18 +125,18 @@ class RatingService:
             bool: 성공 여부
         """
         # Get rating to get prompt_key before deletion
-        rating = self.repo.get_by_id(rating_key)
+        rating = await self.repo.get_by_id(rating_key)
         if not rating:
             return False
 
         prompt_key = rating['prompt_key']
 
         # Delete rating
-        success = self.repo.delete(rating_key)
+        success = await self.repo.delete(rating_key)
 
         if success:
             # Update prompt's average rating
-            self.prompt_repo.update_avg_rating(prompt_key)
+            await self.prompt_repo.update_avg_rating(prompt_key)
 
         return success
 
@@ -154,4 +166,4 @@ class RatingService:
         if not data:
             return False
 
-        return self.repo.update(rating_key, data)
+        return await self.repo.update(rating_key, data)
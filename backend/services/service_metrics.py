@@ -0,0 +1,134 @@
+"""
+Service Metrics
+서비스 내부 통계(get_stats)를 Prometheus 메트릭으로 변환 (스크레이프 시점에만 계산)
+
+- DB 연결 풀: 비동기 psycopg3 풀은 사용 중 / 유휴 / 대기 / 최대 연결, 요청 수 / 대기 시간 / 실패,
+  동기 psycopg2 풀(스크립트용)은 체크아웃 수 / 최대 연결만
+- 배경 제거 워커 대기열, Gemini/Veo 호출 제한기, 동일 요청 병합, 결과 캐시, 테스트 결과 쓰기 큐
+"""
+from typing import Iterator
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.metrics_core import Metric
+
+from database.connection import DatabaseConnection
+from database.async_connection import AsyncDatabaseConnection
+from services.bangkku.api_governor import api_governor
+from services.bangkku.background_removal import background_removal_executor
+from services.bangkku.result_cache import result_cache
+from services.bangkku.single_flight import single_flight
+from services.test_result_writer import test_result_writer
+from utils.metrics import register_collector
+
+
+def collect_db_pool_metrics() -> Iterator[Metric]:
+    """DB 연결 풀 사용량 (초기화되지 않은 풀은 생략, 동기 풀은 체크아웃 수만 집계되므로 따로 보고)"""
+    connections = GaugeMetricFamily("db_pool_connections", "Async database pool connections by state", labels=["pool", "state"])
+    max_size = GaugeMetricFamily("db_pool_max_connections", "Database pool maximum size", labels=["pool"])
+    utilization = GaugeMetricFamily("db_pool_utilization_ratio", "In-use connections / maximum size", labels=["pool"])
+    waiting = GaugeMetricFamily("db_pool_waiting_requests", "Requests waiting for a pooled connection", labels=["pool"])
+    requests = CounterMetricFamily("db_pool_requests", "Connection requests served by the pool", labels=["pool"])
+    wait_seconds = CounterMetricFamily("db_pool_wait_seconds", "Total time requests waited for a connection", labels=["pool"])
+    errors = CounterMetricFamily("db_pool_request_errors", "Connection requests that failed (timeout, pool closed or full queue)", labels=["pool"])
+    checked_out = GaugeMetricFamily("db_pool_checked_out_connections", "Sync pool connections checked out by scripts", labels=["pool"])
+
+    sync_stats = DatabaseConnection.get_stats()
+    if sync_stats:
+        checked_out.add_metric(["sync"], sync_stats["checked_out"])
+        max_size.add_metric(["sync"], sync_stats["max_size"])
+        utilization.add_metric(
+            ["sync"], sync_stats["checked_out"] / sync_stats["max_size"] if sync_stats["max_size"] else 0.0
+        )
+
+    async_stats = AsyncDatabaseConnection.get_stats()
+    if async_stats:
+        # psycopg_pool 카운터는 0이면 생략되므로 get(..., 0)
+        in_use = async_stats["pool_size"] - async_stats["pool_available"]
+        connections.add_metric(["async", "in_use"], in_use)
+        connections.add_metric(["async", "idle"], async_stats["pool_available"])
+        max_size.add_metric(["async"], async_stats["pool_max"])
+        utilization.add_metric(["async"], in_use / async_stats["pool_max"] if async_stats["pool_max"] else 0.0)
+        waiting.add_metric(["async"], async_stats["requests_waiting"])
+        requests.add_metric(["async"], async_stats.get("requests_num", 0))
+        wait_seconds.add_metric(["async"], async_stats.get("requests_wait_ms", 0) / 1000)
+        errors.add_metric(["async"], async_stats.get("requests_errors", 0))
+
+    yield from (connections, max_size, utilization, waiting, requests, wait_seconds, errors, checked_out)
+
+
+def collect_background_removal_metrics() -> Iterator[Metric]:
+    """rembg 워커 대기열"""
+    stats = background_removal_executor.get_metrics()
+    yield GaugeMetricFamily("background_removal_in_flight", "Background removal jobs submitted and not finished", value=stats["in_flight"])
+    yield GaugeMetricFamily("background_removal_queue_depth", "Background removal jobs waiting for a worker", value=stats["queue_depth"])
+    yield GaugeMetricFamily("background_removal_max_queue_depth", "Background removal queue limit", value=stats["max_queue_depth"])
+    yield CounterMetricFamily("background_removal_rejected", "Background removal jobs rejected (queue full)", value=stats["rejected"])
+    yield CounterMetricFamily("background_removal_failed", "Background removal jobs that failed", value=stats["failed"])
+
+
+def collect_api_governor_metrics() -> Iterator[Metric]:
+    """Gemini / Veo 호출 제한기 (모델별 / 키별)"""
+    stats = api_governor.get_stats()
+    in_flight = GaugeMetricFamily("genai_limit_in_flight", "Gemini/Veo calls in flight", labels=["scope", "limit"])
+    waiting = GaugeMetricFamily("genai_limit_waiting", "Gemini/Veo calls waiting for a slot", labels=["scope", "limit"])
+    rate = GaugeMetricFamily("genai_limit_rate_per_minute", "Current (adaptive) request rate", labels=["scope", "limit"])
+    counters = {
+        key: CounterMetricFamily(f"genai_limit_{key}", f"Gemini/Veo governor {key.replace('_', ' ')} count", labels=["scope", "limit"])
+        for key in ("calls", "retries", "rate_limited", "rejected")
+    }
+
+    for scope, limits in (("model", stats["models"]), ("key", stats["keys"])):
+        for name, limit in limits.items():
+            in_flight.add_metric([scope, name], limit["in_flight"])
+            waiting.add_metric([scope, name], limit["waiting"])
+            rate.add_metric([scope, name], limit["rate_per_minute"])
+            for key, family in counters.items():
+                family.add_metric([scope, name], limit[key])
+
+    yield from (in_flight, waiting, rate, *counters.values())
+
+
+def collect_single_flight_metrics() -> Iterator[Metric]:
+    """동일 요청 병합"""
+    stats = single_flight.get_stats()
+    coalesced = CounterMetricFamily("single_flight_coalesced", "Requests served by an identical in-flight job", labels=["endpoint"])
+    for endpoint, count in stats["coalesced_by_endpoint"].items():
+        coalesced.add_metric([endpoint], count)
+    yield coalesced
+    yield CounterMetricFamily("single_flight_executed", "Image jobs executed (leaders)", value=stats["executed"])
+    yield GaugeMetricFamily("single_flight_in_flight", "Distinct image jobs in flight", value=stats["in_flight"])
+
+
+def collect_result_cache_metrics() -> Iterator[Metric]:
+    """이미지 결과 캐시 (적중률 = hits / (hits + misses))"""
+    stats = result_cache.get_stats()
+    lookups = CounterMetricFamily("image_result_cache_lookups", "Image result cache lookups", labels=["result"])
+    lookups.add_metric(["memory_hit"], stats["memory_hits"])
+    lookups.add_metric(["disk_hit"], stats["disk_hits"])
+    lookups.add_metric(["miss"], stats["misses"])
+    yield lookups
+    size = GaugeMetricFamily("image_result_cache_bytes", "Image result cache size", labels=["tier"])
+    size.add_metric(["memory"], stats["memory_bytes"])
+    size.add_metric(["disk"], stats["disk_bytes"])
+    yield size
+
+
+def collect_test_result_queue_metrics() -> Iterator[Metric]:
+    """테스트 결과 쓰기 큐"""
+    stats = test_result_writer.get_stats()
+    yield GaugeMetricFamily("test_result_queue_depth", "Test results waiting to be written", value=stats["queue_depth"])
+    yield CounterMetricFamily("test_result_written", "Test results written to the database", value=stats["written"])
+    dropped = CounterMetricFamily("test_result_dropped", "Test results dropped", labels=["reason"])
+    dropped.add_metric(["queue_full"], stats["dropped_queue_full"])
+    dropped.add_metric(["write_failed"], stats["dropped_write_failed"])
+    yield dropped
+
+
+def register_service_metrics() -> None:
+    """서비스 통계 수집기 등록 (앱 생성 시 한 번)"""
+    register_collector("db_pool", collect_db_pool_metrics)
+    register_collector("background_removal", collect_background_removal_metrics)
+    register_collector("api_governor", collect_api_governor_metrics)
+    register_collector("single_flight", collect_single_flight_metrics)
+    register_collector("result_cache", collect_result_cache_metrics)
+    register_collector("test_result_queue", collect_test_result_queue_metrics)
@@ -3,9 +3,10 @@ Test Result Service
 Business logic for test result management
 Each function has a single responsibility
 """
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from repos.test_result_repo import TestResultRepository
 from database.models import TestResultCreate
+from services.test_result_writer import test_result_writer
 
 
 class TestResultService:
@@ -25,7 +26,23 @@ class TestResultService:
             int: Created test_result_key
         """
         data = result_data.model_dump()
-        return self.repo.create(data)
+        return await self.repo.create(data)
+
+    async def enqueue_test_result(self, result_data: TestResultCreate) -> Optional[int]:
+        """
+        Queue a test result for background batch insert
+        Keeps the DB insert off the request path
+
+        Args:
+            result_data: Test result data
+
+        Returns:
+            Optional[int]: Reserved test_result_key (None if the queue dropped it).
+                The key is provisional until the batch is written; get_test_result
+                and rating creation wait for it.
+        """
+        data = result_data.model_dump()
+        return await test_result_writer.submit(data)
 
     async def get_test_result(self, test_result_key: int) -> Optional[Dict[str, Any]]:
         """
@@ -37,52 +54,66 @@ class TestResultService:
         Returns:
             Optional[Dict]: Test result data or None
         """
-        return self.repo.get_by_id(test_result_key)
+        # Key may still be queued in the background writer
+        await test_result_writer.wait_written(test_result_key)
+        return await self.repo.get_by_id(test_result_key)
 
     async def get_results_by_prompt(
         self,
         prompt_key: int,
         success_only: bool = False,
-        limit: int = 50
-    ) -> List[Dict[str, Any]]:
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
         Get test results for a specific prompt
 
         Args:
             prompt_key: Prompt primary key
             success_only: If True, only return successful results
-            limit: Maximum number of results
+            limit: Page size
+            cursor: next_cursor from the previous page
 
         Returns:
-            List[Dict]: Test results ordered by creation date desc
+            Tuple[List[Dict], Optional[str]]: (test results ordered by creation date desc, next_cursor)
         """
-        return self.repo.get_by_prompt(prompt_key, success_only, limit)
+        return await self.repo.get_by_prompt(prompt_key, success_only, limit, cursor)
 
-    async def get_recent_results(self, limit: int = 20) -> List[Dict[str, Any]]:
+    async def get_recent_results(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
         Get recent test results across all prompts
-        Includes prompt information via JOIN
+        Includes prompt kind/model via JOIN
 
         Args:
-            limit: Maximum number of results
+            limit: Page size
+            cursor: next_cursor from the previous page
 
         Returns:
-            List[Dict]: Recent test results with prompt info
+            Tuple[List[Dict], Optional[str]]: (recent test results, next_cursor)
         """
-        return self.repo.get_recent_results(limit)
+        return await self.repo.get_recent_results(limit, cursor)
 
-    async def get_failure_results(self, limit: int = 20) -> List[Dict[str, Any]]:
+    async def get_failure_results(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
         """
         Get recent failure results for debugging
         Only returns results with error messages
 
         Args:
-            limit: Maximum number of results
+            limit: Page size
+            cursor: next_cursor from the previous page
 
         Returns:
-            List[Dict]: Failed test results
+            Tuple[List[Dict], Optional[str]]: (failed test results, next_cursor)
         """
-        return self.repo.get_failure_results(limit)
+        return await self.repo.get_failure_results(limit, cursor)
 
     async def get_performance_stats(self, prompt_key: int) -> Dict[str, Any]:
         """
@@ -95,7 +126,7 @@ class TestResultService:
         Returns:
             Dict: Performance stats (avg/min/max execution time, tokens, cost)
         """
-        return self.repo.get_performance_stats(prompt_key)
+        return await self.repo.get_performance_stats(prompt_key)
 
     async def delete_test_result(self, test_result_key: int) -> bool:
         """
@@ -107,4 +138,4 @@ class TestResultService:
         Returns:
             bool: True if deleted
         """
-        return self.repo.delete(test_result_key)
+        return await self.repo.delete(test_result_key)
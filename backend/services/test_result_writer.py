@@ -0,0 +1,248 @@
+"""
+Test Result Writer
+prompt_test_results 비동기 쓰기 큐
+
+- 요청 경로에서는 큐에 넣고 즉시 반환 (test_result_key는 시퀀스에서 미리 예약)
+- 백그라운드 태스크가 multi-row INSERT 배치로 저장
+- 큐가 가득 차면 일정 시간 대기(backpressure) 후 드롭, 큐 깊이/드롭 수 메트릭 제공
+- 배치가 데이터 오류(FK 위반 등)로 실패하면 한 행씩 다시 저장하여 문제 행만 드롭
+- 반환된 key는 저장 전까지 임시 값: 조회/평가 생성은 wait_written()으로 저장(또는 드롭)을 기다림
+"""
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+import psycopg
+
+from repos.test_result_repo import TestResultRepository
+
+logger = logging.getLogger(__name__)
+
+
+class TestResultWriter:
+    """prompt_test_results 배치 쓰기 큐"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드"""
+        self.repo = TestResultRepository()
+        self.max_queue_size = max(1, int(os.getenv("TEST_RESULT_QUEUE_SIZE", 1000)))
+        self.batch_size = max(1, int(os.getenv("TEST_RESULT_BATCH_SIZE", 100)))
+        self.flush_interval = float(os.getenv("TEST_RESULT_FLUSH_INTERVAL", 1.0))
+        self.enqueue_timeout = float(os.getenv("TEST_RESULT_ENQUEUE_TIMEOUT", 0.5))
+        self.key_block_size = max(1, int(os.getenv("TEST_RESULT_KEY_BLOCK", 50)))
+        self.max_retries = max(0, int(os.getenv("TEST_RESULT_MAX_RETRIES", 3)))
+        self.wait_timeout = float(os.getenv("TEST_RESULT_WAIT_TIMEOUT", 5.0))
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._drainer: Optional[asyncio.Task] = None
+
+        # 미리 예약한 test_result_key
+        self._reserved_keys: List[int] = []
+        self._key_lock: Optional[asyncio.Lock] = None
+
+        # 큐에 있고 아직 저장되지 않은 key -> 저장/드롭 시 set
+        self._pending: Dict[int, asyncio.Event] = {}
+
+        self._stats = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "backpressure_waits": 0,
+            "dropped_queue_full": 0,
+            "dropped_write_failed": 0,
+            "last_batch_size": 0,
+            "last_batch_ms": 0.0
+        }
+
+    # ==================== Request Path ====================
+
+    async def submit(self, data: Dict[str, Any]) -> Optional[int]:
+        """
+        테스트 결과 저장 요청 (큐에 추가)
+
+        Args:
+            data: prompt_test_results 컬럼 값 (TestResultCreate.model_dump())
+
+        Returns:
+            Optional[int]: 예약된 test_result_key (드롭된 경우 None)
+                저장 전까지는 임시 key이므로, 이 key로 조회하기 전에 wait_written()을 호출
+        """
+        queue = self._ensure_queue()
+
+        try:
+            test_result_key = await self._next_key()
+        except Exception as e:
+            self._stats["dropped_write_failed"] += 1
+            logger.warning(f"Test result key reservation failed, result dropped: {str(e)}")
+            return None
+
+        row = {'test_result_key': test_result_key, **data, 'cre_date': datetime.now()}
+        if queue.full():
+            self._stats["backpressure_waits"] += 1
+        self._pending[test_result_key] = asyncio.Event()
+        try:
+            # 큐가 가득 차면 enqueue_timeout 동안 대기 (backpressure)
+            await asyncio.wait_for(queue.put(row), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self._pending.pop(test_result_key, None)
+            self._stats["dropped_queue_full"] += 1
+            logger.warning(f"Test result queue full ({self.max_queue_size}), result {test_result_key} dropped")
+            return None
+
+        self._stats["enqueued"] += 1
+        return test_result_key
+
+    async def wait_written(self, test_result_key: int) -> None:
+        """
+        큐에 있는 key가 저장(또는 드롭)될 때까지 대기 (최대 wait_timeout)
+
+        이 프로세스에서 제출한 key만 추적하며, 이미 저장됐거나 모르는 key는 바로 반환합니다.
+
+        Args:
+            test_result_key: submit()이 반환한 key
+        """
+        event = self._pending.get(test_result_key)
+        if event is None:
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Test result {test_result_key} not written within {self.wait_timeout}s")
+
+    async def _next_key(self) -> int:
+        """예약된 key 하나 꺼내기 (소진 시 key_block_size개 일괄 예약)"""
+        if self._key_lock is None:
+            self._key_lock = asyncio.Lock()
+
+        async with self._key_lock:
+            if not self._reserved_keys:
+                keys = await self.repo.reserve_keys(self.key_block_size)
+                self._reserved_keys = list(reversed(keys))
+            return self._reserved_keys.pop()
+
+    # ==================== Drain ====================
+
+    async def _drain_loop(self) -> None:
+        """큐에서 배치를 모아 저장 (batch_size개 또는 flush_interval 경과 시, None은 종료 신호)"""
+        while True:
+            row = await self._queue.get()
+            if row is None:
+                return
+
+            batch = [row]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._write_batch(batch)
+            if stopping:
+                return
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """배치 저장 (실패 시 재시도 후 드롭, 끝나면 wait_written 대기자 깨우기)"""
+        try:
+            await self._insert_batch(batch)
+        finally:
+            for row in batch:
+                event = self._pending.pop(row['test_result_key'], None)
+                if event is not None:
+                    event.set()
+
+    async def _insert_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """배치 INSERT (연결 오류는 재시도 후 드롭, 데이터 오류는 한 행씩 저장으로 전환)"""
+        started = time.time()
+        for attempt in range(self.max_retries + 1):
+            try:
+                written = await self.repo.create_many(batch)
+                break
+            except Exception as e:
+                if len(batch) > 1 and not self._is_transient(e):
+                    logger.warning(f"Test result batch ({len(batch)} rows) rejected, writing rows one by one: {str(e)}")
+                    written = await self._insert_rows(batch)
+                    break
+                if attempt >= self.max_retries:
+                    self._stats["dropped_write_failed"] += len(batch)
+                    logger.error(f"Test result batch ({len(batch)} rows) dropped after {attempt + 1} attempts: {str(e)}")
+                    return
+                logger.warning(f"Test result batch write failed (attempt {attempt + 1}): {str(e)}")
+                await asyncio.sleep(min(2 ** attempt, 10))
+
+        self._stats["batches"] += 1
+        self._stats["written"] += written
+        self._stats["last_batch_size"] = len(batch)
+        self._stats["last_batch_ms"] = round((time.time() - started) * 1000, 2)
+
+    async def _insert_rows(self, batch: List[Dict[str, Any]]) -> int:
+        """한 행씩 INSERT (실패한 행만 드롭, 연결 오류는 행마다 재시도)"""
+        written = 0
+        for row in batch:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    written += await self.repo.create_many([row])
+                    break
+                except Exception as e:
+                    if not self._is_transient(e) or attempt >= self.max_retries:
+                        self._stats["dropped_write_failed"] += 1
+                        logger.error(f"Test result {row['test_result_key']} dropped: {str(e)}")
+                        break
+                    await asyncio.sleep(min(2 ** attempt, 10))
+        return written
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """연결 / 풀 오류 (재시도하면 성공할 수 있음, PoolTimeout 포함)"""
+        return isinstance(error, (psycopg.OperationalError, psycopg.InterfaceError))
+
+    # ==================== Lifecycle ====================
+
+    def _ensure_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.create_task(self._drain_loop())
+        return self._queue
+
+    async def start(self) -> None:
+        """백그라운드 저장 태스크 시작"""
+        self._ensure_queue()
+
+    async def stop(self) -> None:
+        """큐에 남은 결과를 모두 저장한 뒤 저장 태스크 종료"""
+        if self._drainer is None or self._drainer.done():
+            return
+
+        await self._queue.put(None)
+        await self._drainer
+        self._drainer = None
+
+    # ==================== Stats ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """큐 상태 및 저장 카운터 반환"""
+        return {
+            **self._stats,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_size": self.max_queue_size,
+            "batch_size": self.batch_size,
+            "reserved_keys": len(self._reserved_keys),
+            "pending_keys": len(self._pending)
+        }
+
+
+# 싱글톤 인스턴스
+test_result_writer = TestResultWriter()
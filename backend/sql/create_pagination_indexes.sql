@@ -0,0 +1,64 @@
+-- =====================================================
+-- 목록 조회 커서 페이지네이션 인덱스
+-- =====================================================
+-- Purpose: (cre_date, pk) 최신순 키셋 페이지네이션
+--          WHERE 필터 + ORDER BY cre_date DESC, pk DESC + (cre_date, pk) < (커서) 조건을
+--          인덱스 범위 스캔 한 번으로 처리 (정렬 / OFFSET 건너뛰기 없음)
+-- 참고: 운영 DB에서는 잠금을 피하기 위해 CONCURRENTLY로 생성
+--       (트랜잭션 밖에서 문장 단위로 실행, 예: psql -f)
+-- =====================================================
+
+-- =====================================================
+-- 1. prompts
+-- =====================================================
+
+-- GET /api/prompts (전체)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prompts_cre_date_key
+    ON saeum_ai_api.prompts (cre_date DESC, prompt_key DESC)
+    WHERE delete_yn = 0;
+
+-- GET /api/prompts?promptKind=...
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_prompts_kind_cre_date_key
+    ON saeum_ai_api.prompts (prompt_kind, cre_date DESC, prompt_key DESC)
+    WHERE delete_yn = 0;
+
+-- =====================================================
+-- 2. prompt_test_results
+-- =====================================================
+
+-- GET /api/test-results/recent
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_test_results_cre_date_key
+    ON saeum_ai_api.prompt_test_results (cre_date DESC, test_result_key DESC)
+    WHERE delete_yn = 0;
+
+-- GET /api/test-results/prompt/{prompt_key}
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_test_results_prompt_cre_date_key
+    ON saeum_ai_api.prompt_test_results (prompt_key, cre_date DESC, test_result_key DESC)
+    WHERE delete_yn = 0;
+
+-- GET /api/test-results/failures (실패 행만 담는 부분 인덱스)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_test_results_failures_cre_date_key
+    ON saeum_ai_api.prompt_test_results (cre_date DESC, test_result_key DESC)
+    WHERE delete_yn = 0 AND success_yn = 0 AND error_msg IS NOT NULL;
+
+-- =====================================================
+-- 3. prompt_ratings
+-- =====================================================
+
+-- GET /api/prompts/{prompt_key}/ratings
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ratings_prompt_cre_date_key
+    ON saeum_ai_api.prompt_ratings (prompt_key, cre_date DESC, rating_key DESC)
+    WHERE delete_yn = 0;
+
+-- 최근 평가 목록 (전체 프롬프트)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ratings_cre_date_key
+    ON saeum_ai_api.prompt_ratings (cre_date DESC, rating_key DESC)
+    WHERE delete_yn = 0;
+
+-- =====================================================
+-- 완료
+-- =====================================================
+-- 생성된 인덱스: 7개
+-- 기존 단일 컬럼 인덱스(idx_test_results_date, idx_test_results_prompt, idx_ratings_prompt)는
+-- 다른 쿼리에서도 쓰이므로 유지
+-- =====================================================
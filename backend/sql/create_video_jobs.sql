@@ -0,0 +1,64 @@
+-- =====================================================
+-- Veo3 비디오 생성 작업 테이블 생성 스크립트
+-- =====================================================
+-- Purpose: 비디오 생성 작업 상태를 영속화하여
+--          WebSocket 연결 종료/서버 재시작 후에도 작업을 이어서 추적
+-- =====================================================
+
+CREATE SEQUENCE IF NOT EXISTS saeum_ai_api.video_jobs_seq START 1;
+
+CREATE TABLE IF NOT EXISTS saeum_ai_api.video_jobs (
+    -- Primary Key
+    video_job_key       bigint PRIMARY KEY DEFAULT nextval('saeum_ai_api.video_jobs_seq'),
+
+    -- 요청 정보
+    model_kind          character varying(50),             -- 'veo-3.1-generate-preview'
+    prompt_text         text NOT NULL,
+    has_last_frame_yn   smallint DEFAULT 0,
+
+    -- 작업 상태
+    operation_name      character varying(255),            -- Google long-running operation 이름
+    status_kind         character varying(20) NOT NULL DEFAULT 'pending',  -- pending, running, completed, failed
+    progress_pct        smallint DEFAULT 0,
+    poll_cnt            integer DEFAULT 0,
+    result_json         jsonb,                             -- 완료 결과 (video_uri, duration, metadata)
+    error_msg           text,
+
+    -- 폴링 담당 워커 (리스가 만료되면 다른 워커가 인수)
+    owner_id            character varying(100),
+    lease_until         timestamp with time zone,
+
+    -- 감사 컬럼
+    cre_date            timestamp with time zone DEFAULT CURRENT_TIMESTAMP,
+    cre_user_key        bigint,
+    upd_date            timestamp with time zone,
+    upd_user_key        bigint,
+    delete_yn           smallint DEFAULT 0
+);
+
+-- 인덱스 (재시작 시 진행 중 작업 복구용)
+CREATE INDEX IF NOT EXISTS idx_video_jobs_status
+    ON saeum_ai_api.video_jobs(status_kind)
+    WHERE delete_yn = 0;
+
+-- 테이블 코멘트
+COMMENT ON TABLE saeum_ai_api.video_jobs IS 'Veo3 비디오 생성 작업 상태';
+
+-- 컬럼 코멘트
+COMMENT ON COLUMN saeum_ai_api.video_jobs.video_job_key IS '비디오 작업 고유 식별자 (PK)';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.model_kind IS '사용된 비디오 생성 모델';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.prompt_text IS '비디오 생성 프롬프트';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.has_last_frame_yn IS '마지막 프레임 이미지 사용 여부 (0/1)';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.operation_name IS 'Google GenAI long-running operation 이름';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.status_kind IS '작업 상태 (pending, running, completed, failed)';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.progress_pct IS '진행률 (0~100)';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.poll_cnt IS '상태 조회 횟수';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.result_json IS '완료 결과 JSON (video_uri, duration, metadata)';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.error_msg IS '실패 시 에러 메시지';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.owner_id IS '폴링 담당 워커 프로세스 ID';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.lease_until IS '담당 워커 리스 만료 일시 (지나면 다른 워커가 인수)';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.cre_date IS '작업 생성 일시';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.cre_user_key IS '생성자 사용자 키';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.upd_date IS '수정 일시';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.upd_user_key IS '수정자 사용자 키';
+COMMENT ON COLUMN saeum_ai_api.video_jobs.delete_yn IS '삭제 여부 (0: 미삭제, 1: 삭제)';
@@ -0,0 +1,155 @@
+"""
+Prometheus Metrics
+/metrics 엔드포인트용 메트릭 (prometheus_client 기본 레지스트리)
+
+- MetricsMiddleware: 라우트 템플릿별 요청 지연 히스토그램, 진행 중 요청 게이지
+  (순수 ASGI, 요청당 label 조회 + observe 한 번 / 경로 파라미터 대신 템플릿을 써서 라벨 수 고정)
+- observe_external_call: 외부 API(Gemini, Veo) 호출 시도별 소요 시간 / 오류 수
+- register_collector: 서비스가 이미 들고 있는 get_stats() 값을 스크레이프 시점에만 읽어 노출
+  (DB 풀, 배경 제거 대기열, API 호출 제한기 등 → 요청 경로에는 비용 없음)
+"""
+import time
+import logging
+from typing import Callable, Iterable, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.metrics_core import Metric
+from prometheus_client.registry import Collector
+
+logger = logging.getLogger(__name__)
+
+# 이미지 생성 / 배경 제거는 수 초 ~ 수십 초 걸리므로 기본 버킷보다 넓게
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed",
+    ["method"]
+)
+EXTERNAL_API_DURATION = Histogram(
+    "external_api_call_duration_seconds",
+    "External API call attempt latency",
+    ["api", "model", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+EXTERNAL_API_ERRORS = Counter(
+    "external_api_errors_total",
+    "External API call attempts that failed",
+    ["api", "model", "reason"]
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def observe_external_call(api: str, model: str, seconds: float, error: Optional[Exception] = None,
+                          status_code: Optional[int] = None) -> None:
+    """
+    외부 API 호출 시도 하나 기록
+
+    Args:
+        api: API 이름 (gemini, veo, veo_operations 등)
+        model: 모델 이름
+        seconds: 소요 시간 (초)
+        error: 실패했으면 예외
+        status_code: HTTP 상태 코드 (있으면 reason으로 사용, 없으면 예외 클래스 이름)
+    """
+    EXTERNAL_API_DURATION.labels(api, model, "error" if error else "success").observe(seconds)
+    if error is not None:
+        EXTERNAL_API_ERRORS.labels(api, model, str(status_code) if status_code else type(error).__name__).inc()
+
+
+def _route_label(scope, root_path: str) -> str:
+    """매칭된 라우트 템플릿 (/videos/{video_name}), Mount는 접두어/*"""
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if path_format:
+        return path_format
+    mounted = scope.get("root_path", "")
+    if mounted != root_path and mounted.startswith(root_path):
+        return mounted[len(root_path):] + "/*"
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    요청 지연 / 진행 중 요청 ASGI 미들웨어
+
+    라우트는 응답이 끝난 뒤 scope에 남은 매칭 결과로 정하므로 라우팅을 다시 하지 않습니다.
+    WebSocket은 연결 유지 시간이 지연으로 잡히므로 제외합니다.
+    """
+
+    def __init__(self, app, exclude_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root_path = scope.get("root_path", "")
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_DURATION.labels(method, _route_label(scope, root_path), str(status_code)).observe(
+                time.perf_counter() - started
+            )
+
+
+class _CallbackCollector(Collector):
+    """스크레이프 시점 콜백 수집기"""
+
+    def __init__(self, name: str, collect: Callable[[], Iterable[Metric]]):
+        self.name = name
+        self._collect = collect
+
+    def describe(self) -> Iterable[Metric]:
+        # 등록 시 collect()가 호출되지 않도록 (지연 생성 서비스를 건드리지 않음)
+        return []
+
+    def collect(self) -> Iterable[Metric]:
+        # 한 서비스의 통계 오류 때문에 스크레이프 전체가 실패하지 않도록
+        try:
+            yield from self._collect()
+        except Exception as e:
+            logger.warning(f"Metrics collector {self.name} failed: {str(e)}")
+
+
+def register_collector(name: str, collect: Callable[[], Iterable[Metric]]) -> None:
+    """
+    스크레이프 시점에 호출할 메트릭 생성 함수 등록
+
+    Args:
+        name: 수집기 이름 (로그용)
+        collect: GaugeMetricFamily / CounterMetricFamily 등을 yield하는 함수
+    """
+    REGISTRY.register(_CallbackCollector(name, collect))
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    """
+    Prometheus 텍스트 포맷
+
+    Returns:
+        (본문, Content-Type)
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
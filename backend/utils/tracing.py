@@ -0,0 +1,311 @@
+"""
+Tracing Utility
+요청 단위 스테이지 타이밍 (Timer 기반 span)
+
+- span(name): with 블록 시간을 현재 트레이스에 기록 (중첩되면 parent로 연결)
+- collect_stages(): 블록 안에서 끝난 span 시간을 스테이지별로 합산 (테스트 결과 input_params용)
+- TracingMiddleware: 요청마다 트레이스 시작, Server-Timing / X-Trace-Id 헤더 추가, 완료 후 내보내기
+- SpanExporter: OpenTelemetry OTLP/JSON 형식(ExportTraceServiceRequest)으로 로컬 JSON Lines 파일에 기록
+  (OpenTelemetry Collector의 otlpjsonfile receiver 등으로 그대로 읽을 수 있음)
+- W3C traceparent 헤더가 있으면 트레이스 ID를 이어받음
+"""
+import os
+import json
+import time
+import queue
+import logging
+import secrets
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Iterator
+
+from utils.timer import Timer
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "saeum-ai-backend"
+
+
+class Span:
+    """트레이스 구간 하나"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.error: Optional[str] = None
+        self.timer = Timer()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return self.timer.elapsed() * 1000
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """OTLP/JSON span"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 2 if "http.method" in self.attributes else 1,  # SERVER / INTERNAL
+            "startTimeUnixNano": str(int(self.timer.start_time * 1e9)),
+            "endTimeUnixNano": str(int((self.timer.end_time or time.time()) * 1e9)),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items() if value is not None],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """요청 하나의 span 모음"""
+
+    def __init__(self, trace_id: Optional[str] = None, remote_parent_id: Optional[str] = None):
+        self.trace_id = trace_id or secrets.token_hex(16)
+        self.remote_parent_id = remote_parent_id
+        self.spans: List[Span] = []
+
+    def stage_ms(self, exclude: Optional[Span] = None) -> Dict[str, float]:
+        """완료된 span의 이름별 합계 (ms)"""
+        stages: Dict[str, float] = {}
+        for span in self.spans:
+            if span is not exclude and span.timer.end_time is not None:
+                stages[span.name] = stages.get(span.name, 0.0) + span.duration_ms
+        return stages
+
+    def server_timing(self, root: Span) -> str:
+        """Server-Timing 헤더 값 (스테이지별 합계 + total)"""
+        entries = [f"{name};dur={ms:.1f}" for name, ms in self.stage_ms(exclude=root).items()]
+        entries.append(f"total;dur={root.duration_ms:.1f}")
+        return ", ".join(entries)
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+_stage_collectors: contextvars.ContextVar[tuple] = contextvars.ContextVar("stage_collectors", default=())
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    스테이지 구간 측정
+
+    트레이스가 없는 곳(스크립트, 백그라운드 작업)에서도 사용할 수 있으며, 이때는 stage 수집만 합니다.
+
+    Args:
+        name: 스테이지 이름 (decode, prompt_lookup, gemini, rembg, crop, encode, db_write 등)
+        **attributes: span 속성
+
+    Yields:
+        Span (set_attribute로 속성 추가 가능)
+    """
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    current = Span(
+        name,
+        trace.trace_id if trace else "",
+        parent.span_id if parent else (trace.remote_parent_id if trace else None),
+        attributes
+    )
+    token = _current_span.set(current)
+    current.timer.start()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.timer.stop()
+        _current_span.reset(token)
+        if trace is not None:
+            trace.spans.append(current)
+        for stages in _stage_collectors.get():
+            stages[name] = stages.get(name, 0.0) + current.duration_ms
+
+
+@contextmanager
+def collect_stages() -> Iterator[Dict[str, float]]:
+    """
+    블록 안에서 끝난 span 시간을 스테이지별로 합산 (같은 태스크 및 그 안에서 만든 태스크 기준)
+
+    동시에 실행되는 작업(프롬프트 비교 후보 등)마다 따로 수집할 수 있도록 트레이스 전체가 아닌
+    현재 컨텍스트 기준으로 모읍니다.
+
+    Yields:
+        {스테이지 이름: ms} (블록 종료 시 값이 채워짐, 소수점 1자리로 반올림은 호출자 몫)
+    """
+    stages: Dict[str, float] = {}
+    token = _stage_collectors.set(_stage_collectors.get() + (stages,))
+    try:
+        yield stages
+    finally:
+        _stage_collectors.reset(token)
+
+
+def round_stages(stages: Dict[str, float]) -> Dict[str, float]:
+    """스테이지 합계를 ms 소수점 1자리로"""
+    return {name: round(ms, 1) for name, ms in stages.items()}
+
+
+def _parse_traceparent(value: Optional[str]) -> tuple:
+    """W3C traceparent (00-<trace id>-<parent id>-<flags>) → (trace_id, parent_id)"""
+    parts = (value or "").strip().split("-")
+    if len(parts) == 4 and len(parts[1]) == 32 and len(parts[2]) == 16 and parts[1] != "0" * 32:
+        try:
+            int(parts[1], 16)
+            int(parts[2], 16)
+            return parts[1].lower(), parts[2].lower()
+        except ValueError:
+            pass
+    return None, None
+
+
+# ==================== Exporter ====================
+
+class SpanExporter:
+    """OTLP/JSON 로컬 파일 내보내기 (백그라운드 스레드, 가득 차면 버림, 크기 상한 도달 시 로테이션)"""
+
+    def __init__(self):
+        """환경변수에서 설정 로드 (TRACE_EXPORT_PATH가 비어 있으면 비활성화, 기본값은 빈 값)"""
+        self.path = os.getenv("TRACE_EXPORT_PATH", "")
+        self.enabled = bool(self.path)
+        self.max_bytes = int(float(os.getenv("TRACE_EXPORT_MAX_MB", 100)) * 1024 * 1024)
+        self.backup_count = max(0, int(os.getenv("TRACE_EXPORT_BACKUPS", 3)))
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=max(1, int(os.getenv("TRACE_EXPORT_QUEUE_SIZE", 1000))))
+        self._thread: Optional[threading.Thread] = None
+        self._stats = {"exported": 0, "dropped": 0, "failed": 0}
+
+    def export(self, trace: Trace) -> None:
+        if not self.enabled or not trace.spans:
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self._stats["dropped"] += 1
+
+    def _run(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        while True:
+            traces = [self._queue.get()]
+            while len(traces) < 100:
+                try:
+                    traces.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._rotate_if_needed()
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for trace in traces:
+                        f.write(json.dumps(self._to_otlp(trace), ensure_ascii=False) + "\n")
+                self._stats["exported"] += len(traces)
+            except OSError as e:
+                self._stats["failed"] += len(traces)
+                logger.warning(f"Span export failed: {str(e)}")
+
+    def _rotate_if_needed(self) -> None:
+        """파일이 max_bytes를 넘으면 path.1 ... path.N으로 밀어내고 새 파일 시작 (RotatingFileHandler 방식)"""
+        if self.max_bytes <= 0 or not os.path.exists(self.path) or os.path.getsize(self.path) < self.max_bytes:
+            return
+        if self.backup_count == 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    @staticmethod
+    def _to_otlp(trace: Trace) -> Dict[str, Any]:
+        """ExportTraceServiceRequest (OTLP/JSON)"""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", SERVICE_NAME)]},
+                "scopeSpans": [{
+                    "scope": {"name": "utils.tracing"},
+                    "spans": [span.to_otlp() for span in trace.spans]
+                }]
+            }]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "queued": self._queue.qsize()
+        }
+
+
+# ==================== ASGI Middleware ====================
+
+class TracingMiddleware:
+    """
+    요청 트레이스 ASGI 미들웨어
+
+    - path_prefixes로 시작하는 HTTP 요청만 추적
+    - 응답 시작 시 그때까지 끝난 스테이지로 Server-Timing 헤더 작성
+      (스트리밍 응답은 헤더가 먼저 나가므로 total만 의미 있고, span은 완료 후 내보내기로 확인)
+    """
+
+    def __init__(self, app, path_prefixes: tuple = ("/api/",)):
+        self.app = app
+        self.path_prefixes = path_prefixes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        trace_id, parent_id = _parse_traceparent(headers.get(b"traceparent", b"").decode("latin-1"))
+        trace = Trace(trace_id, parent_id)
+        trace_token = _current_trace.set(trace)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"server-timing", trace.server_timing(root).encode("latin-1")),
+                    (b"x-trace-id", trace.trace_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            with span(f"{scope['method']} {scope['path']}", **{
+                "http.method": scope["method"],
+                "http.target": scope["path"]
+            }) as root:
+                await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(trace_token)
+            span_exporter.export(trace)
+
+
+# 싱글톤 인스턴스
+span_exporter = SpanExporter()
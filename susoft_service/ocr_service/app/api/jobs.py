@@ -0,0 +1,84 @@
+"""OCR Job API Endpoints (비동기 잡 모드)"""
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from app.models import OCRJobRequest, OCRJobResponse, ErrorResponse
+from app.auth import verify_token
+from app.api.ocr import validate_engine
+from app.jobs.queue import job_queue
+
+
+router = APIRouter(prefix="/ocr/jobs", tags=["OCR Jobs"])
+
+
+@router.post(
+    "",
+    response_model=OCRJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        200: {"model": OCRJobResponse, "description": "같은 idempotency_key의 기존 잡"},
+        401: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
+    },
+    summary="OCR 잡 등록",
+    description=(
+        "이미지 URL OCR을 대기열에 등록하고 바로 반환합니다. 별도 워커(python -m app.jobs.worker)가 처리하며, "
+        "결과는 GET /ocr/jobs/{job_id}로 조회하거나 callback_url로 전달받습니다. "
+        "같은 idempotency_key로 다시 요청하면 새 잡을 만들지 않고 기존 잡을 반환합니다."
+    )
+)
+async def create_ocr_job(
+    request: OCRJobRequest,
+    response: Response,
+    _token: Optional[str] = Depends(verify_token)
+):
+    """OCR 잡 등록 엔드포인트"""
+    if not request.file_url:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="'file_url' is required for job mode"
+        )
+
+    validate_engine(request.engine, request.use_layout)
+
+    try:
+        job, created = await job_queue.enqueue(
+            idempotency_key=request.idempotency_key,
+            engine=request.engine,
+            file_url=request.file_url,
+            callback_url=request.callback_url
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Job queue unavailable: {str(e)}"
+        )
+
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    response.headers["Location"] = f"/ocr/jobs/{job['job_id']}"
+    return OCRJobResponse(**job)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=OCRJobResponse,
+    responses={
+        401: {"model": ErrorResponse},
+        404: {"model": ErrorResponse}
+    },
+    summary="OCR 잡 조회",
+    description="잡 상태를 조회합니다. succeeded면 result에 /ocr/extract와 같은 형식의 결과가 포함됩니다."
+)
+async def get_ocr_job(
+    job_id: str,
+    _token: Optional[str] = Depends(verify_token)
+):
+    """OCR 잡 조회 엔드포인트"""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found (or expired): {job_id}"
+        )
+    return OCRJobResponse(**job)
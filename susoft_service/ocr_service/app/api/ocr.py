@@ -1,50 +1,46 @@
 """OCR API Endpoints"""
 import os
-import tempfile
+import asyncio
 import time
-from typing import Optional
+from typing import Optional, List, Dict, Tuple
 from fastapi import APIRouter, File, UploadFile, Form, Depends, HTTPException, status
-import httpx
-from app.models import OCRResponse, OCRRequest, ErrorResponse
+from app.models import OCRResponse, OCRRequest, ErrorResponse, OCRBatchItem, OCRBatchResponse
 from app.auth import verify_token
 from app.config import settings
 from app.cache.idempotency import idempotency_cache
-from app.ocr.paddle_engine import (
-    PaddleOCREngine, 
-    sort_blocks_by_reading_order,
-    filter_small_boxes
-)
-from app.ocr.google_vision_engine import GoogleVisionEngine
-from app.ocr.normalizer import normalize_blocks, generate_full_text
+from app.ocr.worker_pool import OCRQueueFull
+from app.ocr.image_input import ImageInput, prepare_image, cleanup_image
+from app.ocr.pipeline import run_engine, run_engine_batch, build_ocr_response
+from app.download.image_downloader import image_downloader, DownloadTooLarge
+from app.ocr.normalizer import generate_document_text
 
 
 router = APIRouter(prefix="/ocr", tags=["OCR"])
 
-# PaddleOCR 엔진 초기화 (싱글톤)
-_paddle_engine: Optional[PaddleOCREngine] = None
-_google_vision_engine: Optional[GoogleVisionEngine] = None
-
 
-def get_paddle_engine() -> PaddleOCREngine:
-    """PaddleOCR 엔진 싱글톤"""
-    global _paddle_engine
-    if _paddle_engine is None:
-        _paddle_engine = PaddleOCREngine(
-            lang="korean",
-            use_angle_cls=True
+def validate_engine(engine: str, use_layout: bool = False):
+    """엔진 / 옵션 검증 (실패 시 HTTPException)"""
+    if engine not in ["paddle", "gcv"]:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid engine. Must be 'paddle' or 'gcv'"
+        )
+    
+    if engine == "gcv":
+        if not settings.gcp_project or not settings.gcp_credentials_json:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Google Cloud Vision not configured. Set GCP_PROJECT and GCP_CREDENTIALS_JSON"
+            )
+    
+    if use_layout:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="LayoutParser not implemented yet (MVP: use_layout=false)"
         )
-    return _paddle_engine
-
-
-def get_google_vision_engine() -> GoogleVisionEngine:
-    """Google Vision 엔진 싱글톤"""
-    global _google_vision_engine
-    if _google_vision_engine is None:
-        _google_vision_engine = GoogleVisionEngine()
-    return _google_vision_engine
 
 
-async def download_file(url: str, max_size_mb: int = 20) -> str:
+async def download_file(url: str, max_size_mb: int = 20) -> bytes:
     """
     URL에서 파일 다운로드
     
@@ -53,25 +49,16 @@ async def download_file(url: str, max_size_mb: int = 20) -> str:
         max_size_mb: 최대 파일 크기 (MB)
         
     Returns:
-        임시 파일 경로
+        파일 내용
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.get(url)
-        response.raise_for_status()
-        
-        # 파일 크기 확인
-        content_length = response.headers.get("content-length")
-        if content_length and int(content_length) > max_size_mb * 1024 * 1024:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File size exceeds {max_size_mb}MB"
-            )
-        
-        # 임시 파일에 저장
-        suffix = os.path.splitext(url)[1] or ".jpg"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            tmp_file.write(response.content)
-            return tmp_file.name
+    try:
+        # 공유 연결 풀로 스트리밍 다운로드 (상한 초과 시 즉시 중단)
+        return await image_downloader.fetch(url, max_size_mb * 1024 * 1024)
+    except DownloadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size exceeds {max_size_mb}MB"
+        )
 
 
 @router.post(
@@ -81,7 +68,8 @@ async def download_file(url: str, max_size_mb: int = 20) -> str:
         401: {"model": ErrorResponse},
         413: {"model": ErrorResponse},
         422: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
     },
     summary="OCR 텍스트 추출",
     description="이미지에서 텍스트를 추출합니다. 파일 업로드 또는 URL 중 하나를 제공해야 합니다."
@@ -109,34 +97,18 @@ async def extract_ocr(
             detail="Provide only one of 'file' or 'file_url', not both"
         )
     
-    if engine not in ["paddle", "gcv"]:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Invalid engine. Must be 'paddle' or 'gcv'"
-        )
-    
-    if engine == "gcv":
-        if not settings.gcp_project or not settings.gcp_credentials_json:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Google Cloud Vision not configured. Set GCP_PROJECT and GCP_CREDENTIALS_JSON"
-            )
-    
-    if use_layout:
-        raise HTTPException(
-            status_code=status.HTTP_501_NOT_IMPLEMENTED,
-            detail="LayoutParser not implemented yet (MVP: use_layout=false)"
-        )
+    validate_engine(engine, use_layout)
     
     # 2. Idempotency 캐시 확인
     cached_result = await idempotency_cache.get(idempotency_key)
     if cached_result:
         return OCRResponse(**cached_result)
     
-    tmp_file_path = None
+    image = None
+    spill_threshold = settings.ocr_spill_mb * 1024 * 1024
     
     try:
-        # 3. 파일 준비
+        # 3. 파일 준비 (메모리에서 처리, 큰 파일만 임시 파일로)
         if file:
             # 파일 크기 확인
             content = await file.read()
@@ -146,59 +118,26 @@ async def extract_ocr(
                     detail=f"File size exceeds {settings.max_file_mb}MB"
                 )
             
-            # 임시 파일 저장
-            suffix = os.path.splitext(file.filename or "")[1] or ".jpg"
-            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-                tmp_file.write(content)
-                tmp_file_path = tmp_file.name
+            suffix = os.path.splitext(file.filename or "")[1]
         
         else:  # file_url
-            tmp_file_path = await download_file(file_url, settings.max_file_mb)
+            content = await download_file(file_url, settings.max_file_mb)
+            suffix = os.path.splitext(file_url)[1]
         
-        # 4. OCR 실행
-        start_time = time.time()
+        image = prepare_image(content, suffix, spill_threshold)
+        del content
         
-        if engine == "paddle":
-            paddle_engine = get_paddle_engine()
-            raw_blocks, ocr_duration_ms = paddle_engine.extract(tmp_file_path)
-            
-            # 블록 후처리
-            raw_blocks = filter_small_boxes(raw_blocks)
-            raw_blocks = sort_blocks_by_reading_order(raw_blocks)
-            
-            # 정규화
-            normalized_blocks = normalize_blocks(raw_blocks, page=1)
-            full_text = generate_full_text(normalized_blocks)
-        
-        elif engine == "gcv":
-            gcv_engine = get_google_vision_engine()
-            raw_blocks, ocr_duration_ms = gcv_engine.extract(tmp_file_path)
-            
-            # 블록 후처리
-            raw_blocks = filter_small_boxes(raw_blocks)
-            raw_blocks = sort_blocks_by_reading_order(raw_blocks)
-            
-            # 정규화
-            normalized_blocks = normalize_blocks(raw_blocks, page=1)
-            full_text = generate_full_text(normalized_blocks)
+        # 4. OCR 실행 (워커 풀 / 스레드에서 실행, 이벤트 루프는 다른 요청 처리)
+        start_time = time.time()
         
-        else:
+        if engine not in ("paddle", "gcv"):
             raise NotImplementedError(f"Unsupported engine: {engine}")
         
+        raw_blocks, timing = await run_engine(engine, image)
         total_duration_ms = int((time.time() - start_time) * 1000)
         
         # 5. 응답 생성
-        response_data = {
-            "engine": engine,
-            "full_text": full_text,
-            "blocks": [block.dict() for block in normalized_blocks],
-            "meta": {
-                "duration_ms": total_duration_ms,
-                "ocr_duration_ms": ocr_duration_ms,
-                "pages": 1
-            },
-            "idempotency_key": idempotency_key
-        }
+        response_data = build_ocr_response(engine, raw_blocks, timing, idempotency_key, total_duration_ms)
         
         # 6. 캐시 저장
         await idempotency_cache.set(idempotency_key, response_data)
@@ -208,6 +147,12 @@ async def extract_ocr(
     except HTTPException:
         raise
     
+    except OCRQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    
     except Exception as e:
         import traceback
         error_detail = f"OCR processing failed: {str(e)}"
@@ -219,10 +164,182 @@ async def extract_ocr(
         )
     
     finally:
-        # 임시 파일 정리
-        if tmp_file_path and os.path.exists(tmp_file_path):
-            try:
-                os.unlink(tmp_file_path)
-            except:
-                pass
+        # 임시 파일 정리 (임계값을 넘어 디스크로 내려쓴 경우만)
+        if image is not None:
+            cleanup_image(image)
+
 
+
+@router.post(
+    "/extract-batch",
+    response_model=OCRBatchResponse,
+    responses={
+        401: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
+    },
+    summary="배치 OCR 텍스트 추출",
+    description=(
+        "여러 이미지(공지 한 건의 이미지들)를 한 번에 처리합니다. "
+        "항목 순서는 files 다음 file_urls이며, idempotency_keys는 같은 순서로 항목마다 하나씩 제공해야 합니다. "
+        "항목별 결과와 페이지 순서대로 병합한 full_text를 반환합니다."
+    )
+)
+async def extract_ocr_batch(
+    idempotency_keys: List[str] = Form(..., description="항목별 중복 방지 키 (files 순서 → file_urls 순서)"),
+    engine: str = Form(default="paddle", description="OCR 엔진 (paddle|gcv)"),
+    files: Optional[List[UploadFile]] = File(default=None, description="이미지 파일들"),
+    file_urls: Optional[List[str]] = Form(default=None, description="이미지 URL들"),
+    _token: Optional[str] = Depends(verify_token)
+):
+    """배치 OCR 텍스트 추출 엔드포인트"""
+    start_time = time.time()
+    files = files or []
+    file_urls = file_urls or []
+    item_count = len(files) + len(file_urls)
+    
+    # 1. 입력 검증
+    if item_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="At least one of 'files' or 'file_urls' must be provided"
+        )
+    
+    if item_count > settings.ocr_batch_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Too many items: {item_count} (max {settings.ocr_batch_max_items})"
+        )
+    
+    if len(idempotency_keys) != item_count:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Expected {item_count} idempotency_keys, got {len(idempotency_keys)}"
+        )
+    
+    if len(set(idempotency_keys)) != item_count:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="idempotency_keys must be unique within a batch"
+        )
+    
+    validate_engine(engine)
+    
+    # 2. 항목별 Idempotency 캐시 확인
+    cached_results = await asyncio.gather(*(idempotency_cache.get(key) for key in idempotency_keys))
+    results: List[Optional[dict]] = list(cached_results)
+    errors: Dict[int, Tuple[int, str]] = {}
+    
+    max_bytes = settings.max_file_mb * 1024 * 1024
+    spill_threshold = settings.ocr_spill_mb * 1024 * 1024
+    images: Dict[int, ImageInput] = {}
+    
+    try:
+        # 3. 파일 준비 (캐시 미스 항목만, URL은 동시에 다운로드)
+        pending_urls = []
+        for index in range(item_count):
+            if results[index] is not None:
+                continue
+            if index < len(files):
+                upload = files[index]
+                content = await upload.read()
+                if len(content) > max_bytes:
+                    errors[index] = (status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, f"File size exceeds {settings.max_file_mb}MB")
+                    continue
+                images[index] = prepare_image(content, os.path.splitext(upload.filename or "")[1], spill_threshold)
+            else:
+                pending_urls.append(index)
+        
+        downloads = await asyncio.gather(
+            *(download_file(file_urls[index - len(files)], settings.max_file_mb) for index in pending_urls),
+            return_exceptions=True
+        )
+        for index, content in zip(pending_urls, downloads):
+            if isinstance(content, HTTPException):
+                errors[index] = (content.status_code, str(content.detail))
+            elif isinstance(content, BaseException):
+                errors[index] = (status.HTTP_500_INTERNAL_SERVER_ERROR, f"Download failed: {str(content)}")
+            else:
+                url = file_urls[index - len(files)]
+                images[index] = prepare_image(content, os.path.splitext(url)[1], spill_threshold)
+        del downloads
+        
+        # 4. OCR 실행 (모든 항목을 워커 풀에 한 번에 제출)
+        ocr_indexes = sorted(images)
+        engine_results = await run_engine_batch(engine, [images[index] for index in ocr_indexes]) if ocr_indexes else []
+        duration_ms = int((time.time() - start_time) * 1000)
+        
+        new_results = {}
+        for index, engine_result in zip(ocr_indexes, engine_results):
+            if isinstance(engine_result, BaseException):
+                errors[index] = (status.HTTP_500_INTERNAL_SERVER_ERROR, f"OCR processing failed: {str(engine_result)}")
+                continue
+            raw_blocks, timing = engine_result
+            new_results[index] = build_ocr_response(engine, raw_blocks, timing, idempotency_keys[index], duration_ms)
+        
+        # 5. 캐시 저장 (단건 API와 같은 키 / 형식)
+        await asyncio.gather(*(
+            idempotency_cache.set(idempotency_keys[index], response_data)
+            for index, response_data in new_results.items()
+        ))
+        results = [new_results.get(index, result) for index, result in enumerate(results)]
+    
+    except HTTPException:
+        raise
+    
+    except OCRQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    
+    except Exception as e:
+        import traceback
+        error_detail = f"Batch OCR processing failed: {str(e)}"
+        print(f"ERROR: {error_detail}")
+        print(traceback.format_exc())
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_detail
+        )
+    
+    finally:
+        # 임시 파일 정리 (임계값을 넘어 디스크로 내려쓴 경우만)
+        for image in images.values():
+            cleanup_image(image)
+    
+    # 6. 항목별 결과 + 페이지 병합 (항목 순서 = 페이지 번호)
+    items = []
+    document_blocks = []
+    for index, key in enumerate(idempotency_keys):
+        page = index + 1
+        if index in errors:
+            status_code, error = errors[index]
+            items.append(OCRBatchItem(
+                index=index, page=page, idempotency_key=key,
+                status="error", error=error, status_code=status_code
+            ))
+            continue
+        
+        result = OCRResponse(**results[index])
+        result.blocks = [block.copy(update={"page": page}) for block in result.blocks]
+        document_blocks.extend(result.blocks)
+        items.append(OCRBatchItem(
+            index=index, page=page, idempotency_key=key,
+            status="ok", cached=cached_results[index] is not None, result=result
+        ))
+    
+    succeeded = sum(1 for item in items if item.status == "ok")
+    return OCRBatchResponse(
+        engine=engine,
+        full_text=generate_document_text(document_blocks),
+        items=items,
+        meta={
+            "duration_ms": int((time.time() - start_time) * 1000),
+            "pages": item_count,
+            "succeeded": succeeded,
+            "failed": item_count - succeeded,
+            "cached": sum(1 for result in cached_results if result is not None)
+        }
+    )
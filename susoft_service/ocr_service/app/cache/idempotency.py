@@ -3,6 +3,7 @@ import json
 from typing import Optional
 import redis.asyncio as redis
 from app.config import settings
+from app.metrics import IDEMPOTENCY_CACHE_LOOKUPS
 
 
 class IdempotencyCache:
@@ -48,7 +49,9 @@ class IdempotencyCache:
         cached = await self.redis_client.get(key)
         
         if cached:
+            IDEMPOTENCY_CACHE_LOOKUPS.labels("hit").inc()
             return json.loads(cached)
+        IDEMPOTENCY_CACHE_LOOKUPS.labels("miss").inc()
         return None
     
     async def set(self, idempotency_key: str, result: dict):
@@ -11,6 +11,32 @@ class Settings(BaseSettings):
     use_layout: bool = False
     max_file_mb: int = 20
     
+    # OCR Worker Pool (PaddleOCR는 워커 프로세스마다 모델 하나씩 로드)
+    ocr_workers: int = 2
+    ocr_worker_threads: int = 1  # 워커당 OMP/MKL 스레드 수 (ocr_workers x 이 값 <= CPU 코어 수 권장)
+    ocr_max_queue: int = 16  # 워커 수를 넘어 대기할 수 있는 요청 수 (초과 시 503)
+    ocr_mp_start_method: str = "spawn"
+    ocr_batch_max_items: int = 10  # /ocr/extract-batch 최대 이미지 수 (ocr_workers + ocr_max_queue 이하여야 503 없이 처리)
+    ocr_spill_mb: int = 8  # 이 크기를 넘는 이미지만 임시 파일을 거쳐 엔진에 전달 (이하는 메모리에서 처리)
+    
+    # URL Download (앱 수명 동안 HTTP 연결 풀 공유)
+    download_timeout: float = 30.0
+    download_max_connections: int = 50
+    download_per_host_limit: int = 4  # 같은 호스트 동시 다운로드 수
+    download_http2: bool = True  # h2 패키지가 없으면 HTTP/1.1
+    download_cache_mb: int = 64  # ETag / Last-Modified 조건부 GET 캐시 크기 (0이면 사용 안 함)
+    
+    # OCR Job Queue (POST /ocr/jobs → Redis 대기열 → 별도 워커 프로세스: python -m app.jobs.worker)
+    ocr_job_concurrency: int = 2  # 워커 프로세스당 동시 처리 잡 수
+    ocr_job_max_attempts: int = 3  # 초과 시 dead-letter 큐로 이동
+    ocr_job_retry_backoff: float = 5.0  # 재시도 대기 (초, 시도마다 2배)
+    ocr_job_lease_seconds: int = 60  # 워커 heartbeat 만료 시간 (만료되면 처리 중이던 잡을 다시 대기열로)
+    ocr_job_ttl: int = 86400  # 잡 상태 / 결과 보관 시간 (초)
+    ocr_job_dead_max: int = 1000  # dead-letter 목록 최대 길이 (오래된 항목부터 제거)
+    ocr_job_callback_timeout: float = 10.0
+    ocr_job_callback_attempts: int = 3
+    ocr_job_metrics_port: int = 0  # 워커 프로세스 Prometheus 포트 (0이면 사용 안 함)
+    
     # Redis
     redis_url: str = "redis://localhost:6379"
     redis_cache_ttl: int = 3600
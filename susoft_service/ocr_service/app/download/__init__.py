@@ -0,0 +1 @@
+"""Download Module"""
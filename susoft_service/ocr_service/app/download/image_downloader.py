@@ -0,0 +1,192 @@
+"""Image URL Downloader"""
+import asyncio
+import logging
+import importlib.util
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+from urllib.parse import urlsplit
+import httpx
+from app.config import settings
+from app.metrics import IMAGE_DOWNLOADS
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadTooLarge(Exception):
+    """다운로드가 크기 상한을 넘었을 때 발생 (API에서 413으로 변환)"""
+
+
+@dataclass
+class CachedImage:
+    """조건부 GET 캐시 항목"""
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class HostLimiter:
+    """호스트별 동시 다운로드 제한 (사용 중인 호스트만 세마포어 유지)"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._slots: Dict[str, list] = {}  # host -> [세마포어, 사용자 수]
+
+    @asynccontextmanager
+    async def acquire(self, host: str):
+        """호스트 슬롯 확보 (대기자가 없어지면 세마포어 제거)"""
+        slot = self._slots.get(host)
+        if slot is None:
+            slot = self._slots[host] = [asyncio.Semaphore(self.limit), 0]
+        slot[1] += 1
+        try:
+            async with slot[0]:
+                yield
+        finally:
+            slot[1] -= 1
+            if slot[1] == 0:
+                self._slots.pop(host, None)
+
+    @property
+    def active_hosts(self) -> int:
+        return len(self._slots)
+
+
+class ImageDownloader:
+    """
+    이미지 URL 다운로더
+
+    - 앱 수명 동안 AsyncClient 하나를 공유 (keep-alive / HTTP/2 연결 재사용)
+    - 스트리밍으로 받으면서 크기 상한을 넘는 즉시 중단 (chunked 응답 포함)
+    - 호스트별 동시 다운로드 제한
+    - ETag / Last-Modified 조건부 GET 캐시 (같은 URL 재요청 시 304면 본문 재사용)
+    """
+
+    def __init__(self):
+        self.timeout = settings.download_timeout
+        self.max_connections = settings.download_max_connections
+        self.http2 = settings.download_http2
+        self.cache_max_bytes = settings.download_cache_mb * 1024 * 1024
+
+        self.client: Optional[httpx.AsyncClient] = None
+        self.http2_active = False
+        self.host_limiter = HostLimiter(max(1, settings.download_per_host_limit))
+        self._cache: "OrderedDict[str, CachedImage]" = OrderedDict()
+        self._cache_bytes = 0
+
+    async def start(self):
+        """공유 HTTP 클라이언트 생성"""
+        if self.client is not None:
+            return
+        http2 = self.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("DOWNLOAD_HTTP2 is enabled but 'h2' is not installed, falling back to HTTP/1.1")
+            http2 = False
+        self.http2_active = http2
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=30.0
+            ),
+            follow_redirects=True
+        )
+
+    async def close(self):
+        """HTTP 클라이언트 종료"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def fetch(self, url: str, max_bytes: int) -> bytes:
+        """
+        URL 내용 다운로드
+
+        Args:
+            url: 파일 URL
+            max_bytes: 최대 크기 (바이트)
+
+        Returns:
+            파일 내용
+
+        Raises:
+            DownloadTooLarge: Content-Length 또는 실제 수신량이 상한을 넘은 경우
+            httpx.HTTPError: 연결 실패 / 4xx / 5xx
+        """
+        if self.client is None:
+            await self.start()
+
+        cached = self._cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        host = urlsplit(url).netloc.lower()
+        try:
+            async with self.host_limiter.acquire(host):
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    if response.status_code == 304 and cached is not None:
+                        self._cache.move_to_end(url)
+                        IMAGE_DOWNLOADS.labels("not_modified").inc()
+                        return cached.content
+
+                    response.raise_for_status()
+
+                    content_length = response.headers.get("content-length")
+                    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                        raise DownloadTooLarge(f"Content-Length {content_length} exceeds {max_bytes} bytes")
+
+                    buffer = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        buffer.extend(chunk)
+                        if len(buffer) > max_bytes:
+                            raise DownloadTooLarge(f"Download exceeds {max_bytes} bytes")
+                    content = bytes(buffer)
+
+                    self._store(url, content, response.headers.get("etag"), response.headers.get("last-modified"))
+        except DownloadTooLarge:
+            IMAGE_DOWNLOADS.labels("too_large").inc()
+            raise
+        except Exception:
+            IMAGE_DOWNLOADS.labels("error").inc()
+            raise
+
+        IMAGE_DOWNLOADS.labels("downloaded").inc()
+        return content
+
+    def _store(self, url: str, content: bytes, etag: Optional[str], last_modified: Optional[str]):
+        """검증자(ETag / Last-Modified)가 있는 응답만 캐시 (LRU, 전체 크기 상한)"""
+        old = self._cache.pop(url, None)
+        if old is not None:
+            self._cache_bytes -= len(old.content)
+        if not (etag or last_modified) or len(content) > self.cache_max_bytes:
+            return
+
+        self._cache[url] = CachedImage(content=content, etag=etag, last_modified=last_modified)
+        self._cache_bytes += len(content)
+        while self._cache_bytes > self.cache_max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted.content)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """연결 / 캐시 상태"""
+        return {
+            "started": self.client is not None,
+            "http2": self.http2_active,
+            "max_connections": self.max_connections,
+            "per_host_limit": self.host_limiter.limit,
+            "active_hosts": self.host_limiter.active_hosts,
+            "cache_entries": len(self._cache),
+            "cache_bytes": self._cache_bytes,
+            "cache_max_bytes": self.cache_max_bytes
+        }
+
+
+# 전역 다운로더 인스턴스
+image_downloader = ImageDownloader()
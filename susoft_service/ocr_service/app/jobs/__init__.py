@@ -0,0 +1 @@
+"""OCR Job Queue Module"""
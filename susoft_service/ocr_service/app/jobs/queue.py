@@ -0,0 +1,293 @@
+"""OCR Job Queue (Redis)"""
+import json
+import time
+import uuid
+from typing import Optional, Dict, Any, Tuple
+from redis.exceptions import WatchError
+from app.config import settings
+from app.cache.idempotency import idempotency_cache
+
+# 대기열 (LPUSH로 넣고 오른쪽에서 꺼냄)
+PENDING_KEY = "ocr:jobs:pending"
+# 재시도 대기 (ZSET: job_id -> 재시도 시각)
+DELAYED_KEY = "ocr:jobs:delayed"
+# 최대 시도 횟수를 넘긴 잡 (dead-letter)
+DEAD_KEY = "ocr:jobs:dead"
+# 실행 중인 워커 ID
+WORKERS_KEY = "ocr:jobs:workers"
+
+# 더 이상 처리하지 않는 상태
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+INT_FIELDS = ("attempts", "max_attempts")
+FLOAT_FIELDS = ("created_at", "updated_at")
+
+
+class JobQueue:
+    """
+    Redis 기반 OCR 잡 대기열 (IdempotencyCache와 같은 Redis 사용)
+
+    - 워커는 BLMOVE로 대기열에서 자기 처리 목록(processing:{worker_id})으로 잡을 옮겨 처리
+    - heartbeat가 끊긴 워커의 처리 목록은 다른 워커가 재시도로 돌려놓음
+    - 실패 시 지수 백오프로 재시도, max_attempts를 넘기면 dead-letter 목록으로 이동
+    - 같은 idempotency_key는 잡 하나에만 연결 (보관 기간 동안 재요청 시 기존 잡 반환)
+    """
+
+    def __init__(self):
+        self.ttl = settings.ocr_job_ttl
+        self.max_attempts = max(1, settings.ocr_job_max_attempts)
+        self.retry_backoff = settings.ocr_job_retry_backoff
+        self.lease_seconds = settings.ocr_job_lease_seconds
+        self.dead_max = max(1, settings.ocr_job_dead_max)
+
+    async def _redis(self):
+        """IdempotencyCache의 Redis 클라이언트 (없으면 연결)"""
+        if not idempotency_cache.redis_client:
+            await idempotency_cache.connect()
+        return idempotency_cache.redis_client
+
+    def _job_key(self, job_id: str) -> str:
+        return f"ocr:job:{job_id}"
+
+    def _key_index(self, idempotency_key: str) -> str:
+        return f"ocr:jobs:by_key:{idempotency_key}"
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"ocr:jobs:processing:{worker_id}"
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f"ocr:jobs:worker:{worker_id}"
+
+    def _decode(self, job_id: str, fields: Dict[str, str]) -> Dict[str, Any]:
+        """Redis 해시를 잡 dict로 변환"""
+        job: Dict[str, Any] = {"job_id": job_id}
+        for name, value in fields.items():
+            if name in INT_FIELDS:
+                job[name] = int(value)
+            elif name in FLOAT_FIELDS:
+                job[name] = float(value)
+            elif name == "result":
+                job[name] = json.loads(value)
+            else:
+                job[name] = value or None
+        return job
+
+    async def enqueue(
+        self,
+        idempotency_key: str,
+        engine: str,
+        file_url: str,
+        callback_url: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        잡 등록
+
+        Args:
+            idempotency_key: Idempotency 키 (키당 잡 하나)
+            engine: OCR 엔진
+            file_url: 이미지 URL
+            callback_url: 완료 시 결과를 POST할 URL
+
+        Returns:
+            (잡, 새로 만들었는지 여부) - 같은 키의 잡이 있으면 기존 잡 반환
+        """
+        r = await self._redis()
+        job_id = uuid.uuid4().hex
+        index_key = self._key_index(idempotency_key)
+
+        now = time.time()
+        fields = {
+            "status": "queued",
+            "idempotency_key": idempotency_key,
+            "engine": engine,
+            "file_url": file_url,
+            "callback_url": callback_url or "",
+            "attempts": 0,
+            "max_attempts": self.max_attempts,
+            "created_at": now,
+            "updated_at": now
+        }
+        # 인덱스를 WATCH하고 잡 해시 + 인덱스 + 대기열을 한 트랜잭션으로 기록
+        # (동시에 같은 키로 요청해도 하나만 성공하고 나머지는 재시도 시 기존 잡을 반환)
+        async with r.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(index_key)
+                    existing_id = await pipe.get(index_key)
+                    if existing_id and await pipe.exists(self._job_key(existing_id)):
+                        existing = await self.get(existing_id)
+                        if existing is not None:
+                            await pipe.reset()
+                            return existing, False
+                    # 인덱스가 없거나, 잡 해시가 만료되어 인덱스만 남은 경우 새 잡 생성
+                    pipe.multi()
+                    pipe.hset(self._job_key(job_id), mapping=fields)
+                    pipe.expire(self._job_key(job_id), self.ttl)
+                    pipe.set(index_key, job_id, ex=self.ttl)
+                    pipe.lpush(PENDING_KEY, job_id)
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    continue
+
+        return self._decode(job_id, {name: str(value) for name, value in fields.items()}), True
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """잡 조회 (없거나 만료되면 None)"""
+        if not job_id:
+            return None
+        r = await self._redis()
+        fields = await r.hgetall(self._job_key(job_id))
+        if not fields:
+            return None
+        return self._decode(job_id, fields)
+
+    # ==================== Worker ====================
+
+    async def claim(self, worker_id: str, timeout: float) -> Optional[str]:
+        """대기열에서 잡 하나를 워커 처리 목록으로 이동 (timeout 동안 대기)"""
+        r = await self._redis()
+        return await r.blmove(PENDING_KEY, self._processing_key(worker_id), timeout, "RIGHT", "LEFT")
+
+    async def start(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """처리 시작 (시도 횟수 증가, 만료되었거나 이미 끝난 잡이면 None)"""
+        r = await self._redis()
+        job_key = self._job_key(job_id)
+        status = await r.hget(job_key, "status")
+        if status is None or status in TERMINAL_STATUSES:
+            return None
+        async with r.pipeline(transaction=True) as pipe:
+            pipe.hincrby(job_key, "attempts", 1)
+            pipe.hset(job_key, mapping={"status": "processing", "updated_at": time.time()})
+            await pipe.execute()
+        return await self.get(job_id)
+
+    async def complete(self, worker_id: str, job_id: str, result: dict):
+        """성공 처리 (결과 저장 후 처리 목록에서 제거, 잡과 키 인덱스 보관 기간 갱신)"""
+        r = await self._redis()
+        job = await self.get(job_id)
+        async with r.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping={
+                "status": "succeeded",
+                "result": json.dumps(result, ensure_ascii=False),
+                "error": "",
+                "updated_at": time.time()
+            })
+            pipe.expire(self._job_key(job_id), self.ttl)
+            if job is not None:
+                # 인덱스가 잡보다 먼저 만료되면 같은 키로 새 잡이 생기므로 함께 연장
+                pipe.expire(self._key_index(job["idempotency_key"]), self.ttl)
+            pipe.lrem(self._processing_key(worker_id), 1, job_id)
+            await pipe.execute()
+
+    async def fail(self, worker_id: Optional[str], job_id: str, error: str, retryable: bool = True) -> str:
+        """
+        실패 처리 (재시도 예약 또는 dead-letter 이동)
+
+        Args:
+            worker_id: 처리 중이던 워커 (이미 처리 목록에서 꺼낸 경우 None)
+            job_id: 잡 ID
+            error: 실패 사유
+            retryable: 재시도 가능 여부 (False면 바로 dead-letter)
+
+        Returns:
+            변경된 상태 (retrying|failed), 잡이 만료되었거나 이미 끝났으면 ""
+        """
+        r = await self._redis()
+        job = await self.get(job_id)
+        async with r.pipeline(transaction=True) as pipe:
+            if worker_id is not None:
+                pipe.lrem(self._processing_key(worker_id), 1, job_id)
+            if job is None or job.get("status") in TERMINAL_STATUSES:
+                # 만료되었거나, 회수 전에 원래 워커가 이미 완료한 잡
+                await pipe.execute()
+                return ""
+
+            attempts = job.get("attempts", 0)
+            if retryable and attempts < job.get("max_attempts", self.max_attempts):
+                status = "retrying"
+                delay = self.retry_backoff * (2 ** max(0, attempts - 1))
+                pipe.zadd(DELAYED_KEY, {job_id: time.time() + delay})
+            else:
+                status = "failed"
+                pipe.lpush(DEAD_KEY, job_id)
+                pipe.ltrim(DEAD_KEY, 0, self.dead_max - 1)
+            pipe.hset(self._job_key(job_id), mapping={"status": status, "error": error, "updated_at": time.time()})
+            await pipe.execute()
+        return status
+
+    async def drop(self, worker_id: str, job_id: str):
+        """만료된 잡을 처리 목록에서 제거"""
+        r = await self._redis()
+        await r.lrem(self._processing_key(worker_id), 1, job_id)
+
+    async def set_callback_status(self, job_id: str, callback_status: str):
+        """콜백 전송 결과 기록 (delivered|failed)"""
+        r = await self._redis()
+        job_key = self._job_key(job_id)
+        if await r.exists(job_key):
+            await r.hset(job_key, "callback_status", callback_status)
+
+    async def promote_delayed(self, batch_size: int = 100) -> int:
+        """재시도 시각이 된 잡을 대기열로 이동"""
+        r = await self._redis()
+        due = await r.zrangebyscore(DELAYED_KEY, 0, time.time(), start=0, num=batch_size)
+        promoted = 0
+        for job_id in due:
+            # 여러 워커가 동시에 옮기려 해도 ZREM에 성공한 한 곳만 대기열에 넣음
+            if await r.zrem(DELAYED_KEY, job_id):
+                status = await r.hget(self._job_key(job_id), "status")
+                if status is None or status in TERMINAL_STATUSES:
+                    # 재시도 대기 중 만료된 잡 (HSET으로 status만 있는 해시를 만들지 않음), 또는
+                    # 회수된 뒤 원래 워커가 완료한 잡 (다시 처리하면 콜백이 두 번 감)
+                    continue
+                async with r.pipeline(transaction=True) as pipe:
+                    pipe.lpush(PENDING_KEY, job_id)
+                    pipe.hset(self._job_key(job_id), "status", "queued")
+                    await pipe.execute()
+                promoted += 1
+        return promoted
+
+    async def heartbeat(self, worker_id: str):
+        """워커 생존 신호 (lease_seconds 안에 다시 보내지 않으면 처리 중 잡을 회수)"""
+        r = await self._redis()
+        await r.set(self._heartbeat_key(worker_id), "1", ex=self.lease_seconds)
+        await r.sadd(WORKERS_KEY, worker_id)
+
+    async def unregister(self, worker_id: str):
+        """정상 종료한 워커 등록 해제"""
+        r = await self._redis()
+        await r.srem(WORKERS_KEY, worker_id)
+        await r.delete(self._heartbeat_key(worker_id))
+
+    async def recover_lost_workers(self) -> int:
+        """heartbeat가 끊긴 워커의 처리 중 잡을 재시도(또는 dead-letter)로 돌려놓음"""
+        r = await self._redis()
+        recovered = 0
+        for worker_id in await r.smembers(WORKERS_KEY):
+            if await r.exists(self._heartbeat_key(worker_id)):
+                continue
+            processing_key = self._processing_key(worker_id)
+            while True:
+                job_id = await r.rpop(processing_key)
+                if job_id is None:
+                    break
+                await self.fail(None, job_id, f"Worker {worker_id} stopped while processing")
+                recovered += 1
+            await r.srem(WORKERS_KEY, worker_id)
+        return recovered
+
+    async def get_stats(self) -> Dict[str, int]:
+        """대기열 길이"""
+        r = await self._redis()
+        async with r.pipeline(transaction=False) as pipe:
+            pipe.llen(PENDING_KEY)
+            pipe.zcard(DELAYED_KEY)
+            pipe.llen(DEAD_KEY)
+            pipe.scard(WORKERS_KEY)
+            pending, delayed, dead, workers = await pipe.execute()
+        return {"pending": pending, "delayed": delayed, "dead": dead, "workers": workers}
+
+
+# 전역 잡 대기열 인스턴스
+job_queue = JobQueue()
@@ -0,0 +1,213 @@
+"""OCR Job Worker (실행: python -m app.jobs.worker)"""
+import os
+import time
+import signal
+import socket
+import asyncio
+import logging
+import uuid
+from typing import Optional, Dict, Any
+import httpx
+from prometheus_client import start_http_server
+from app.config import settings
+from app.cache.idempotency import idempotency_cache
+from app.metrics import OCR_JOBS
+from app.download.image_downloader import image_downloader, DownloadTooLarge
+from app.ocr.image_input import prepare_image, cleanup_image
+from app.ocr.pipeline import run_engine, build_ocr_response
+from app.ocr.worker_pool import ocr_worker_pool
+from app.jobs.queue import job_queue
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentJobError(Exception):
+    """재시도해도 성공할 수 없는 실패 (바로 dead-letter)"""
+
+
+async def process_job(job: Dict[str, Any]) -> dict:
+    """
+    잡 하나 처리 (단건 API와 같은 idempotency 캐시 사용)
+
+    Args:
+        job: 잡 정보
+
+    Returns:
+        OCRResponse 형식 dict
+
+    Raises:
+        PermanentJobError: 크기 초과, 4xx 응답, 디코딩 불가 이미지
+    """
+    idempotency_key = job["idempotency_key"]
+    cached = await idempotency_cache.get(idempotency_key)
+    if cached:
+        return cached
+
+    url = job["file_url"]
+    try:
+        content = await image_downloader.fetch(url, settings.max_file_mb * 1024 * 1024)
+    except DownloadTooLarge:
+        raise PermanentJobError(f"File size exceeds {settings.max_file_mb}MB")
+    except httpx.HTTPStatusError as e:
+        status_code = e.response.status_code
+        if 400 <= status_code < 500 and status_code not in (408, 429):
+            raise PermanentJobError(f"Download failed: HTTP {status_code}")
+        raise
+
+    image = prepare_image(content, os.path.splitext(url)[1], settings.ocr_spill_mb * 1024 * 1024)
+    del content
+    try:
+        start_time = time.time()
+        try:
+            raw_blocks, timing = await run_engine(job["engine"], image)
+        except ValueError as e:
+            raise PermanentJobError(str(e))
+        response_data = build_ocr_response(
+            job["engine"], raw_blocks, timing, idempotency_key, int((time.time() - start_time) * 1000)
+        )
+    finally:
+        cleanup_image(image)
+
+    await idempotency_cache.set(idempotency_key, response_data)
+    return response_data
+
+
+class JobWorker:
+    """Redis 대기열 소비 워커 (프로세스당 ocr_job_concurrency개 잡 동시 처리)"""
+
+    def __init__(self, concurrency: int):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.concurrency = max(1, concurrency)
+        self.maintenance_interval = max(1.0, settings.ocr_job_lease_seconds / 3)
+        self.callback_client: Optional[httpx.AsyncClient] = None
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """종료 요청 (처리 중인 잡은 끝까지 처리)"""
+        logger.info("Stopping OCR job worker...")
+        self._stopping.set()
+
+    async def run(self):
+        """워커 실행 (stop() 호출 시 종료)"""
+        await idempotency_cache.connect()
+        await image_downloader.start()
+        self.callback_client = httpx.AsyncClient(timeout=settings.ocr_job_callback_timeout)
+        if settings.ocr_engine == "paddle":
+            try:
+                await ocr_worker_pool.start()
+            except Exception as e:
+                logger.warning(f"OCR worker warmup failed: {e}")
+
+        await job_queue.heartbeat(self.worker_id)
+        logger.info(f"OCR job worker started: id={self.worker_id}, concurrency={self.concurrency}")
+
+        maintenance = asyncio.create_task(self._maintain())
+        consumers = [asyncio.create_task(self._consume()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*consumers)
+        finally:
+            maintenance.cancel()
+            await job_queue.unregister(self.worker_id)
+            await self.callback_client.aclose()
+            await image_downloader.close()
+            ocr_worker_pool.shutdown()
+            await idempotency_cache.disconnect()
+            logger.info("OCR job worker stopped")
+
+    async def _maintain(self):
+        """heartbeat, 재시도 잡 이동, 중단된 워커의 잡 회수"""
+        while True:
+            try:
+                await job_queue.heartbeat(self.worker_id)
+                await job_queue.promote_delayed()
+                recovered = await job_queue.recover_lost_workers()
+                if recovered:
+                    logger.warning(f"Recovered {recovered} jobs from stopped workers")
+            except Exception as e:
+                logger.warning(f"Job queue maintenance failed: {e}")
+            await asyncio.sleep(self.maintenance_interval)
+
+    async def _consume(self):
+        """대기열에서 잡을 꺼내 처리 (종료 요청 시 현재 잡까지만 처리)"""
+        while not self._stopping.is_set():
+            try:
+                job_id = await job_queue.claim(self.worker_id, timeout=2)
+            except Exception as e:
+                logger.warning(f"Job claim failed: {e}")
+                await asyncio.sleep(1)
+                continue
+            if job_id:
+                await self._handle(job_id)
+
+    async def _handle(self, job_id: str):
+        """잡 처리 후 성공/재시도/dead-letter 기록 및 콜백"""
+        job = await job_queue.start(job_id)
+        if job is None:
+            await job_queue.drop(self.worker_id, job_id)
+            return
+
+        try:
+            result = await process_job(job)
+        except Exception as e:
+            retryable = not isinstance(e, PermanentJobError)
+            status = await job_queue.fail(self.worker_id, job_id, f"{type(e).__name__}: {str(e)[:500]}", retryable)
+            logger.warning(f"OCR job {job_id} failed (attempt {job['attempts']}, {status}): {e}")
+            if status == "retrying":
+                OCR_JOBS.labels("retried").inc()
+            elif status == "failed":
+                OCR_JOBS.labels("dead").inc()
+                await self._notify(job_id)
+            return
+
+        await job_queue.complete(self.worker_id, job_id, result)
+        OCR_JOBS.labels("succeeded").inc()
+        await self._notify(job_id)
+
+    async def _notify(self, job_id: str):
+        """콜백 URL로 최종 결과 전송 (실패해도 GET /ocr/jobs/{id}로 조회 가능)"""
+        job = await job_queue.get(job_id)
+        if not job or not job.get("callback_url"):
+            return
+
+        payload = {
+            "job_id": job_id,
+            "status": job["status"],
+            "idempotency_key": job["idempotency_key"],
+            "attempts": job["attempts"],
+            "error": job.get("error"),
+            "result": job.get("result")
+        }
+        attempts = max(1, settings.ocr_job_callback_attempts)
+        for attempt in range(attempts):
+            try:
+                response = await self.callback_client.post(job["callback_url"], json=payload)
+                response.raise_for_status()
+                await job_queue.set_callback_status(job_id, "delivered")
+                return
+            except httpx.HTTPError as e:
+                logger.warning(f"Callback for job {job_id} failed (attempt {attempt + 1}/{attempts}): {e}")
+                if attempt + 1 < attempts:
+                    await asyncio.sleep(2 ** attempt)
+
+        await job_queue.set_callback_status(job_id, "failed")
+        OCR_JOBS.labels("callback_failed").inc()
+
+
+async def run_worker():
+    """SIGINT / SIGTERM 시 처리 중인 잡을 마치고 종료"""
+    worker = JobWorker(settings.ocr_job_concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if settings.ocr_job_metrics_port:
+        start_http_server(settings.ocr_job_metrics_port)
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
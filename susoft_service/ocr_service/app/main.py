@@ -1,10 +1,26 @@
 """FastAPI Main Application"""
+import asyncio
+import logging
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.cache.idempotency import idempotency_cache
-from app.api import ocr
+from app.api import ocr, jobs
+from app.metrics import MetricsMiddleware, metrics_payload
+from app.ocr.worker_pool import ocr_worker_pool
+from app.download.image_downloader import image_downloader
+from app.jobs.queue import job_queue
+
+logger = logging.getLogger(__name__)
+
+
+async def warmup_ocr_workers():
+    """PaddleOCR 워커 기동 및 모델 로드 (실패해도 첫 요청 시 다시 시도)"""
+    try:
+        await ocr_worker_pool.start()
+    except Exception as e:
+        logger.warning(f"OCR worker warmup failed: {e}")
 
 
 @asynccontextmanager
@@ -12,8 +28,17 @@ async def lifespan(app: FastAPI):
     """애플리케이션 생명주기 관리"""
     # 시작 시
     await idempotency_cache.connect()
+    await image_downloader.start()
+    warmup_task = None
+    if settings.ocr_engine == "paddle":
+        # 모델 로드는 백그라운드로 (헬스 체크는 바로 응답)
+        warmup_task = asyncio.create_task(warmup_ocr_workers())
     yield
     # 종료 시
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    ocr_worker_pool.shutdown()
+    await image_downloader.close()
     await idempotency_cache.disconnect()
 
 
@@ -33,8 +58,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus 요청 지연 / 진행 중 요청
+app.add_middleware(MetricsMiddleware, exclude_paths=("/metrics",))
+
 # 라우터 등록
 app.include_router(ocr.router)
+app.include_router(jobs.router)
 
 
 @app.get("/", tags=["Health"])
@@ -50,14 +79,28 @@ async def root():
 @app.get("/health", tags=["Health"])
 async def health():
     """헬스 체크 (상세)"""
+    try:
+        job_stats = await job_queue.get_stats()
+    except Exception as e:
+        job_stats = {"error": str(e)}
     return {
         "status": "ok",
         "engine": settings.ocr_engine,
         "use_layout": settings.use_layout,
-        "max_file_mb": settings.max_file_mb
+        "max_file_mb": settings.max_file_mb,
+        "ocr_worker_pool": ocr_worker_pool.get_stats(),
+        "downloader": image_downloader.get_stats(),
+        "jobs": job_stats
     }
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """Prometheus 메트릭 (요청 지연, OCR 엔진 시간, Google Vision 호출, Idempotency 캐시 적중)"""
+    body, content_type = metrics_payload()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/debug/config", tags=["Debug"])
 async def debug_config():
     """디버그: 현재 설정 확인 (개발용)"""
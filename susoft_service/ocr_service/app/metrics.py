@@ -0,0 +1,126 @@
+"""Prometheus Metrics"""
+import time
+from typing import Optional, Tuple
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+
+
+# OCR 한 장은 수백 ms ~ 수십 초
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed",
+    ["method"]
+)
+OCR_ENGINE_DURATION = Histogram(
+    "ocr_engine_duration_seconds",
+    "OCR engine extraction time",
+    ["engine", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+OCR_QUEUE_WAIT = Histogram(
+    "ocr_queue_wait_seconds",
+    "Time an OCR request waited for a worker",
+    ["engine"],
+    buckets=LATENCY_BUCKETS
+)
+OCR_POOL_PENDING = Gauge(
+    "ocr_pool_pending",
+    "OCR requests submitted to the worker pool and not finished"
+)
+EXTERNAL_API_DURATION = Histogram(
+    "external_api_call_duration_seconds",
+    "External API call latency",
+    ["api", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+EXTERNAL_API_ERRORS = Counter(
+    "external_api_errors_total",
+    "External API calls that failed",
+    ["api", "reason"]
+)
+# result: downloaded | not_modified (조건부 GET 캐시) | too_large | error
+IMAGE_DOWNLOADS = Counter(
+    "image_downloads_total",
+    "Image URL downloads",
+    ["result"]
+)
+# outcome: succeeded | retried | dead | callback_failed
+OCR_JOBS = Counter(
+    "ocr_jobs_total",
+    "OCR jobs processed by queue workers",
+    ["outcome"]
+)
+# 적중률 = rate(...{result="hit"}) / rate(...)
+IDEMPOTENCY_CACHE_LOOKUPS = Counter(
+    "idempotency_cache_lookups_total",
+    "Idempotency cache lookups",
+    ["result"]
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def observe_external_call(api: str, seconds: float, error: Optional[Exception] = None,
+                          reason: Optional[str] = None):
+    """
+    외부 API 호출 하나 기록
+
+    Args:
+        api: API 이름 (google_vision)
+        seconds: 소요 시간 (초)
+        error: 실패했으면 예외
+        reason: 오류 구분 (없으면 예외 클래스 이름)
+    """
+    EXTERNAL_API_DURATION.labels(api, "error" if error else "success").observe(seconds)
+    if error is not None:
+        EXTERNAL_API_ERRORS.labels(api, reason or type(error).__name__).inc()
+
+
+class MetricsMiddleware:
+    """
+    요청 지연 / 진행 중 요청 ASGI 미들웨어
+
+    라우트 템플릿은 응답 후 scope에 남은 매칭 결과로 정함 (라우팅 재실행 없음)
+    """
+
+    def __init__(self, app, exclude_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = getattr(scope.get("route"), "path_format", None) or UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - start_time
+            )
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    """Prometheus 텍스트 포맷 (본문, Content-Type)"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
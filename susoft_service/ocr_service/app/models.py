@@ -29,6 +29,47 @@ class OCRResponse(BaseModel):
     idempotency_key: str = Field(description="요청에 사용된 idempotency_key")
 
 
+class OCRBatchItem(BaseModel):
+    """배치 OCR 항목 결과"""
+    index: int = Field(description="요청 순서 (files 다음 file_urls, 0부터)")
+    page: int = Field(description="병합 문서에서의 페이지 번호 (index + 1)")
+    idempotency_key: str = Field(description="항목 idempotency_key")
+    status: Literal["ok", "error"] = Field(description="처리 결과")
+    cached: bool = Field(default=False, description="Idempotency 캐시에서 반환 여부")
+    result: Optional[OCRResponse] = Field(default=None, description="OCR 결과 (blocks.page = page)")
+    error: Optional[str] = Field(default=None, description="실패 사유")
+    status_code: Optional[int] = Field(default=None, description="실패 시 단건 API 기준 HTTP 상태 코드")
+
+
+class OCRBatchResponse(BaseModel):
+    """배치 OCR 응답"""
+    engine: str = Field(description="사용된 OCR 엔진")
+    full_text: str = Field(description="성공한 항목을 페이지 순서대로 병합한 전체 텍스트")
+    items: List[OCRBatchItem] = Field(description="항목별 결과 (요청 순서)")
+    meta: dict = Field(description="메타 정보 (duration_ms, pages, succeeded, failed, cached)")
+
+
+class OCRJobRequest(OCRRequest):
+    """비동기 OCR 잡 요청 (file_url 필수)"""
+    callback_url: Optional[str] = Field(default=None, description="완료/실패 시 결과를 POST할 URL")
+
+
+class OCRJobResponse(BaseModel):
+    """비동기 OCR 잡 상태"""
+    job_id: str = Field(description="잡 ID")
+    status: Literal["queued", "processing", "retrying", "succeeded", "failed"] = Field(description="잡 상태")
+    idempotency_key: str = Field(description="요청에 사용된 idempotency_key")
+    engine: str = Field(description="OCR 엔진")
+    attempts: int = Field(default=0, description="시도 횟수")
+    max_attempts: int = Field(description="최대 시도 횟수 (초과 시 dead-letter)")
+    error: Optional[str] = Field(default=None, description="마지막 실패 사유")
+    result: Optional[OCRResponse] = Field(default=None, description="OCR 결과 (succeeded)")
+    callback_url: Optional[str] = Field(default=None, description="콜백 URL")
+    callback_status: Optional[str] = Field(default=None, description="콜백 전송 결과 (delivered|failed)")
+    created_at: float = Field(description="생성 시각 (epoch)")
+    updated_at: float = Field(description="마지막 변경 시각 (epoch)")
+
+
 class ErrorResponse(BaseModel):
     """에러 응답"""
     error: str = Field(description="에러 메시지")
@@ -1,11 +1,13 @@
 """Google Cloud Vision Engine Wrapper"""
 import time
-from typing import List, Tuple
+from typing import List, Tuple, Union
 from google.cloud import vision
 from google.oauth2 import service_account
 from google.api_core import exceptions as gcp_exceptions
 import json
 from app.config import settings
+from app.metrics import observe_external_call
+from app.ocr.image_input import read_image_bytes
 
 
 class GoogleVisionEngine:
@@ -32,32 +34,40 @@ class GoogleVisionEngine:
         except Exception as e:
             raise ValueError(f"Failed to initialize Google Vision client: {str(e)}")
     
-    def extract(self, image_path: str) -> Tuple[List[dict], int]:
+    def extract(self, image: Union[bytes, str]) -> Tuple[List[dict], int]:
         """
         이미지에서 텍스트 추출
         
         Args:
-            image_path: 이미지 파일 경로
+            image: 이미지 바이트 또는 파일 경로
             
         Returns:
             (결과 리스트, 소요 시간(ms))
         """
         start_time = time.time()
         
-        # 이미지 읽기
-        with open(image_path, 'rb') as image_file:
-            content = image_file.read()
-        
-        image = vision.Image(content=content)
+        # 바이트는 그대로 전송 (경로면 파일에서 읽음)
+        image = vision.Image(content=read_image_bytes(image))
         
         # OCR 실행 (document_text_detection 사용)
+        call_start = time.perf_counter()
         try:
-            response = self.client.document_text_detection(image=image)
+            try:
+                response = self.client.document_text_detection(image=image)
+            except gcp_exceptions.GoogleAPICallError as e:
+                observe_external_call("google_vision", time.perf_counter() - call_start, e, str(e.code or type(e).__name__))
+                raise
+            except Exception as e:
+                observe_external_call("google_vision", time.perf_counter() - call_start, e)
+                raise
             
             # 에러 체크
             if response.error.message:
-                raise Exception(f"Google Vision API error: {response.error.message}")
+                error = Exception(f"Google Vision API error: {response.error.message}")
+                observe_external_call("google_vision", time.perf_counter() - call_start, error, "api_error")
+                raise error
             
+            observe_external_call("google_vision", time.perf_counter() - call_start)
             document = response.full_text_annotation
             
         except gcp_exceptions.PermissionDenied as e:
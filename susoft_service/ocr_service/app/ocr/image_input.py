@@ -0,0 +1,84 @@
+"""OCR Image Input"""
+import os
+import tempfile
+from typing import Union
+import numpy as np
+
+# 엔진 입력: 메모리 이미지(bytes / 디코딩된 ndarray) 또는 큰 파일을 내려쓴 임시 파일 경로
+ImageInput = Union[bytes, np.ndarray, str]
+
+
+def decode_image(data: bytes) -> np.ndarray:
+    """
+    이미지 바이트를 BGR ndarray로 디코딩 (PaddleOCR가 파일을 읽을 때와 같은 cv2 형식)
+
+    Args:
+        data: 인코딩된 이미지 (JPEG, PNG 등)
+
+    Returns:
+        (H, W, 3) BGR 배열
+    """
+    import cv2
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Failed to decode image (unsupported or corrupt file)")
+    return image
+
+
+def read_image_bytes(image: Union[bytes, str]) -> bytes:
+    """
+    인코딩된 이미지 바이트 (경로면 파일에서 읽음)
+
+    Args:
+        image: 이미지 바이트 또는 파일 경로
+
+    Returns:
+        이미지 바이트
+    """
+    if isinstance(image, str):
+        with open(image, "rb") as image_file:
+            return image_file.read()
+    return bytes(image)
+
+
+def spill_to_disk(content: bytes, suffix: str = ".jpg") -> str:
+    """
+    큰 입력을 임시 파일로 내려쓰기 (워커 프로세스로 바이트를 복사하지 않고 경로만 전달)
+
+    Args:
+        content: 이미지 바이트
+        suffix: 파일 확장자
+
+    Returns:
+        임시 파일 경로 (호출 측에서 삭제)
+    """
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        tmp_file.write(content)
+        return tmp_file.name
+
+
+def prepare_image(content: bytes, suffix: str, spill_threshold_bytes: int) -> ImageInput:
+    """
+    엔진 입력 준비: 임계값 이하는 메모리 그대로, 초과하면 임시 파일 경로
+
+    Args:
+        content: 이미지 바이트
+        suffix: 임시 파일 확장자
+        spill_threshold_bytes: 메모리 처리 상한 (바이트)
+
+    Returns:
+        bytes 또는 임시 파일 경로
+    """
+    if len(content) > spill_threshold_bytes:
+        return spill_to_disk(content, suffix or ".jpg")
+    return content
+
+
+def cleanup_image(image: ImageInput):
+    """prepare_image가 만든 임시 파일 삭제 (메모리 입력이면 아무것도 안 함)"""
+    if isinstance(image, str) and os.path.exists(image):
+        try:
+            os.unlink(image)
+        except OSError:
+            pass
@@ -45,3 +45,21 @@ def generate_full_text(blocks: List[OCRBlock]) -> str:
     texts = [block.text for block in blocks if block.text.strip()]
     return "\n".join(texts)
 
+
+def generate_document_text(blocks: List[OCRBlock]) -> str:
+    """
+    여러 페이지 블록을 페이지 순서대로 병합 (페이지 사이는 빈 줄)
+    
+    Args:
+        blocks: 정규화된 OCR 블록 리스트 (page 필드로 페이지 구분)
+        
+    Returns:
+        병합된 전체 텍스트
+    """
+    pages = {}
+    for block in blocks:
+        pages.setdefault(block.page, []).append(block)
+    
+    page_texts = [generate_full_text(pages[page]) for page in sorted(pages)]
+    return "\n\n".join(text for text in page_texts if text)
+
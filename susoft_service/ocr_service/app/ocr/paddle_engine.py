@@ -4,40 +4,47 @@ from typing import List, Tuple, Optional
 from paddleocr import PaddleOCR
 import numpy as np
 from PIL import Image
+from app.ocr.image_input import ImageInput, decode_image
 
 
 class PaddleOCREngine:
     """PaddleOCR 엔진 래퍼"""
     
-    def __init__(self, lang: str = "korean", use_angle_cls: bool = True):
+    def __init__(self, lang: str = "korean", use_angle_cls: bool = True, cpu_threads: int = 10):
         """
         PaddleOCR 초기화
         
         Args:
             lang: 언어 설정 ("korean", "korean_english")
             use_angle_cls: 텍스트 방향 분류 사용 여부
+            cpu_threads: 추론 스레드 수 (워커 풀에서는 워커당 스레드 수로 제한)
         """
         self.ocr = PaddleOCR(
             use_angle_cls=use_angle_cls,
             lang=lang,
             use_gpu=False,  # CPU 사용 (GPU 환경이면 True로 변경)
+            cpu_threads=cpu_threads,
             show_log=False
         )
         
-    def extract(self, image_path: str) -> Tuple[List[dict], int]:
+    def extract(self, image: ImageInput) -> Tuple[List[dict], int]:
         """
         이미지에서 텍스트 추출
         
         Args:
-            image_path: 이미지 파일 경로
+            image: 이미지 바이트, BGR ndarray 또는 파일 경로
             
         Returns:
             (결과 리스트, 소요 시간(ms))
         """
         start_time = time.time()
         
+        # 바이트는 메모리에서 바로 디코딩 (디스크 왕복 없음)
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            image = decode_image(image)
+        
         # OCR 실행
-        result = self.ocr.ocr(image_path, cls=True)
+        result = self.ocr.ocr(image, cls=True)
         
         duration_ms = int((time.time() - start_time) * 1000)
         
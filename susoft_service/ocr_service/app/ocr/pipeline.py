@@ -0,0 +1,134 @@
+"""OCR Pipeline (엔진 실행 및 결과 정규화, API와 잡 워커 공용)"""
+import time
+import asyncio
+from typing import Optional, List, Dict, Tuple, Union
+from app.metrics import OCR_ENGINE_DURATION, OCR_QUEUE_WAIT
+from app.ocr.paddle_engine import (
+    sort_blocks_by_reading_order,
+    filter_small_boxes
+)
+from app.ocr.google_vision_engine import GoogleVisionEngine
+from app.ocr.worker_pool import ocr_worker_pool
+from app.ocr.image_input import ImageInput
+from app.ocr.normalizer import normalize_blocks, generate_full_text
+
+
+# Google Vision 엔진 (싱글톤, PaddleOCR는 워커 풀에서 프로세스마다 로드)
+_google_vision_engine: Optional[GoogleVisionEngine] = None
+
+
+def get_google_vision_engine() -> GoogleVisionEngine:
+    """Google Vision 엔진 싱글톤"""
+    global _google_vision_engine
+    if _google_vision_engine is None:
+        _google_vision_engine = GoogleVisionEngine()
+    return _google_vision_engine
+
+
+async def run_engine_batch(
+    engine: str,
+    images: List[ImageInput]
+) -> List[Union[Tuple[List[dict], Dict[str, float]], BaseException]]:
+    """
+    OCR 엔진 실행 (이벤트 루프 밖에서 실행, 엔진별 메트릭 기록)
+    
+    - paddle: 프로세스 워커 풀에 모든 이미지를 한 번에 제출 (CPU 추론)
+    - gcv: 이미지별 스레드 (네트워크 대기)
+    
+    Args:
+        engine: 엔진 이름 (paddle|gcv)
+        images: 이미지 바이트 또는 임시 파일 경로 리스트
+        
+    Returns:
+        이미지 순서대로 (결과 리스트, {"queue_wait_ms", "inference_ms"}) 또는 해당 항목의 예외
+        
+    Raises:
+        OCRQueueFull: 워커 풀 대기열에 전체 이미지가 들어갈 여유가 없는 경우
+    """
+    start_time = time.perf_counter()
+    if engine == "paddle":
+        results = await ocr_worker_pool.extract_many(images)
+    else:
+        gcv_engine = get_google_vision_engine()
+        
+        def call_gcv(image: ImageInput):
+            started = time.perf_counter()
+            blocks, _ = gcv_engine.extract(image)
+            return blocks, {
+                "queue_wait_ms": round((started - start_time) * 1000, 1),
+                "inference_ms": round((time.perf_counter() - started) * 1000, 1)
+            }
+        
+        results = await asyncio.gather(
+            *(asyncio.to_thread(call_gcv, image) for image in images),
+            return_exceptions=True
+        )
+    
+    for result in results:
+        if isinstance(result, BaseException):
+            OCR_ENGINE_DURATION.labels(engine, "error").observe(time.perf_counter() - start_time)
+        else:
+            timing = result[1]
+            OCR_QUEUE_WAIT.labels(engine).observe(timing["queue_wait_ms"] / 1000)
+            OCR_ENGINE_DURATION.labels(engine, "success").observe(timing["inference_ms"] / 1000)
+    return results
+
+
+async def run_engine(engine: str, image: ImageInput) -> Tuple[List[dict], Dict[str, float]]:
+    """
+    OCR 엔진 실행 (단건)
+    
+    Args:
+        engine: 엔진 이름 (paddle|gcv)
+        image: 이미지 바이트 또는 임시 파일 경로
+        
+    Returns:
+        (결과 리스트, {"queue_wait_ms", "inference_ms"})
+    """
+    result = (await run_engine_batch(engine, [image]))[0]
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
+def build_ocr_response(
+    engine: str,
+    raw_blocks: List[dict],
+    timing: Dict[str, float],
+    idempotency_key: str,
+    duration_ms: int
+) -> dict:
+    """
+    OCR 원시 결과 후처리 및 응답(캐시) 데이터 생성
+    
+    Args:
+        engine: 엔진 이름
+        raw_blocks: 엔진 결과 블록
+        timing: {"queue_wait_ms", "inference_ms"}
+        idempotency_key: Idempotency 키
+        duration_ms: 전체 소요 시간 (ms)
+        
+    Returns:
+        OCRResponse 형식 dict
+    """
+    # 블록 후처리
+    raw_blocks = filter_small_boxes(raw_blocks)
+    raw_blocks = sort_blocks_by_reading_order(raw_blocks)
+    
+    # 정규화
+    normalized_blocks = normalize_blocks(raw_blocks, page=1)
+    full_text = generate_full_text(normalized_blocks)
+    
+    return {
+        "engine": engine,
+        "full_text": full_text,
+        "blocks": [block.dict() for block in normalized_blocks],
+        "meta": {
+            "duration_ms": duration_ms,
+            "ocr_duration_ms": int(timing["inference_ms"]),
+            "queue_wait_ms": timing["queue_wait_ms"],
+            "inference_ms": timing["inference_ms"],
+            "pages": 1
+        },
+        "idempotency_key": idempotency_key
+    }
@@ -0,0 +1,261 @@
+"""PaddleOCR Worker Pool"""
+import os
+import time
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, List, Tuple, Dict, Any, Union
+from app.config import settings
+from app.metrics import OCR_POOL_PENDING
+from app.ocr.image_input import ImageInput
+
+logger = logging.getLogger(__name__)
+
+# 워커 프로세스의 BLAS / OpenMP 스레드 수
+# spawn된 워커는 initializer 전에 numpy를 import하므로 풀 생성 전에 부모 환경에 설정해야 적용됨
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+class OCRQueueFull(Exception):
+    """OCR 대기열이 가득 찼을 때 발생 (API에서 503으로 변환)"""
+
+
+# ==================== Worker Process ====================
+
+# 워커 프로세스 전역 PaddleOCR 엔진 (프로세스당 하나)
+_worker_engine = None
+
+
+def _init_worker(lang: str, use_angle_cls: bool, threads: int):
+    """워커 프로세스 초기화: PaddleOCR 모델 로드 (스레드 수는 부모에서 설정한 환경 변수로 제한)"""
+    global _worker_engine
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+
+    from app.ocr.paddle_engine import PaddleOCREngine
+
+    _worker_engine = PaddleOCREngine(lang=lang, use_angle_cls=use_angle_cls, cpu_threads=threads)
+
+
+def _ping_worker() -> int:
+    """워커 기동 확인 (초기화가 끝난 뒤 실행됨)"""
+    return os.getpid()
+
+
+def _extract_in_worker(image: ImageInput, submitted_at: float) -> Tuple[List[dict], int, float, float]:
+    """
+    워커 프로세스에서 OCR 실행 (바이트 디코딩도 워커에서 수행)
+
+    Returns:
+        (결과 리스트, 워커 PID, 대기 시간(초), 추론 시간(초))
+    """
+    started_at = time.time()
+    blocks, _ = _worker_engine.extract(image)
+    return blocks, os.getpid(), started_at - submitted_at, time.time() - started_at
+
+
+# ==================== Pool ====================
+
+class OCRWorkerPool:
+    """PaddleOCR 전용 프로세스 풀 (이벤트 루프 밖에서 추론)"""
+
+    def __init__(self):
+        """설정 로드 (풀은 start() 또는 첫 사용 시 생성)"""
+        self.max_workers = max(1, settings.ocr_workers)
+        self.worker_threads = max(1, settings.ocr_worker_threads)
+        self.max_queue_depth = max(0, settings.ocr_max_queue)
+        self.start_method = settings.ocr_mp_start_method
+        self.lang = "korean"
+        self.use_angle_cls = True
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._stats = {
+            "jobs": 0,
+            "rejected": 0,
+            "failed": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0,
+            "inference_ms_total": 0.0
+        }
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        """프로세스 풀 생성 (지연 초기화)"""
+        if self._pool is None:
+            # 워커가 상속할 환경에 스레드 수 설정 (numpy/OpenBLAS는 import 시점에 읽음)
+            for name in THREAD_ENV_VARS:
+                os.environ[name] = str(self.worker_threads)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+                initargs=(self.lang, self.use_angle_cls, self.worker_threads)
+            )
+            logger.info(
+                f"OCR worker pool started: workers={self.max_workers}, "
+                f"threads_per_worker={self.worker_threads}"
+            )
+        return self._pool
+
+    async def start(self):
+        """
+        워커 프로세스 기동 및 모델 로드
+
+        워커 수만큼 동시에 작업을 제출하여 모든 워커가 시작 시 모델을 로드하도록 합니다.
+        """
+        loop = asyncio.get_running_loop()
+        pool, futures = self._submit_all(
+            lambda current, _index: loop.run_in_executor(current, _ping_worker),
+            self.max_workers
+        )
+        try:
+            pids = await asyncio.gather(*futures)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise
+        logger.info(f"OCR workers ready: {sorted(set(pids))}")
+
+    @property
+    def queue_depth(self) -> int:
+        """워커에 할당되지 못하고 대기 중인 요청 수"""
+        return max(0, self._pending - self.max_workers)
+
+    def _reserve(self, count: int):
+        """대기열 여유 확인 (부족하면 요청 전체를 거절)"""
+        if self._pending + count > self.max_workers + self.max_queue_depth:
+            self._stats["rejected"] += count
+            raise OCRQueueFull(f"OCR queue is full (max depth: {self.max_queue_depth})")
+
+    def _submit_all(self, submit, count: int) -> Tuple[ProcessPoolExecutor, List[asyncio.Future]]:
+        """
+        작업 count개 제출 (유휴 워커가 죽어 풀이 손상된 경우 새 풀로 한 번 재시도)
+
+        Args:
+            submit: (풀, 인덱스)를 받아 작업 future를 반환하는 함수
+            count: 작업 수
+
+        Returns:
+            (제출한 풀, future 리스트)
+        """
+        for attempt in range(2):
+            pool = self._ensure_pool()
+            futures = []
+            try:
+                for index in range(count):
+                    futures.append(submit(pool, index))
+                return pool, futures
+            except BrokenProcessPool:
+                for future in futures:
+                    future.cancel()
+                self._discard_pool(pool)
+                if attempt == 1:
+                    raise
+
+    def _submit(self, pool: ProcessPoolExecutor, image: ImageInput) -> asyncio.Future:
+        """워커 풀에 작업 제출 (완료/취소 시 대기 수 감소)"""
+        future = asyncio.get_running_loop().run_in_executor(pool, _extract_in_worker, image, time.time())
+        self._pending += 1
+        OCR_POOL_PENDING.inc()
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, _future: asyncio.Future):
+        self._pending -= 1
+        OCR_POOL_PENDING.dec()
+
+    async def _result(self, pool: ProcessPoolExecutor, future: asyncio.Future) -> Tuple[List[dict], Dict[str, float]]:
+        """작업 결과 대기 및 대기/추론 시간 집계"""
+        try:
+            blocks, _pid, queue_wait, inference_time = await future
+        except BrokenProcessPool:
+            # 워커 초기화 실패/비정상 종료 시 다음 요청에서 풀을 재생성
+            self._stats["failed"] += 1
+            self._discard_pool(pool)
+            raise
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+
+        timing = {
+            "queue_wait_ms": round(max(0.0, queue_wait) * 1000, 1),
+            "inference_ms": round(inference_time * 1000, 1)
+        }
+        self._stats["jobs"] += 1
+        self._stats["queue_wait_ms_total"] += timing["queue_wait_ms"]
+        self._stats["queue_wait_ms_max"] = max(self._stats["queue_wait_ms_max"], timing["queue_wait_ms"])
+        self._stats["inference_ms_total"] += timing["inference_ms"]
+        return blocks, timing
+
+    async def extract(self, image: ImageInput) -> Tuple[List[dict], Dict[str, float]]:
+        """
+        OCR 실행 (프로세스 풀)
+
+        Args:
+            image: 이미지 바이트 또는 파일 경로 (바이트는 파이프로 워커에 전달)
+
+        Returns:
+            (결과 리스트, {"queue_wait_ms", "inference_ms"})
+
+        Raises:
+            OCRQueueFull: 대기열이 가득 찬 경우
+        """
+        self._reserve(1)
+        pool, futures = self._submit_all(lambda current, _index: self._submit(current, image), 1)
+        return await self._result(pool, futures[0])
+
+    async def extract_many(self, images: List[ImageInput]) -> List[Union[Tuple[List[dict], Dict[str, float]], BaseException]]:
+        """
+        여러 이미지를 한 번에 워커 풀에 제출 (모든 워커가 동시에 처리)
+
+        Args:
+            images: 이미지 바이트 또는 파일 경로 리스트
+
+        Returns:
+            이미지 순서대로 (결과 리스트, 시간) 또는 해당 항목의 예외
+
+        Raises:
+            OCRQueueFull: 대기열에 전체 항목이 들어갈 여유가 없는 경우
+        """
+        self._reserve(len(images))
+        pool, futures = self._submit_all(lambda current, index: self._submit(current, images[index]), len(images))
+        return await asyncio.gather(
+            *(self._result(pool, future) for future in futures),
+            return_exceptions=True
+        )
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """손상된 프로세스 풀 폐기"""
+        if self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            logger.warning("OCR worker pool is broken, it will be recreated on next use")
+
+    def shutdown(self):
+        """프로세스 풀 종료"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """대기열 상태 및 누적 대기/추론 시간"""
+        jobs = self._stats["jobs"] or 1
+        return {
+            "workers": self.max_workers,
+            "threads_per_worker": self.worker_threads,
+            "max_queue_depth": self.max_queue_depth,
+            "started": self._pool is not None,
+            "in_flight": self._pending,
+            "queue_depth": self.queue_depth,
+            "jobs": self._stats["jobs"],
+            "rejected": self._stats["rejected"],
+            "failed": self._stats["failed"],
+            "avg_queue_wait_ms": round(self._stats["queue_wait_ms_total"] / jobs, 1),
+            "max_queue_wait_ms": self._stats["queue_wait_ms_max"],
+            "avg_inference_ms": round(self._stats["inference_ms_total"] / jobs, 1)
+        }
+
+
+# 전역 워커 풀 인스턴스
+ocr_worker_pool = OCRWorkerPool()